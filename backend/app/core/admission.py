@@ -0,0 +1,149 @@
+import asyncio
+import math
+import time
+from collections import OrderedDict
+
+from starlette.datastructures import Headers
+from starlette.responses import JSONResponse
+from starlette.routing import Match
+from starlette.types import ASGIApp, Receive, Scope, Send
+
+from app.core.config import get_settings
+from app.core.metrics import metrics
+from app.core.security import decode_token
+
+settings = get_settings()
+
+HEAVY_ROUTES: tuple[tuple[str | None, str], ...] = (
+    (None, f"{settings.api_v1_prefix}/analytics/"),
+    ("POST", f"{settings.api_v1_prefix}/imports"),
+    ("GET", f"{settings.api_v1_prefix}/exports/sales"),
+    ("GET", f"{settings.api_v1_prefix}/exports/tail"),
+    ("GET", f"{settings.api_v1_prefix}/exports/space"),
+)
+
+
+def heavy_route(scope: Scope) -> str | None:
+    method, path = scope["method"], scope["path"]
+    if not any(path.startswith(prefix) and route_method in (None, method) for route_method, prefix in HEAVY_ROUTES):
+        return None
+    for route in scope["app"].router.routes:
+        match, _child_scope = route.matches(scope)
+        if match is Match.FULL:
+            return f"{method} {route.path}"
+    return None
+
+
+def client_identity(scope: Scope) -> str:
+    headers = Headers(scope=scope)
+    authorization = headers.get("authorization", "")
+    if authorization.lower().startswith("bearer "):
+        try:
+            return f"user:{decode_token(authorization.split(' ', 1)[1]).get('sub')}"
+        except ValueError:
+            pass
+    if settings.admission_client_ip_header:
+        forwarded = headers.get(settings.admission_client_ip_header, "").rsplit(",", 1)[-1].strip()
+        if forwarded:
+            return f"ip:{forwarded}"
+    client = scope.get("client")
+    return f"ip:{client[0] if client else 'unknown'}"
+
+
+class TokenBuckets:
+    def __init__(self, rate: float, burst: int, max_entries: int) -> None:
+        self.rate = rate
+        self.burst = burst
+        self.max_entries = max_entries
+        self._buckets: OrderedDict[tuple[str, str], tuple[float, float]] = OrderedDict()
+
+    def take(self, key: tuple[str, str]) -> float:
+        now = time.monotonic()
+        tokens, updated = self._buckets.pop(key, (float(self.burst), now))
+        tokens = min(float(self.burst), tokens + (now - updated) * self.rate)
+        wait = 0.0
+        if tokens >= 1:
+            tokens -= 1
+        else:
+            wait = (1 - tokens) / self.rate
+        self._buckets[key] = (tokens, now)
+        while len(self._buckets) > self.max_entries:
+            self._buckets.popitem(last=False)
+        return wait
+
+
+class ConcurrencyGate:
+    def __init__(self, limit: int, max_queue: int, timeout: float) -> None:
+        self.limit = limit
+        self.max_queue = max_queue
+        self.timeout = timeout
+        self.active = 0
+        self.waiting = 0
+        self._slots = asyncio.Semaphore(limit)
+
+    async def acquire(self, route: str) -> str | None:
+        if self._slots.locked():
+            if self.waiting >= self.max_queue:
+                return "queue_full"
+            metrics.inc("admission_queued_total", route=route)
+            self.waiting += 1
+            try:
+                await asyncio.wait_for(self._slots.acquire(), self.timeout)
+            except TimeoutError:
+                return "queue_timeout"
+            finally:
+                self.waiting -= 1
+        else:
+            await self._slots.acquire()
+        self.active += 1
+        return None
+
+    def release(self) -> None:
+        self.active -= 1
+        self._slots.release()
+
+
+async def _reject(scope: Scope, receive: Receive, send: Send, status_code: int, retry_after: float, detail: str) -> None:
+    response = JSONResponse(
+        {"detail": detail},
+        status_code=status_code,
+        headers={"Retry-After": str(max(1, math.ceil(retry_after)))},
+    )
+    await response(scope, receive, send)
+
+
+class AdmissionMiddleware:
+    def __init__(self, app: ASGIApp) -> None:
+        self.app = app
+        self.buckets = TokenBuckets(
+            settings.admission_rate_per_second, settings.admission_burst, settings.admission_bucket_max_entries
+        )
+        self.gate = ConcurrencyGate(
+            settings.admission_max_concurrent, settings.admission_max_queue, settings.admission_queue_timeout_seconds
+        )
+        metrics.gauge("admission_in_flight", lambda: {(): self.gate.active})
+        metrics.gauge("admission_waiting", lambda: {(): self.gate.waiting})
+
+    async def __call__(self, scope: Scope, receive: Receive, send: Send) -> None:
+        route = heavy_route(scope) if scope["type"] == "http" else None
+        if route is None or not settings.admission_enabled:
+            await self.app(scope, receive, send)
+            return
+
+        wait = self.buckets.take((client_identity(scope), route))
+        if wait:
+            metrics.inc("admission_rejected_total", route=route, reason="rate_limited")
+            await _reject(scope, receive, send, 429, wait, "Too many requests for this route")
+            return
+
+        rejection = await self.gate.acquire(route)
+        if rejection is not None:
+            metrics.inc("admission_rejected_total", route=route, reason=rejection)
+            await _reject(scope, receive, send, 503, self.gate.timeout, "Server is busy, retry later")
+            return
+
+        metrics.inc("admission_admitted_total", route=route)
+        try:
+            await self.app(scope, receive, send)
+        finally:
+            self.gate.release()
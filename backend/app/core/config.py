@@ -11,6 +11,67 @@ class Settings(BaseSettings):
     jwt_algorithm: str = "HS256"
     access_token_expire_minutes: int = 30
     refresh_token_expire_days: int = 7
+    auth_cache_ttl_seconds: int = 60
+    auth_cache_max_entries: int = 10000
+    password_hash_workers: int = 2
+    password_hash_concurrency: int = 8
+    tail_engine_enabled: bool = True
+    sales_partitioning: str = "none"
+    sales_partition_buckets: int = 0
+    sketch_cms_width: int = 2048
+    sketch_cms_depth: int = 4
+    sketch_hll_precision: int = 12
+    sketch_heavy_hitters: int = 1024
+    import_compress_level: int = 6
+    import_retention_days: int = 30
+    import_storage_budget_mb: int = 1024
+    import_progress_interval_seconds: float = 0.5
+    import_events_keepalive_seconds: float = 15.0
+    import_events_max_seconds: float = 3600.0
+    import_bundle_workers: int = 4
+    reference_cache_ttl_seconds: int = 300
+    reference_cache_max_entries: int = 256
+    reference_cache_recheck_seconds: float = 5.0
+    anomaly_method: str = "mad"
+    anomaly_window_days: int = 28
+    anomaly_threshold: float = 3.5
+    anomaly_min_spread: float = 1.0
+    abc_metric: str = "revenue"
+    abc_threshold_a: float = 0.8
+    abc_threshold_b: float = 0.95
+    xyz_threshold_x: float = 0.5
+    xyz_threshold_y: float = 1.0
+    classification_cache_ttl_seconds: int = 600
+    classification_cache_max_entries: int = 64
+    forecast_method: str = "auto"
+    forecast_horizon_days: int = 28
+    forecast_history_days: int = 182
+    forecast_season_days: int = 7
+    forecast_workers: int = 2
+    affinity_min_pair_count: int = 2
+    affinity_adjacency_per_category: int = 3
+    affinity_cache_ttl_seconds: int = 600
+    affinity_cache_max_entries: int = 128
+    sales_hot_days: int = 90
+    archive_dir: str = "backend/data/archive"
+    archive_compress_level: int = 9
+    profile_sample_interval_ms: float = 5.0
+    profile_max_seconds: float = 60.0
+    profile_dir: str = "backend/data/profiles"
+    profile_max_results: int = 50
+    profile_top_queries: int = 50
+    admission_enabled: bool = True
+    admission_rate_per_second: float = 2.0
+    admission_burst: int = 10
+    admission_bucket_max_entries: int = 10000
+    admission_max_concurrent: int = 8
+    admission_max_queue: int = 32
+    admission_queue_timeout_seconds: float = 10.0
+    admission_client_ip_header: str = ""
+    metrics_enabled: bool = False
+    export_dir: str = "backend/data/exports"
+    export_compress_level: int = 6
+    export_retention_days: int = 7
 
     class Config:
         env_file = ".env"
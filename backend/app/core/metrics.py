@@ -0,0 +1,46 @@
+import threading
+from collections import defaultdict
+from typing import Callable
+
+LabelSet = tuple[tuple[str, str], ...]
+
+
+def _escape(value: str) -> str:
+    return value.replace("\\", "\\\\").replace('"', '\\"').replace("\n", "\\n")
+
+
+class Metrics:
+    def __init__(self) -> None:
+        self._counters: dict[str, dict[LabelSet, float]] = defaultdict(lambda: defaultdict(float))
+        self._gauges: dict[str, Callable[[], dict[LabelSet, float]]] = {}
+        self._lock = threading.Lock()
+
+    def inc(self, name: str, amount: float = 1.0, /, **labels: str) -> None:
+        key = tuple(sorted(labels.items()))
+        with self._lock:
+            self._counters[name][key] += amount
+
+    def gauge(self, name: str, collect: Callable[[], dict[LabelSet, float]]) -> None:
+        self._gauges[name] = collect
+
+    def value(self, name: str, /, **labels: str) -> float:
+        with self._lock:
+            return self._counters.get(name, {}).get(tuple(sorted(labels.items())), 0.0)
+
+    def render(self) -> str:
+        with self._lock:
+            counters = {name: dict(series) for name, series in self._counters.items()}
+        lines = []
+        for kind, families in (
+            ("counter", counters),
+            ("gauge", {name: collect() for name, collect in self._gauges.items()}),
+        ):
+            for name in sorted(families):
+                lines.append(f"# TYPE {name} {kind}")
+                for labels, value in sorted(families[name].items()):
+                    label_text = ",".join(f'{key}="{_escape(label)}"' for key, label in labels)
+                    lines.append(f"{name}{{{label_text}}} {value:g}" if label_text else f"{name} {value:g}")
+        return "\n".join(lines) + "\n"
+
+
+metrics = Metrics()
@@ -0,0 +1,258 @@
+import inspect
+import json
+import sys
+import threading
+import time
+from collections import Counter, defaultdict
+from contextvars import ContextVar
+from datetime import datetime
+from functools import wraps
+from pathlib import Path
+from typing import Callable
+from urllib.parse import parse_qs
+from uuid import uuid4
+
+from fastapi.routing import APIRoute
+from sqlalchemy import event
+from sqlalchemy.engine import Engine
+from starlette.concurrency import run_in_threadpool
+from starlette.datastructures import Headers, MutableHeaders
+from starlette.responses import JSONResponse
+from starlette.types import ASGIApp, Message, Receive, Scope, Send
+
+from app.core.config import get_settings
+
+settings = get_settings()
+
+PROFILE_HEADER = "x-profile"
+PROFILE_ID_HEADER = "X-Profile-Id"
+
+_APP_ROOT = Path(__file__).resolve().parents[1]
+_REPO_ROOT = _APP_ROOT.parents[1]
+_OWN_FILE = Path(__file__).resolve().as_posix()
+
+_current: ContextVar["RequestProfile | None"] = ContextVar("request_profile", default=None)
+
+
+def _frame_label(frame) -> str:
+    code = frame.f_code
+    filename = code.co_filename
+    if filename.startswith(str(_REPO_ROOT)):
+        filename = filename[len(str(_REPO_ROOT)) + 1 :]
+    else:
+        filename = Path(filename).name
+    return f"{code.co_name} ({filename}:{code.co_firstlineno})"
+
+
+def _fold(frame) -> str | None:
+    labels = []
+    in_app = False
+    while frame is not None:
+        filename = frame.f_code.co_filename
+        if filename == _OWN_FILE:
+            frame = frame.f_back
+            continue
+        in_app = in_app or filename.startswith(str(_APP_ROOT))
+        labels.append(_frame_label(frame))
+        frame = frame.f_back
+    if not in_app:
+        return None
+    return ";".join(reversed(labels))
+
+
+class RequestProfile:
+    def __init__(self, method: str, path: str, query: str) -> None:
+        self.id = uuid4().hex
+        self.method = method
+        self.path = path
+        self.query = query
+        self.started_at = datetime.utcnow()
+        self.status_code: int | None = None
+        self.duration_ms = 0.0
+        self.queries: dict[str, list[float]] = defaultdict(list)
+        self.threads: set[int] = set()
+        self._samples: Counter[str] = Counter()
+        self._queries_lock = threading.Lock()
+        self._stopped = threading.Event()
+        self._sampler = threading.Thread(target=self._sample, name=f"profiler-{self.id[:8]}", daemon=True)
+        self._started = 0.0
+
+    def start(self) -> None:
+        self._started = time.perf_counter()
+        self.threads.add(threading.get_ident())
+        self._sampler.start()
+
+    def stop(self) -> None:
+        self.duration_ms = (time.perf_counter() - self._started) * 1000
+        self._stopped.set()
+        self._sampler.join()
+
+    def _sample(self) -> None:
+        interval = settings.profile_sample_interval_ms / 1000
+        deadline = time.monotonic() + settings.profile_max_seconds
+        while not self._stopped.wait(interval) and time.monotonic() < deadline:
+            for ident, frame in sys._current_frames().items():
+                if ident not in self.threads:
+                    continue
+                stack = _fold(frame)
+                if stack is not None:
+                    self._samples[stack] += 1
+
+    def record_query(self, statement: str, seconds: float) -> None:
+        with self._queries_lock:
+            self.queries[statement].append(seconds * 1000)
+
+    def folded(self) -> Counter[str]:
+        return Counter(self._samples)
+
+    def summary(self) -> dict:
+        stacks = self.folded()
+        statements = sorted(
+            (
+                {
+                    "statement": statement,
+                    "count": len(timings),
+                    "total_ms": round(sum(timings), 3),
+                    "max_ms": round(max(timings), 3),
+                }
+                for statement, timings in self.queries.items()
+            ),
+            key=lambda entry: -entry["total_ms"],
+        )
+        return {
+            "id": self.id,
+            "method": self.method,
+            "path": self.path,
+            "query": self.query,
+            "status_code": self.status_code,
+            "started_at": self.started_at.isoformat(),
+            "duration_ms": round(self.duration_ms, 3),
+            "sample_interval_ms": settings.profile_sample_interval_ms,
+            "sample_scope": "request threads and event loop",
+            "samples": sum(stacks.values()),
+            "sql": {
+                "count": sum(entry["count"] for entry in statements),
+                "total_ms": round(sum(entry["total_ms"] for entry in statements), 3),
+                "statements": statements[: settings.profile_top_queries],
+            },
+        }
+
+
+def profile_dir() -> Path:
+    path = Path(settings.profile_dir)
+    if not path.is_absolute():
+        path = _REPO_ROOT / path
+    path.mkdir(parents=True, exist_ok=True)
+    return path
+
+
+def save_profile(profile: RequestProfile) -> None:
+    directory = profile_dir()
+    stacks = profile.folded()
+    (directory / f"{profile.id}.folded").write_text(
+        "".join(f"{stack} {count}\n" for stack, count in stacks.most_common()), encoding="utf-8"
+    )
+    (directory / f"{profile.id}.json").write_text(json.dumps(profile.summary()), encoding="utf-8")
+
+    saved = sorted(directory.glob("*.json"), key=lambda path: path.stat().st_mtime, reverse=True)
+    for stale in saved[settings.profile_max_results :]:
+        stale.unlink(missing_ok=True)
+        stale.with_suffix(".folded").unlink(missing_ok=True)
+
+
+def list_profiles() -> list[dict]:
+    summaries = [json.loads(path.read_text(encoding="utf-8")) for path in profile_dir().glob("*.json")]
+    for summary in summaries:
+        summary["sql"].pop("statements", None)
+    return sorted(summaries, key=lambda summary: summary["started_at"], reverse=True)
+
+
+def profile_path(profile_id: str, suffix: str) -> Path | None:
+    if not profile_id.isalnum():
+        return None
+    path = profile_dir() / f"{profile_id}{suffix}"
+    return path if path.is_file() else None
+
+
+@event.listens_for(Engine, "before_cursor_execute")
+def _before_cursor_execute(conn, _cursor, _statement, _parameters, _context, _executemany) -> None:
+    profile = _current.get()
+    if profile is not None:
+        conn.info.setdefault("profile_query_start", []).append(time.perf_counter())
+
+
+@event.listens_for(Engine, "after_cursor_execute")
+def _after_cursor_execute(conn, _cursor, statement, _parameters, _context, _executemany) -> None:
+    profile = _current.get()
+    starts = conn.info.get("profile_query_start")
+    if profile is not None and starts:
+        profile.record_query(statement, time.perf_counter() - starts.pop())
+
+
+def _profiled(endpoint: Callable) -> Callable:
+    if inspect.iscoroutinefunction(endpoint):
+        return endpoint
+
+    @wraps(endpoint)
+    def call(*args, **kwargs):
+        profile = _current.get()
+        if profile is None:
+            return endpoint(*args, **kwargs)
+        ident = threading.get_ident()
+        profile.threads.add(ident)
+        try:
+            return endpoint(*args, **kwargs)
+        finally:
+            profile.threads.discard(ident)
+
+    return call
+
+
+class ProfiledRoute(APIRoute):
+    def __init__(self, path: str, endpoint: Callable, **kwargs) -> None:
+        super().__init__(path, _profiled(endpoint), **kwargs)
+
+
+def _profiling_requested(scope: Scope) -> bool:
+    for name, value in scope["headers"]:
+        if name == PROFILE_HEADER.encode() and value.lower() in (b"1", b"true"):
+            return True
+    query_string = scope.get("query_string", b"")
+    if b"profile=" not in query_string:
+        return False
+    values = parse_qs(query_string.decode("latin-1")).get("profile", [])
+    return any(value.lower() in ("1", "true") for value in values)
+
+
+class ProfilingMiddleware:
+    def __init__(self, app: ASGIApp, authorize: Callable[[str], bool]) -> None:
+        self.app = app
+        self.authorize = authorize
+
+    async def __call__(self, scope: Scope, receive: Receive, send: Send) -> None:
+        if scope["type"] != "http" or not _profiling_requested(scope):
+            await self.app(scope, receive, send)
+            return
+
+        authorization = Headers(scope=scope).get("authorization")
+        if not authorization or not await run_in_threadpool(self.authorize, authorization):
+            response = JSONResponse({"detail": "Profiling requires an admin token"}, status_code=403)
+            await response(scope, receive, send)
+            return
+
+        profile = RequestProfile(scope["method"], scope["path"], scope.get("query_string", b"").decode("latin-1"))
+
+        async def send_with_profile_id(message: Message) -> None:
+            if message["type"] == "http.response.start":
+                profile.status_code = message["status"]
+                MutableHeaders(scope=message).append(PROFILE_ID_HEADER, profile.id)
+            await send(message)
+
+        token = _current.set(profile)
+        profile.start()
+        try:
+            await self.app(scope, receive, send_with_profile_id)
+        finally:
+            _current.reset(token)
+            profile.stop()
+            await run_in_threadpool(save_profile, profile)
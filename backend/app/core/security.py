@@ -1,5 +1,8 @@
+import asyncio
+from concurrent.futures import ProcessPoolExecutor
 from datetime import datetime, timedelta
 from typing import Optional
+from weakref import WeakKeyDictionary
 
 from jose import JWTError, jwt
 from passlib.context import CryptContext
@@ -8,6 +11,9 @@ from app.core.config import get_settings
 
 pwd_context = CryptContext(schemes=["bcrypt"], deprecated="auto")
 
+_password_executor: ProcessPoolExecutor | None = None
+_password_slots: WeakKeyDictionary[asyncio.AbstractEventLoop, asyncio.Semaphore] = WeakKeyDictionary()
+
 
 def hash_password(password: str) -> str:
     return pwd_context.hash(password)
@@ -17,6 +23,40 @@ def verify_password(plain_password: str, hashed_password: str) -> bool:
     return pwd_context.verify(plain_password, hashed_password)
 
 
+def _get_password_executor() -> tuple[ProcessPoolExecutor, asyncio.Semaphore]:
+    global _password_executor
+    settings = get_settings()
+    if _password_executor is None:
+        _password_executor = ProcessPoolExecutor(max_workers=settings.password_hash_workers)
+    loop = asyncio.get_running_loop()
+    slots = _password_slots.get(loop)
+    if slots is None:
+        slots = _password_slots[loop] = asyncio.Semaphore(settings.password_hash_concurrency)
+    return _password_executor, slots
+
+
+async def hash_password_async(password: str) -> str:
+    executor, slots = _get_password_executor()
+    async with slots:
+        return await asyncio.get_running_loop().run_in_executor(executor, hash_password, password)
+
+
+async def verify_password_async(plain_password: str, hashed_password: str) -> bool:
+    executor, slots = _get_password_executor()
+    async with slots:
+        return await asyncio.get_running_loop().run_in_executor(
+            executor, verify_password, plain_password, hashed_password
+        )
+
+
+def shutdown_password_executor() -> None:
+    global _password_executor
+    if _password_executor is not None:
+        _password_executor.shutdown(wait=False, cancel_futures=True)
+        _password_executor = None
+    _password_slots.clear()
+
+
 def create_access_token(subject: str, expires_delta: Optional[timedelta] = None) -> str:
     settings = get_settings()
     expire = datetime.utcnow() + (expires_delta or timedelta(minutes=settings.access_token_expire_minutes))
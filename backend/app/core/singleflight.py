@@ -0,0 +1,77 @@
+import functools
+import inspect
+import threading
+from typing import Any, Callable, Hashable, TypeVar
+
+from app.core.metrics import metrics
+
+T = TypeVar("T")
+
+
+class _Flight:
+    __slots__ = ("done", "result", "error")
+
+    def __init__(self) -> None:
+        self.done = threading.Event()
+        self.result: Any = None
+        self.error: BaseException | None = None
+
+
+class SingleFlight:
+    def __init__(self, name: str) -> None:
+        self.name = name
+        self._flights: dict[Hashable, _Flight] = {}
+        self._lock = threading.Lock()
+
+    def do(self, key: Hashable, call: Callable[[], T]) -> T:
+        with self._lock:
+            flight = self._flights.get(key)
+            leader = flight is None
+            if leader:
+                flight = self._flights[key] = _Flight()
+
+        if not leader:
+            metrics.inc("singleflight_calls_total", name=self.name, role="shared")
+            flight.done.wait()
+            if flight.error is not None:
+                raise flight.error
+            return flight.result
+
+        metrics.inc("singleflight_calls_total", name=self.name, role="leader")
+        try:
+            flight.result = call()
+        except BaseException as exc:
+            flight.error = exc
+            raise
+        finally:
+            with self._lock:
+                del self._flights[key]
+            flight.done.set()
+        return flight.result
+
+    def in_flight(self) -> int:
+        return len(self._flights)
+
+
+_registry: list[SingleFlight] = []
+metrics.gauge(
+    "singleflight_in_flight",
+    lambda: {(("name", flights.name),): flights.in_flight() for flights in _registry},
+)
+
+
+def coalesce(function: Callable[..., T]) -> Callable[..., T]:
+    signature = inspect.signature(function)
+    session_parameter = next(iter(signature.parameters))
+    flights = SingleFlight(function.__name__)
+    _registry.append(flights)
+
+    @functools.wraps(function)
+    def wrapper(*args, **kwargs) -> T:
+        bound = signature.bind(*args, **kwargs)
+        bound.apply_defaults()
+        key = tuple((name, value) for name, value in bound.arguments.items() if name != session_parameter)
+        return flights.do(key, lambda: function(*args, **kwargs))
+
+    wrapper.flights = flights
+    return wrapper
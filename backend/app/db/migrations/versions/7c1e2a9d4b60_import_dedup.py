@@ -0,0 +1,30 @@
+"""import dedup
+
+Revision ID: 7c1e2a9d4b60
+Revises: 540b06d41d4e
+Create Date: 2026-10-19 12:40:00.000000
+"""
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = '7c1e2a9d4b60'
+down_revision = '540b06d41d4e'
+branch_labels = None
+depends_on = None
+
+
+def upgrade() -> None:
+    op.add_column('imports', sa.Column('file_path', sa.String(length=500), nullable=True))
+    op.add_column('imports', sa.Column('content_hash', sa.String(length=64), nullable=True))
+    op.add_column('imports', sa.Column('unchanged_rows', sa.Integer(), nullable=True))
+    op.create_index(op.f('ix_imports_content_hash'), 'imports', ['content_hash'], unique=False)
+
+
+def downgrade() -> None:
+    op.drop_index(op.f('ix_imports_content_hash'), table_name='imports')
+    with op.batch_alter_table('imports') as batch_op:
+        batch_op.drop_column('unchanged_rows')
+        batch_op.drop_column('content_hash')
+        batch_op.drop_column('file_path')
@@ -0,0 +1,27 @@
+"""sale basket id
+
+Revision ID: a3d9e6f20b15
+Revises: f6c2d8e1a947
+Create Date: 2026-10-19 17:05:00.000000
+"""
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = 'a3d9e6f20b15'
+down_revision = 'f6c2d8e1a947'
+branch_labels = None
+depends_on = None
+
+
+def upgrade() -> None:
+    with op.batch_alter_table('sales') as batch_op:
+        batch_op.add_column(sa.Column('basket_id', sa.String(length=64), nullable=True))
+        batch_op.create_index(batch_op.f('ix_sales_basket_id'), ['basket_id'], unique=False)
+
+
+def downgrade() -> None:
+    with op.batch_alter_table('sales') as batch_op:
+        batch_op.drop_index(batch_op.f('ix_sales_basket_id'))
+        batch_op.drop_column('basket_id')
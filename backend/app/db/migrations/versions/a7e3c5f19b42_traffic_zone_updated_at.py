@@ -0,0 +1,26 @@
+"""traffic zone updated at
+
+Revision ID: a7e3c5f19b42
+Revises: f1b7d3c9a265
+Create Date: 2026-10-19 21:10:00.000000
+"""
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = 'a7e3c5f19b42'
+down_revision = 'f1b7d3c9a265'
+branch_labels = None
+depends_on = None
+
+
+def upgrade() -> None:
+    with op.batch_alter_table('traffic_zones') as batch_op:
+        batch_op.add_column(sa.Column('updated_at', sa.DateTime(), nullable=True))
+    op.execute("UPDATE traffic_zones SET updated_at = created_at")
+
+
+def downgrade() -> None:
+    with op.batch_alter_table('traffic_zones') as batch_op:
+        batch_op.drop_column('updated_at')
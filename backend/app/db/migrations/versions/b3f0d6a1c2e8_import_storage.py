@@ -0,0 +1,28 @@
+"""import storage
+
+Revision ID: b3f0d6a1c2e8
+Revises: 7c1e2a9d4b60
+Create Date: 2026-10-19 13:05:00.000000
+"""
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = 'b3f0d6a1c2e8'
+down_revision = '7c1e2a9d4b60'
+branch_labels = None
+depends_on = None
+
+
+def upgrade() -> None:
+    op.add_column('imports', sa.Column('size_bytes', sa.Integer(), nullable=True))
+    op.add_column('imports', sa.Column('stored_bytes', sa.Integer(), nullable=True))
+    op.add_column('imports', sa.Column('purged_at', sa.DateTime(), nullable=True))
+
+
+def downgrade() -> None:
+    with op.batch_alter_table('imports') as batch_op:
+        batch_op.drop_column('purged_at')
+        batch_op.drop_column('stored_bytes')
+        batch_op.drop_column('size_bytes')
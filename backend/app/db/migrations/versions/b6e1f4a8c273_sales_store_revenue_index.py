@@ -0,0 +1,23 @@
+"""sales store revenue index
+
+Revision ID: b6e1f4a8c273
+Revises: a7e3c5f19b42
+Create Date: 2026-10-19 22:40:00.000000
+"""
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = 'b6e1f4a8c273'
+down_revision = 'a7e3c5f19b42'
+branch_labels = None
+depends_on = None
+
+
+def upgrade() -> None:
+    op.create_index('ix_sales_store_id_revenue', 'sales', ['store_id', 'revenue'], unique=False)
+
+
+def downgrade() -> None:
+    op.drop_index('ix_sales_store_id_revenue', table_name='sales')
@@ -0,0 +1,55 @@
+"""sales archives and daily rollups
+
+Revision ID: c82f5e0d9a14
+Revises: a3d9e6f20b15
+Create Date: 2026-10-19 17:40:00.000000
+"""
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = 'c82f5e0d9a14'
+down_revision = 'a3d9e6f20b15'
+branch_labels = None
+depends_on = None
+
+
+def upgrade() -> None:
+    op.create_table('sales_archives',
+    sa.Column('id', sa.Integer(), nullable=False),
+    sa.Column('store_id', sa.Integer(), nullable=False),
+    sa.Column('period_start', sa.DateTime(), nullable=False),
+    sa.Column('period_end', sa.DateTime(), nullable=False),
+    sa.Column('file_path', sa.String(length=500), nullable=False),
+    sa.Column('row_count', sa.Integer(), nullable=False),
+    sa.Column('stored_bytes', sa.Integer(), nullable=False),
+    sa.Column('created_at', sa.DateTime(), nullable=True),
+    sa.ForeignKeyConstraint(['store_id'], ['stores.id'], ),
+    sa.PrimaryKeyConstraint('id')
+    )
+    op.create_index(op.f('ix_sales_archives_id'), 'sales_archives', ['id'], unique=False)
+    op.create_index('ix_sales_archives_store_id_period_start', 'sales_archives', ['store_id', 'period_start'], unique=False)
+    op.create_table('sales_daily_rollups',
+    sa.Column('id', sa.Integer(), nullable=False),
+    sa.Column('product_id', sa.Integer(), nullable=False),
+    sa.Column('store_id', sa.Integer(), nullable=False),
+    sa.Column('date', sa.DateTime(), nullable=False),
+    sa.Column('units_sold', sa.Integer(), nullable=False),
+    sa.Column('revenue', sa.Float(), nullable=False),
+    sa.Column('sale_count', sa.Integer(), nullable=False),
+    sa.ForeignKeyConstraint(['product_id'], ['products.id'], ),
+    sa.ForeignKeyConstraint(['store_id'], ['stores.id'], ),
+    sa.PrimaryKeyConstraint('id')
+    )
+    op.create_index(op.f('ix_sales_daily_rollups_id'), 'sales_daily_rollups', ['id'], unique=False)
+    op.create_index('ix_sales_daily_rollups_store_id_date', 'sales_daily_rollups', ['store_id', 'date'], unique=False)
+
+
+def downgrade() -> None:
+    op.drop_index('ix_sales_daily_rollups_store_id_date', table_name='sales_daily_rollups')
+    op.drop_index(op.f('ix_sales_daily_rollups_id'), table_name='sales_daily_rollups')
+    op.drop_table('sales_daily_rollups')
+    op.drop_index('ix_sales_archives_store_id_period_start', table_name='sales_archives')
+    op.drop_index(op.f('ix_sales_archives_id'), table_name='sales_archives')
+    op.drop_table('sales_archives')
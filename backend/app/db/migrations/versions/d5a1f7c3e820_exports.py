@@ -0,0 +1,42 @@
+"""exports
+
+Revision ID: d5a1f7c3e820
+Revises: c82f5e0d9a14
+Create Date: 2026-10-19 18:20:00.000000
+"""
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = 'd5a1f7c3e820'
+down_revision = 'c82f5e0d9a14'
+branch_labels = None
+depends_on = None
+
+
+def upgrade() -> None:
+    op.create_table('exports',
+    sa.Column('id', sa.Integer(), nullable=False),
+    sa.Column('user_id', sa.Integer(), nullable=False),
+    sa.Column('type', sa.String(length=50), nullable=False),
+    sa.Column('status', sa.String(length=50), nullable=False),
+    sa.Column('format', sa.String(length=10), nullable=False),
+    sa.Column('compression', sa.String(length=10), nullable=True),
+    sa.Column('params', sa.Text(), nullable=False),
+    sa.Column('file_path', sa.String(length=500), nullable=True),
+    sa.Column('processed_rows', sa.Integer(), nullable=True),
+    sa.Column('size_bytes', sa.Integer(), nullable=True),
+    sa.Column('error', sa.String(length=500), nullable=True),
+    sa.Column('purged_at', sa.DateTime(), nullable=True),
+    sa.Column('created_at', sa.DateTime(), nullable=True),
+    sa.Column('updated_at', sa.DateTime(), nullable=True),
+    sa.ForeignKeyConstraint(['user_id'], ['users.id'], ),
+    sa.PrimaryKeyConstraint('id')
+    )
+    op.create_index(op.f('ix_exports_id'), 'exports', ['id'], unique=False)
+
+
+def downgrade() -> None:
+    op.drop_index(op.f('ix_exports_id'), table_name='exports')
+    op.drop_table('exports')
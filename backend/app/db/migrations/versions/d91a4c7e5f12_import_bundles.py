@@ -0,0 +1,29 @@
+"""import bundles
+
+Revision ID: d91a4c7e5f12
+Revises: b3f0d6a1c2e8
+Create Date: 2026-10-19 13:40:00.000000
+"""
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = 'd91a4c7e5f12'
+down_revision = 'b3f0d6a1c2e8'
+branch_labels = None
+depends_on = None
+
+
+def upgrade() -> None:
+    with op.batch_alter_table('imports') as batch_op:
+        batch_op.add_column(sa.Column('parent_id', sa.Integer(), nullable=True))
+        batch_op.create_foreign_key('fk_imports_parent_id_imports', 'imports', ['parent_id'], ['id'])
+        batch_op.create_index(batch_op.f('ix_imports_parent_id'), ['parent_id'], unique=False)
+
+
+def downgrade() -> None:
+    with op.batch_alter_table('imports') as batch_op:
+        batch_op.drop_index(batch_op.f('ix_imports_parent_id'))
+        batch_op.drop_constraint('fk_imports_parent_id_imports', type_='foreignkey')
+        batch_op.drop_column('parent_id')
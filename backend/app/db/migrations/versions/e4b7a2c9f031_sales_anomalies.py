@@ -0,0 +1,42 @@
+"""sales anomalies
+
+Revision ID: e4b7a2c9f031
+Revises: d91a4c7e5f12
+Create Date: 2026-10-19 15:10:00.000000
+"""
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = 'e4b7a2c9f031'
+down_revision = 'd91a4c7e5f12'
+branch_labels = None
+depends_on = None
+
+
+def upgrade() -> None:
+    op.create_table('sales_anomalies',
+    sa.Column('id', sa.Integer(), nullable=False),
+    sa.Column('store_id', sa.Integer(), nullable=False),
+    sa.Column('product_id', sa.Integer(), nullable=False),
+    sa.Column('date', sa.DateTime(), nullable=False),
+    sa.Column('revenue', sa.Float(), nullable=False),
+    sa.Column('baseline', sa.Float(), nullable=False),
+    sa.Column('spread', sa.Float(), nullable=False),
+    sa.Column('score', sa.Float(), nullable=False),
+    sa.Column('direction', sa.String(length=10), nullable=False),
+    sa.Column('method', sa.String(length=20), nullable=False),
+    sa.Column('created_at', sa.DateTime(), nullable=True),
+    sa.ForeignKeyConstraint(['product_id'], ['products.id'], ),
+    sa.ForeignKeyConstraint(['store_id'], ['stores.id'], ),
+    sa.PrimaryKeyConstraint('id')
+    )
+    op.create_index(op.f('ix_sales_anomalies_id'), 'sales_anomalies', ['id'], unique=False)
+    op.create_index('ix_sales_anomalies_store_id_date', 'sales_anomalies', ['store_id', 'date'], unique=False)
+
+
+def downgrade() -> None:
+    op.drop_index('ix_sales_anomalies_store_id_date', table_name='sales_anomalies')
+    op.drop_index(op.f('ix_sales_anomalies_id'), table_name='sales_anomalies')
+    op.drop_table('sales_anomalies')
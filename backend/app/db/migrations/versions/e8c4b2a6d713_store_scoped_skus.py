@@ -0,0 +1,55 @@
+"""store scoped skus
+
+Revision ID: e8c4b2a6d713
+Revises: d5a1f7c3e820
+Create Date: 2026-10-19 19:10:00.000000
+"""
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = 'e8c4b2a6d713'
+down_revision = 'd5a1f7c3e820'
+branch_labels = None
+depends_on = None
+
+
+def upgrade() -> None:
+    op.create_table('master_skus',
+    sa.Column('id', sa.Integer(), nullable=False),
+    sa.Column('code', sa.String(length=120), nullable=False),
+    sa.Column('created_at', sa.DateTime(), nullable=True),
+    sa.PrimaryKeyConstraint('id')
+    )
+    op.create_index(op.f('ix_master_skus_id'), 'master_skus', ['id'], unique=False)
+    op.create_index(op.f('ix_master_skus_code'), 'master_skus', ['code'], unique=True)
+    op.execute(
+        "INSERT INTO master_skus (code, created_at) "
+        "SELECT sku, MIN(created_at) FROM products GROUP BY sku ORDER BY MIN(id)"
+    )
+
+    with op.batch_alter_table('products') as batch_op:
+        batch_op.add_column(sa.Column('master_sku_id', sa.Integer(), nullable=True))
+    op.execute(
+        "UPDATE products SET master_sku_id = "
+        "(SELECT master_skus.id FROM master_skus WHERE master_skus.code = products.sku)"
+    )
+
+    with op.batch_alter_table('products') as batch_op:
+        batch_op.alter_column('master_sku_id', existing_type=sa.Integer(), nullable=False)
+        batch_op.create_foreign_key('fk_products_master_sku_id_master_skus', 'master_skus', ['master_sku_id'], ['id'])
+        batch_op.drop_index('ix_products_sku')
+        batch_op.create_index('ix_products_store_id_master_sku_id', ['store_id', 'master_sku_id'], unique=True)
+
+
+def downgrade() -> None:
+    with op.batch_alter_table('products') as batch_op:
+        batch_op.drop_index('ix_products_store_id_master_sku_id')
+        batch_op.create_index('ix_products_sku', ['sku'], unique=True)
+        batch_op.drop_constraint('fk_products_master_sku_id_master_skus', type_='foreignkey')
+        batch_op.drop_column('master_sku_id')
+
+    op.drop_index(op.f('ix_master_skus_code'), table_name='master_skus')
+    op.drop_index(op.f('ix_master_skus_id'), table_name='master_skus')
+    op.drop_table('master_skus')
@@ -0,0 +1,78 @@
+"""fixed point numbers
+
+Revision ID: f1b7d3c9a265
+Revises: e8c4b2a6d713
+Create Date: 2026-10-19 20:05:00.000000
+"""
+from decimal import ROUND_HALF_UP, Decimal
+from pathlib import Path
+
+from alembic import op
+from alembic.migration import MigrationContext
+from alembic.operations import Operations
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = 'f1b7d3c9a265'
+down_revision = 'e8c4b2a6d713'
+branch_labels = None
+depends_on = None
+
+CATALOG_COLUMNS = (
+    ('sales', 'revenue', 2, False),
+    ('sales_daily_rollups', 'revenue', 2, False),
+    ('products', 'price', 2, True),
+    ('products', 'shelf_space_meters', 3, True),
+    ('shelf_space', 'current_meters', 3, False),
+)
+PARTITION_COLUMNS = CATALOG_COLUMNS[:2]
+
+
+def _fixed_point_units(value, places: int) -> int | None:
+    if value is None:
+        return None
+    return int(Decimal(str(value)).scaleb(places).quantize(Decimal(1), ROUND_HALF_UP))
+
+
+def _to_integer(operations: Operations, columns: tuple) -> None:
+    driver_connection = operations.get_bind().connection.driver_connection
+    driver_connection.create_function('fixed_point_units', 2, _fixed_point_units, deterministic=True)
+    for table, column, places, nullable in columns:
+        operations.execute(f"UPDATE {table} SET {column} = fixed_point_units({column}, {places})")
+        with operations.batch_alter_table(table) as batch_op:
+            batch_op.alter_column(column, existing_type=sa.Float(), type_=sa.Integer(), existing_nullable=nullable)
+
+
+def _to_float(operations: Operations, columns: tuple) -> None:
+    for table, column, places, nullable in columns:
+        with operations.batch_alter_table(table) as batch_op:
+            batch_op.alter_column(column, existing_type=sa.Integer(), type_=sa.Float(), existing_nullable=nullable)
+        operations.execute(f"UPDATE {table} SET {column} = {column} / {float(10 ** places)}")
+
+
+def _partition_paths() -> list[Path]:
+    bind = op.get_bind()
+    if bind.dialect.name != 'sqlite' or not bind.engine.url.database:
+        return []
+    return sorted((Path(bind.engine.url.database).resolve().parent / 'partitions').glob('sales_*.db'))
+
+
+def _migrate_partitions(convert) -> None:
+    for path in _partition_paths():
+        engine = sa.create_engine(f"sqlite:///{path.as_posix()}")
+        with engine.begin() as connection:
+            tables = set(sa.inspect(connection).get_table_names())
+            columns = tuple(entry for entry in PARTITION_COLUMNS if entry[0] in tables)
+            convert(Operations(MigrationContext.configure(connection)), columns)
+        engine.dispose()
+
+
+def upgrade() -> None:
+    _to_integer(op, CATALOG_COLUMNS)
+    _migrate_partitions(_to_integer)
+
+
+def downgrade() -> None:
+    _migrate_partitions(_to_float)
+    _to_float(op, CATALOG_COLUMNS)
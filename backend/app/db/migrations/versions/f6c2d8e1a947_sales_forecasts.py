@@ -0,0 +1,41 @@
+"""sales forecasts
+
+Revision ID: f6c2d8e1a947
+Revises: e4b7a2c9f031
+Create Date: 2026-10-19 16:20:00.000000
+"""
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = 'f6c2d8e1a947'
+down_revision = 'e4b7a2c9f031'
+branch_labels = None
+depends_on = None
+
+
+def upgrade() -> None:
+    op.create_table('sales_forecasts',
+    sa.Column('id', sa.Integer(), nullable=False),
+    sa.Column('store_id', sa.Integer(), nullable=False),
+    sa.Column('product_id', sa.Integer(), nullable=False),
+    sa.Column('method', sa.String(length=30), nullable=False),
+    sa.Column('start_date', sa.DateTime(), nullable=False),
+    sa.Column('horizon_days', sa.Integer(), nullable=False),
+    sa.Column('units_json', sa.JSON(), nullable=False),
+    sa.Column('revenue_json', sa.JSON(), nullable=False),
+    sa.Column('mae', sa.Float(), nullable=True),
+    sa.Column('created_at', sa.DateTime(), nullable=True),
+    sa.ForeignKeyConstraint(['product_id'], ['products.id'], ),
+    sa.ForeignKeyConstraint(['store_id'], ['stores.id'], ),
+    sa.PrimaryKeyConstraint('id')
+    )
+    op.create_index(op.f('ix_sales_forecasts_id'), 'sales_forecasts', ['id'], unique=False)
+    op.create_index('ix_sales_forecasts_store_id_product_id', 'sales_forecasts', ['store_id', 'product_id'], unique=False)
+
+
+def downgrade() -> None:
+    op.drop_index('ix_sales_forecasts_store_id_product_id', table_name='sales_forecasts')
+    op.drop_index(op.f('ix_sales_forecasts_id'), table_name='sales_forecasts')
+    op.drop_table('sales_forecasts')
@@ -0,0 +1,141 @@
+import threading
+from contextlib import contextmanager
+from pathlib import Path
+from typing import Callable, Iterator, TypeVar
+
+from sqlalchemy import create_engine, event, inspect, select, text
+from sqlalchemy.engine import Engine
+from sqlalchemy.orm import Session
+
+from app.core.config import get_settings
+from app.db.session import engine
+from app.models.sale import Sale
+from app.models.sales_rollup import SalesDailyRollup
+
+settings = get_settings()
+
+T = TypeVar("T")
+
+_engines: dict[str, Engine] = {}
+_lock = threading.Lock()
+
+
+def partitioning_enabled() -> bool:
+    return settings.sales_partitioning == "sqlite"
+
+
+def partition_name(store_id: int) -> str:
+    if settings.sales_partition_buckets > 0:
+        return f"sales_h{store_id % settings.sales_partition_buckets:03d}"
+    return f"sales_s{store_id}"
+
+
+def _catalog_path() -> Path:
+    if engine.dialect.name != "sqlite" or not engine.url.database:
+        raise RuntimeError("SQLite sales partitioning requires a file-backed SQLite catalog database")
+    return Path(engine.url.database).resolve()
+
+
+def _partition_dir() -> Path:
+    path = _catalog_path().parent / "partitions"
+    path.mkdir(parents=True, exist_ok=True)
+    return path
+
+
+def get_partition_engine(name: str) -> Engine:
+    with _lock:
+        partition_engine = _engines.get(name)
+        if partition_engine is not None:
+            return partition_engine
+
+        catalog_path = _catalog_path().as_posix()
+        partition_path = (_partition_dir() / f"{name}.db").as_posix()
+        partition_engine = create_engine(
+            f"sqlite:///{partition_path}",
+            connect_args={"check_same_thread": False},
+            future=True,
+        )
+
+        @event.listens_for(partition_engine, "connect")
+        def _attach_catalog(dbapi_connection, _connection_record) -> None:
+            dbapi_connection.execute("ATTACH DATABASE ? AS catalog", (catalog_path,))
+
+        Sale.__table__.create(partition_engine, checkfirst=True)
+        SalesDailyRollup.__table__.create(partition_engine, checkfirst=True)
+        _add_missing_columns(partition_engine)
+        for index in Sale.__table__.indexes:
+            index.create(partition_engine, checkfirst=True)
+        _engines[name] = partition_engine
+        return partition_engine
+
+
+def _add_missing_columns(partition_engine: Engine) -> None:
+    existing = {column["name"] for column in inspect(partition_engine).get_columns(Sale.__tablename__)}
+    missing = [column for column in Sale.__table__.columns if column.name not in existing]
+    if not missing:
+        return
+    with partition_engine.begin() as connection:
+        for column in missing:
+            column_type = column.type.compile(dialect=partition_engine.dialect)
+            connection.execute(text(f"ALTER TABLE {Sale.__tablename__} ADD COLUMN {column.name} {column_type}"))
+            if column.index:
+                connection.execute(
+                    text(f"CREATE INDEX IF NOT EXISTS ix_{Sale.__tablename__}_{column.name} ON {Sale.__tablename__} ({column.name})")
+                )
+
+
+def existing_partitions() -> list[str]:
+    return sorted(path.stem for path in _partition_dir().glob("sales_*.db"))
+
+
+@contextmanager
+def sales_session(db: Session, store_id: int) -> Iterator[Session]:
+    if not partitioning_enabled():
+        yield db
+        return
+    session = Session(bind=get_partition_engine(partition_name(store_id)), autoflush=False, future=True)
+    try:
+        yield session
+    finally:
+        session.close()
+
+
+def partition_sessions(db: Session) -> Iterator[Session]:
+    if not partitioning_enabled():
+        yield db
+        return
+    for name in existing_partitions():
+        session = Session(bind=get_partition_engine(name), autoflush=False, future=True)
+        try:
+            yield session
+        finally:
+            session.close()
+
+
+def fan_out(db: Session, query: Callable[[Session], T]) -> list[T]:
+    return [query(session) for session in partition_sessions(db)]
+
+
+def move_sales_into_partitions(db: Session, batch_size: int = 5000) -> int:
+    sales = Sale.__table__
+    moved = 0
+    store_ids = db.execute(select(Sale.store_id).distinct()).scalars().all()
+    for store_id in store_ids:
+        partition_engine = get_partition_engine(partition_name(store_id))
+        last_id = 0
+        while True:
+            rows = db.execute(
+                select(sales).where(Sale.store_id == store_id, Sale.id > last_id).order_by(Sale.id).limit(batch_size)
+            ).all()
+            if not rows:
+                break
+            last_id = rows[-1].id
+            ids = [row.id for row in rows]
+            with partition_engine.begin() as connection:
+                connection.execute(sales.insert().prefix_with("OR IGNORE"), [dict(row._mapping) for row in rows])
+                copied = {row.id: row for row in connection.execute(select(sales).where(Sale.id.in_(ids)))}
+            confirmed = [row.id for row in rows if copied.get(row.id) == row]
+            db.execute(sales.delete().where(Sale.id.in_(confirmed)))
+            db.commit()
+            moved += len(confirmed)
+    return moved
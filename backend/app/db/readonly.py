@@ -0,0 +1,51 @@
+from contextlib import contextmanager
+from typing import Any, Iterator
+
+from pydantic import BaseModel
+from sqlalchemy import Select, select
+from sqlalchemy.orm import Session
+
+
+class ReadRow:
+    __slots__ = ()
+
+    def __init__(self, *values: Any) -> None:
+        for field, value in zip(self.__slots__, values):
+            setattr(self, field, value)
+
+    def __repr__(self) -> str:
+        fields = ", ".join(f"{field}={getattr(self, field)!r}" for field in self.__slots__)
+        return f"{type(self).__name__}({fields})"
+
+
+_row_types: dict[type[BaseModel], type[ReadRow]] = {}
+
+
+def row_type(schema: type[BaseModel]) -> type[ReadRow]:
+    row_class = _row_types.get(schema)
+    if row_class is None:
+        row_class = type(f"{schema.__name__}Row", (ReadRow,), {"__slots__": tuple(schema.model_fields)})
+        _row_types[schema] = row_class
+    return row_class
+
+
+def select_for(model: type, schema: type[BaseModel]) -> Select:
+    return select(*(getattr(model, field) for field in schema.model_fields))
+
+
+def read_rows(db: Session, stmt: Select, schema: type[BaseModel]) -> list[ReadRow]:
+    row_class = row_type(schema)
+    return [row_class(*row) for row in db.execute(stmt)]
+
+
+@contextmanager
+def read_snapshot(db: Session) -> Iterator[Session]:
+    connection = db.connection()
+    began = connection.dialect.name == "sqlite" and not connection.connection.driver_connection.in_transaction
+    if began:
+        connection.exec_driver_sql("BEGIN")
+    try:
+        yield db
+    finally:
+        if began:
+            connection.exec_driver_sql("ROLLBACK")
@@ -0,0 +1,40 @@
+from decimal import ROUND_HALF_UP, Decimal
+
+from sqlalchemy import Integer
+from sqlalchemy.types import TypeDecorator
+
+_WHOLE = Decimal(1)
+
+
+class FixedPoint(TypeDecorator):
+    impl = Integer
+    cache_ok = True
+    places = 0
+
+    @classmethod
+    def to_units(cls, value) -> int:
+        return int(Decimal(str(value)).scaleb(cls.places).quantize(_WHOLE, ROUND_HALF_UP))
+
+    @classmethod
+    def from_units(cls, units: int) -> float:
+        return units / 10**cls.places
+
+    def process_bind_param(self, value, dialect) -> int | None:
+        if value is None:
+            return None
+        return self.to_units(value)
+
+    def process_result_value(self, value, dialect) -> float | None:
+        if value is None:
+            return None
+        return self.from_units(value)
+
+
+class Money(FixedPoint):
+    cache_ok = True
+    places = 2
+
+
+class Millimetres(FixedPoint):
+    cache_ok = True
+    places = 3
@@ -1,12 +1,19 @@
 from fastapi import FastAPI
+from fastapi.responses import PlainTextResponse
 from fastapi.middleware.cors import CORSMiddleware
 
+from app.core.admission import AdmissionMiddleware
 from app.core.config import get_settings
 from app.core.logging import configure_logging
+from app.core.metrics import metrics
+from app.core.profiling import PROFILE_ID_HEADER, ProfilingMiddleware
+from app.core.security import shutdown_password_executor
 from app.db.base import Base
-from app.db.session import engine
-from app.routers import auth, users, categories, products, sales, shelf_space, traffic, analytics, imports, stores
+from app.db.session import SessionLocal, engine
+from app.routers import auth, users, categories, products, sales, shelf_space, traffic, analytics, imports, exports, stores, profiles
+from app.routers.deps import is_admin_authorization
 from app import models  # noqa: F401
+from app.services.import_service import sweep_import_files
 
 
 settings = get_settings()
@@ -15,18 +22,31 @@ configure_logging()
 
 app = FastAPI(title=settings.app_name)
 
+app.add_middleware(ProfilingMiddleware, authorize=is_admin_authorization)
+app.add_middleware(AdmissionMiddleware)
 app.add_middleware(
     CORSMiddleware,
     allow_origins=["http://localhost:8080", "http://127.0.0.1:8080"],
     allow_credentials=True,
     allow_methods=["*"],
     allow_headers=["*"],
+    expose_headers=[PROFILE_ID_HEADER],
 )
 
 
 @app.on_event("startup")
 def on_startup() -> None:
     Base.metadata.create_all(bind=engine)
+    db = SessionLocal()
+    try:
+        sweep_import_files(db)
+    finally:
+        db.close()
+
+
+@app.on_event("shutdown")
+def on_shutdown() -> None:
+    shutdown_password_executor()
 
 
 @app.get("/health")
@@ -34,6 +54,13 @@ def health_check() -> dict:
     return {"status": "ok"}
 
 
+if settings.metrics_enabled:
+
+    @app.get("/metrics", response_class=PlainTextResponse)
+    def get_metrics() -> str:
+        return metrics.render()
+
+
 app.include_router(auth.router, prefix=settings.api_v1_prefix)
 app.include_router(users.router, prefix=settings.api_v1_prefix)
 app.include_router(stores.router, prefix=settings.api_v1_prefix)
@@ -44,3 +71,5 @@ app.include_router(shelf_space.router, prefix=settings.api_v1_prefix)
 app.include_router(traffic.router, prefix=settings.api_v1_prefix)
 app.include_router(analytics.router, prefix=settings.api_v1_prefix)
 app.include_router(imports.router, prefix=settings.api_v1_prefix)
+app.include_router(exports.router, prefix=settings.api_v1_prefix)
+app.include_router(profiles.router, prefix=settings.api_v1_prefix)
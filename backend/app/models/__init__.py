@@ -1,8 +1,14 @@
 from app.models.analytics_result import AnalyticsResult
 from app.models.category import Category
+from app.models.export_job import ExportJob
 from app.models.import_job import ImportJob
+from app.models.master_sku import MasterSku
 from app.models.product import Product
 from app.models.sale import Sale
+from app.models.sales_anomaly import SalesAnomaly
+from app.models.sales_archive import SalesArchive
+from app.models.sales_forecast import SalesForecast
+from app.models.sales_rollup import SalesDailyRollup
 from app.models.shelf_space import ShelfSpace
 from app.models.store import Store
 from app.models.traffic_zone import TrafficZone
@@ -11,9 +17,15 @@ from app.models.user import User
 __all__ = [
     "AnalyticsResult",
     "Category",
+    "ExportJob",
     "ImportJob",
+    "MasterSku",
     "Product",
     "Sale",
+    "SalesAnomaly",
+    "SalesArchive",
+    "SalesDailyRollup",
+    "SalesForecast",
     "ShelfSpace",
     "Store",
     "TrafficZone",
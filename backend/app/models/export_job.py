@@ -0,0 +1,24 @@
+from datetime import datetime
+
+from sqlalchemy import Column, DateTime, ForeignKey, Integer, String, Text
+
+from app.db.base import Base
+
+
+class ExportJob(Base):
+    __tablename__ = "exports"
+
+    id = Column(Integer, primary_key=True, index=True)
+    user_id = Column(Integer, ForeignKey("users.id"), nullable=False)
+    type = Column(String(50), nullable=False)
+    status = Column(String(50), nullable=False, default="queued")
+    format = Column(String(10), nullable=False)
+    compression = Column(String(10), nullable=True)
+    params = Column(Text, nullable=False, default="{}")
+    file_path = Column(String(500), nullable=True)
+    processed_rows = Column(Integer, nullable=True)
+    size_bytes = Column(Integer, nullable=True)
+    error = Column(String(500), nullable=True)
+    purged_at = Column(DateTime, nullable=True)
+    created_at = Column(DateTime, default=datetime.utcnow)
+    updated_at = Column(DateTime, default=datetime.utcnow, onupdate=datetime.utcnow)
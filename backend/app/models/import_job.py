@@ -10,12 +10,19 @@ class ImportJob(Base):
 
     id = Column(Integer, primary_key=True, index=True)
     user_id = Column(Integer, ForeignKey("users.id"), nullable=False)
+    parent_id = Column(Integer, ForeignKey("imports.id"), index=True, nullable=True)
     type = Column(String(50), nullable=False)
     status = Column(String(50), nullable=False, default="queued")
     original_filename = Column(String(255), nullable=True)
+    file_path = Column(String(500), nullable=True)
+    content_hash = Column(String(64), index=True, nullable=True)
+    size_bytes = Column(Integer, nullable=True)
+    stored_bytes = Column(Integer, nullable=True)
     total_rows = Column(Integer, nullable=True)
     processed_rows = Column(Integer, nullable=True)
+    unchanged_rows = Column(Integer, nullable=True)
     error_count = Column(Integer, nullable=True)
     error_report_path = Column(String(500), nullable=True)
+    purged_at = Column(DateTime, nullable=True)
     created_at = Column(DateTime, default=datetime.utcnow)
     updated_at = Column(DateTime, default=datetime.utcnow, onupdate=datetime.utcnow)
@@ -0,0 +1,13 @@
+from datetime import datetime
+
+from sqlalchemy import Column, DateTime, Integer, String
+
+from app.db.base import Base
+
+
+class MasterSku(Base):
+    __tablename__ = "master_skus"
+
+    id = Column(Integer, primary_key=True, index=True)
+    code = Column(String(120), unique=True, index=True, nullable=False)
+    created_at = Column(DateTime, default=datetime.utcnow)
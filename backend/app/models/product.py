@@ -1,19 +1,49 @@
 from datetime import datetime
 
-from sqlalchemy import Column, DateTime, Float, ForeignKey, Integer, String
+from sqlalchemy import Column, DateTime, ForeignKey, Index, Integer, String, event, inspect, select
+from sqlalchemy.dialects.sqlite import insert
+from sqlalchemy.orm import Session, relationship
 
 from app.db.base import Base
+from app.db.types import Millimetres, Money
+from app.models.master_sku import MasterSku
 
 
 class Product(Base):
     __tablename__ = "products"
+    __table_args__ = (Index("ix_products_store_id_master_sku_id", "store_id", "master_sku_id", unique=True),)
 
     id = Column(Integer, primary_key=True, index=True)
-    sku = Column(String(120), unique=True, index=True, nullable=False)
+    sku = Column(String(120), nullable=False)
+    master_sku_id = Column(Integer, ForeignKey("master_skus.id"), nullable=False)
     name = Column(String(255), nullable=False)
     category_id = Column(Integer, ForeignKey("categories.id"), nullable=False)
-    price = Column(Float, nullable=True)
-    shelf_space_meters = Column(Float, nullable=True)
+    price = Column(Money(), nullable=True)
+    shelf_space_meters = Column(Millimetres(), nullable=True)
     store_id = Column(Integer, ForeignKey("stores.id"), nullable=False)
     created_at = Column(DateTime, default=datetime.utcnow)
     updated_at = Column(DateTime, default=datetime.utcnow, onupdate=datetime.utcnow)
+
+    master_sku = relationship(MasterSku)
+
+
+@event.listens_for(Session, "before_flush")
+def _assign_master_skus(session: Session, _flush_context, _instances) -> None:
+    products = [
+        obj
+        for obj in (*session.new, *session.dirty)
+        if isinstance(obj, Product)
+        and obj.sku is not None
+        and (obj.master_sku_id is None or inspect(obj).attrs.sku.history.has_changes())
+    ]
+    if not products:
+        return
+    codes = sorted({product.sku for product in products})
+    with session.no_autoflush:
+        session.execute(
+            insert(MasterSku).values([{"code": code} for code in codes]).on_conflict_do_nothing(index_elements=["code"])
+        )
+        found = session.scalars(select(MasterSku).where(MasterSku.code.in_(codes)))
+        masters = {master.code: master for master in found}
+    for product in products:
+        product.master_sku = masters[product.sku]
@@ -1,17 +1,20 @@
 from datetime import datetime
 
-from sqlalchemy import Column, DateTime, Float, ForeignKey, Integer
+from sqlalchemy import Column, DateTime, ForeignKey, Index, Integer, String
 
 from app.db.base import Base
+from app.db.types import Money
 
 
 class Sale(Base):
     __tablename__ = "sales"
+    __table_args__ = (Index("ix_sales_store_id_revenue", "store_id", "revenue"),)
 
     id = Column(Integer, primary_key=True, index=True)
     product_id = Column(Integer, ForeignKey("products.id"), nullable=False)
     store_id = Column(Integer, ForeignKey("stores.id"), nullable=False)
     date = Column(DateTime, nullable=False)
     units_sold = Column(Integer, nullable=False)
-    revenue = Column(Float, nullable=False)
+    revenue = Column(Money(), nullable=False)
+    basket_id = Column(String(64), index=True, nullable=True)
     created_at = Column(DateTime, default=datetime.utcnow)
@@ -0,0 +1,22 @@
+from datetime import datetime
+
+from sqlalchemy import Column, DateTime, Float, ForeignKey, Index, Integer, String
+
+from app.db.base import Base
+
+
+class SalesAnomaly(Base):
+    __tablename__ = "sales_anomalies"
+    __table_args__ = (Index("ix_sales_anomalies_store_id_date", "store_id", "date"),)
+
+    id = Column(Integer, primary_key=True, index=True)
+    store_id = Column(Integer, ForeignKey("stores.id"), nullable=False)
+    product_id = Column(Integer, ForeignKey("products.id"), nullable=False)
+    date = Column(DateTime, nullable=False)
+    revenue = Column(Float, nullable=False)
+    baseline = Column(Float, nullable=False)
+    spread = Column(Float, nullable=False)
+    score = Column(Float, nullable=False)
+    direction = Column(String(10), nullable=False)
+    method = Column(String(20), nullable=False)
+    created_at = Column(DateTime, default=datetime.utcnow)
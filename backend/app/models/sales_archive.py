@@ -0,0 +1,19 @@
+from datetime import datetime
+
+from sqlalchemy import Column, DateTime, ForeignKey, Index, Integer, String
+
+from app.db.base import Base
+
+
+class SalesArchive(Base):
+    __tablename__ = "sales_archives"
+    __table_args__ = (Index("ix_sales_archives_store_id_period_start", "store_id", "period_start"),)
+
+    id = Column(Integer, primary_key=True, index=True)
+    store_id = Column(Integer, ForeignKey("stores.id"), nullable=False)
+    period_start = Column(DateTime, nullable=False)
+    period_end = Column(DateTime, nullable=False)
+    file_path = Column(String(500), nullable=False)
+    row_count = Column(Integer, nullable=False)
+    stored_bytes = Column(Integer, nullable=False)
+    created_at = Column(DateTime, default=datetime.utcnow)
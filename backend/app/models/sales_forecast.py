@@ -0,0 +1,22 @@
+from datetime import datetime
+
+from sqlalchemy import Column, DateTime, Float, ForeignKey, Index, Integer, String
+from sqlalchemy.types import JSON
+
+from app.db.base import Base
+
+
+class SalesForecast(Base):
+    __tablename__ = "sales_forecasts"
+    __table_args__ = (Index("ix_sales_forecasts_store_id_product_id", "store_id", "product_id"),)
+
+    id = Column(Integer, primary_key=True, index=True)
+    store_id = Column(Integer, ForeignKey("stores.id"), nullable=False)
+    product_id = Column(Integer, ForeignKey("products.id"), nullable=False)
+    method = Column(String(30), nullable=False)
+    start_date = Column(DateTime, nullable=False)
+    horizon_days = Column(Integer, nullable=False)
+    units_json = Column(JSON, nullable=False)
+    revenue_json = Column(JSON, nullable=False)
+    mae = Column(Float, nullable=True)
+    created_at = Column(DateTime, default=datetime.utcnow)
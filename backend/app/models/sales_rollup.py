@@ -0,0 +1,17 @@
+from sqlalchemy import Column, DateTime, ForeignKey, Index, Integer
+
+from app.db.base import Base
+from app.db.types import Money
+
+
+class SalesDailyRollup(Base):
+    __tablename__ = "sales_daily_rollups"
+    __table_args__ = (Index("ix_sales_daily_rollups_store_id_date", "store_id", "date"),)
+
+    id = Column(Integer, primary_key=True, index=True)
+    product_id = Column(Integer, ForeignKey("products.id"), nullable=False)
+    store_id = Column(Integer, ForeignKey("stores.id"), nullable=False)
+    date = Column(DateTime, nullable=False)
+    units_sold = Column(Integer, nullable=False)
+    revenue = Column(Money(), nullable=False)
+    sale_count = Column(Integer, nullable=False)
@@ -1,8 +1,9 @@
 from datetime import datetime
 
-from sqlalchemy import Column, DateTime, Float, ForeignKey, Integer
+from sqlalchemy import Column, DateTime, ForeignKey, Integer
 
 from app.db.base import Base
+from app.db.types import Millimetres
 
 
 class ShelfSpace(Base):
@@ -11,5 +12,5 @@ class ShelfSpace(Base):
     id = Column(Integer, primary_key=True, index=True)
     store_id = Column(Integer, ForeignKey("stores.id"), nullable=False)
     category_id = Column(Integer, ForeignKey("categories.id"), nullable=False)
-    current_meters = Column(Float, nullable=False)
+    current_meters = Column(Millimetres(), nullable=False)
     updated_at = Column(DateTime, default=datetime.utcnow, onupdate=datetime.utcnow)
@@ -15,3 +15,4 @@ class TrafficZone(Base):
     y = Column(Integer, nullable=False)
     traffic_score = Column(Float, nullable=False)
     created_at = Column(DateTime, default=datetime.utcnow)
+    updated_at = Column(DateTime, default=datetime.utcnow, onupdate=datetime.utcnow)
@@ -1,13 +1,40 @@
+import json
 from datetime import datetime
+from typing import Literal
 
-from fastapi import APIRouter, Depends, Query
+from fastapi import APIRouter, BackgroundTasks, Depends, HTTPException, Query, status
+from fastapi.responses import StreamingResponse
 from sqlalchemy.orm import Session
 
-from app.db.session import get_db
-from app.schemas.analytics import HeatmapResponse, SpaceElasticityResponse, TailAnalysisResponse
-from app.services.analytics_service import heatmap_analysis, space_elasticity, tail_analysis
+from app.core.profiling import ProfiledRoute
+from app.db.session import SessionLocal, get_db
+from app.schemas.analytics import (
+    AbcXyzResponse,
+    AffinityResponse,
+    AnomalyRunRequest,
+    ForecastRunRequest,
+    HeatmapResponse,
+    SalesAnomalyRead,
+    SalesForecastRead,
+    SpaceElasticityResponse,
+    TailAnalysisResponse,
+)
+from app.services.analytics_service import (
+    compare_space_elasticity,
+    compare_tail_analysis,
+    heatmap_analysis,
+    space_elasticity,
+    stream_tail_analysis,
+    tail_analysis,
+)
+from app.services.affinity_service import affinity_analysis
+from app.services.anomaly_service import ANOMALY_METHODS, list_anomalies
+from app.services.classification_service import abc_xyz_analysis
+from app.services.forecast_service import FORECAST_METHODS, list_forecasts
+from app.tasks.anomaly_tasks import run_anomaly_detection
+from app.tasks.forecast_tasks import run_forecasts
 
-router = APIRouter(prefix="/analytics", tags=["analytics"])
+router = APIRouter(prefix="/analytics", tags=["analytics"], route_class=ProfiledRoute)
 
 
 @router.get("/tail", response_model=TailAnalysisResponse)
@@ -17,9 +44,39 @@ def get_tail_analysis(
     date_end: datetime | None = Query(default=None),
     category_id: int | None = Query(default=None),
     search: str | None = Query(default=None),
+    approx: bool = Query(default=False),
+    compare_start: datetime | None = Query(default=None),
+    compare_end: datetime | None = Query(default=None),
     db: Session = Depends(get_db),
 ) -> dict:
-    return tail_analysis(db, store_id, date_start, date_end, category_id, search)
+    if compare_start is not None or compare_end is not None:
+        return compare_tail_analysis(
+            db, store_id, (date_start, date_end), (compare_start, compare_end), category_id, search
+        )
+    return tail_analysis(db, store_id, date_start, date_end, category_id, search, approx=approx)
+
+
+@router.get("/tail/stream")
+def stream_tail(
+    store_id: int = Query(...),
+    date_start: datetime | None = Query(default=None),
+    date_end: datetime | None = Query(default=None),
+    category_id: int | None = Query(default=None),
+    search: str | None = Query(default=None),
+    classification: Literal["core", "average", "tail"] | None = Query(default=None),
+    limit: int | None = Query(default=None, ge=1),
+) -> StreamingResponse:
+    def lines():
+        db = SessionLocal()
+        try:
+            for item in stream_tail_analysis(
+                db, store_id, date_start, date_end, category_id, search, classification, limit
+            ):
+                yield json.dumps(item) + "\n"
+        finally:
+            db.close()
+
+    return StreamingResponse(lines(), media_type="application/x-ndjson")
 
 
 @router.get("/space", response_model=SpaceElasticityResponse)
@@ -27,9 +84,16 @@ def get_space_elasticity(
     store_id: int = Query(...),
     date_start: datetime | None = Query(default=None),
     date_end: datetime | None = Query(default=None),
+    compare_start: datetime | None = Query(default=None),
+    compare_end: datetime | None = Query(default=None),
+    include_adjacency: bool = Query(default=False),
     db: Session = Depends(get_db),
 ) -> dict:
-    return space_elasticity(db, store_id, date_start, date_end)
+    if compare_start is not None or compare_end is not None:
+        return compare_space_elasticity(
+            db, store_id, (date_start, date_end), (compare_start, compare_end), include_adjacency
+        )
+    return space_elasticity(db, store_id, date_start, date_end, include_adjacency)
 
 
 @router.get("/heatmap", response_model=HeatmapResponse)
@@ -40,3 +104,83 @@ def get_heatmap(
     db: Session = Depends(get_db),
 ) -> dict:
     return heatmap_analysis(db, store_id, date_start, date_end)
+
+
+@router.get("/affinity", response_model=AffinityResponse)
+def get_affinity(
+    store_id: int = Query(...),
+    level: Literal["category", "product"] = Query(default="category"),
+    date_start: datetime | None = Query(default=None),
+    date_end: datetime | None = Query(default=None),
+    min_count: int | None = Query(default=None, ge=1),
+    limit: int = Query(default=100, ge=1, le=1000),
+    db: Session = Depends(get_db),
+) -> dict:
+    return affinity_analysis(db, store_id, level, date_start, date_end, min_count, limit)
+
+
+@router.get("/abc-xyz", response_model=AbcXyzResponse)
+def get_abc_xyz(
+    store_id: int | None = Query(default=None),
+    date_start: datetime | None = Query(default=None),
+    date_end: datetime | None = Query(default=None),
+    metric: Literal["revenue", "units"] | None = Query(default=None),
+    a: float | None = Query(default=None),
+    b: float | None = Query(default=None),
+    x: float | None = Query(default=None),
+    y: float | None = Query(default=None),
+    db: Session = Depends(get_db),
+) -> dict:
+    try:
+        return abc_xyz_analysis(db, store_id, date_start, date_end, metric, (a, b), (x, y))
+    except ValueError as exc:
+        raise HTTPException(status_code=400, detail=str(exc)) from exc
+
+
+@router.get("/anomalies", response_model=list[SalesAnomalyRead])
+def get_anomalies(
+    store_id: int = Query(...),
+    date_start: datetime | None = Query(default=None),
+    date_end: datetime | None = Query(default=None),
+    direction: Literal["spike", "drop"] | None = Query(default=None),
+    limit: int = Query(default=100, ge=1, le=1000),
+    db: Session = Depends(get_db),
+) -> list[dict]:
+    return list_anomalies(db, store_id, date_start, date_end, direction, limit)
+
+
+@router.post("/anomalies/run", status_code=status.HTTP_202_ACCEPTED)
+def run_anomalies(payload: AnomalyRunRequest, background_tasks: BackgroundTasks) -> dict:
+    if payload.method is not None and payload.method not in ANOMALY_METHODS:
+        raise HTTPException(status_code=400, detail=f"Unsupported anomaly method: {payload.method}")
+    if payload.window is not None and payload.window < 2:
+        raise HTTPException(status_code=400, detail="Anomaly window must be at least 2 days")
+    background_tasks.add_task(
+        run_anomaly_detection,
+        store_id=payload.store_id,
+        window=payload.window,
+        threshold=payload.threshold,
+        method=payload.method,
+    )
+    return {"status": "scheduled"}
+
+
+@router.get("/forecast", response_model=list[SalesForecastRead])
+def get_forecasts(
+    store_id: int = Query(...),
+    product_id: int | None = Query(default=None),
+    limit: int = Query(default=100, ge=1, le=1000),
+    offset: int = Query(default=0, ge=0),
+    db: Session = Depends(get_db),
+) -> list[dict]:
+    return list_forecasts(db, store_id, product_id, limit, offset)
+
+
+@router.post("/forecast/run", status_code=status.HTTP_202_ACCEPTED)
+def run_forecast(payload: ForecastRunRequest, background_tasks: BackgroundTasks) -> dict:
+    if payload.method is not None and payload.method not in FORECAST_METHODS:
+        raise HTTPException(status_code=400, detail=f"Unsupported forecast method: {payload.method}")
+    if payload.horizon is not None and payload.horizon < 1:
+        raise HTTPException(status_code=400, detail="Forecast horizon must be at least 1 day")
+    background_tasks.add_task(run_forecasts, store_id=payload.store_id, horizon=payload.horizon, method=payload.method)
+    return {"status": "scheduled"}
@@ -1,26 +1,28 @@
-from fastapi import APIRouter, Depends, Header, HTTPException, status
+from fastapi import APIRouter, Depends, HTTPException, status
 from sqlalchemy.orm import Session
 
-from app.core.security import decode_token
+from app.core.profiling import ProfiledRoute
 from app.db.session import get_db
+from app.routers.deps import get_current_user
 from app.schemas.auth import LoginRequest, RefreshRequest, TokenResponse
 from app.schemas.common import Message
 from app.schemas.user import UserCreate, UserRead
 from app.services.auth_service import (
-    authenticate_user,
+    authenticate_user_async,
     create_admin_user,
-    create_user,
-    get_user_by_email,
+    create_user_async,
+    get_user_by_email_async,
     has_users,
     issue_tokens,
+    resolve_token,
 )
 
-router = APIRouter(prefix="/auth", tags=["auth"])
+router = APIRouter(prefix="/auth", tags=["auth"], route_class=ProfiledRoute)
 
 
 @router.post("/login", response_model=TokenResponse)
-def login(payload: LoginRequest, db: Session = Depends(get_db)) -> TokenResponse:
-    user = authenticate_user(db, payload.email, payload.password)
+async def login(payload: LoginRequest) -> TokenResponse:
+    user = await authenticate_user_async(payload.email, payload.password)
     if not user:
         raise HTTPException(status_code=status.HTTP_401_UNAUTHORIZED, detail="Invalid credentials")
     return TokenResponse(**issue_tokens(user))
@@ -29,17 +31,13 @@ def login(payload: LoginRequest, db: Session = Depends(get_db)) -> TokenResponse
 @router.post("/refresh", response_model=TokenResponse)
 def refresh(payload: RefreshRequest, db: Session = Depends(get_db)) -> TokenResponse:
     try:
-        token_payload = decode_token(payload.refresh_token)
+        token_payload, user = resolve_token(db, payload.refresh_token)
     except ValueError:
         raise HTTPException(status_code=status.HTTP_401_UNAUTHORIZED, detail="Invalid refresh token")
 
     if token_payload.get("type") != "refresh":
         raise HTTPException(status_code=status.HTTP_401_UNAUTHORIZED, detail="Invalid refresh token")
 
-    user_id = token_payload.get("sub")
-    from app.models.user import User
-
-    user = db.query(User).filter(User.id == int(user_id)).first()
     if not user:
         raise HTTPException(status_code=status.HTTP_401_UNAUTHORIZED, detail="User not found")
     return TokenResponse(**issue_tokens(user))
@@ -51,11 +49,11 @@ def logout() -> Message:
 
 
 @router.post("/register", response_model=UserRead, status_code=status.HTTP_201_CREATED)
-def register(payload: UserCreate, db: Session = Depends(get_db)) -> UserRead:
-    existing = get_user_by_email(db, payload.email)
+async def register(payload: UserCreate) -> UserRead:
+    existing = await get_user_by_email_async(payload.email)
     if existing:
         raise HTTPException(status_code=status.HTTP_400_BAD_REQUEST, detail="Email already registered")
-    user = create_user(db, payload.email, payload.password, payload.full_name)
+    user = await create_user_async(payload.email, payload.password, payload.full_name)
     return UserRead.model_validate(user)
 
 
@@ -68,18 +66,5 @@ def bootstrap_admin(payload: UserCreate, db: Session = Depends(get_db)) -> UserR
 
 
 @router.get("/me", response_model=UserRead)
-def me(authorization: str = Header(...), db: Session = Depends(get_db)) -> UserRead:
-    if not authorization.lower().startswith("bearer "):
-        raise HTTPException(status_code=status.HTTP_401_UNAUTHORIZED, detail="Missing bearer token")
-    token = authorization.split(" ", 1)[1]
-    try:
-        payload = decode_token(token)
-    except ValueError:
-        raise HTTPException(status_code=status.HTTP_401_UNAUTHORIZED, detail="Invalid token")
-
-    from app.models.user import User
-
-    user = db.query(User).filter(User.id == int(payload.get("sub"))).first()
-    if not user:
-        raise HTTPException(status_code=status.HTTP_401_UNAUTHORIZED, detail="User not found")
-    return UserRead.model_validate(user)
+def me(current_user: UserRead = Depends(get_current_user)) -> UserRead:
+    return current_user
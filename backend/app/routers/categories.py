@@ -1,17 +1,24 @@
-from fastapi import APIRouter, Depends, HTTPException, status
+from fastapi import APIRouter, Depends, HTTPException, Request, Response, status
 from sqlalchemy.orm import Session
 
+from app.core.profiling import ProfiledRoute
 from app.db.session import get_db
 from app.schemas.category import CategoryCreate, CategoryRead
 from app.services.catalog_service import create_category, list_categories
+from app.services.reference_cache import cached_response
 
-router = APIRouter(prefix="/categories", tags=["categories"])
+router = APIRouter(prefix="/categories", tags=["categories"], route_class=ProfiledRoute)
 
 
 @router.get("", response_model=list[CategoryRead])
-def get_categories(db: Session = Depends(get_db)) -> list[CategoryRead]:
-    categories = list_categories(db)
-    return [CategoryRead.model_validate(category) for category in categories]
+def get_categories(request: Request, db: Session = Depends(get_db)) -> Response:
+    return cached_response(
+        request,
+        db,
+        ("categories",),
+        CategoryRead,
+        lambda: list_categories(db),
+    )
 
 
 @router.post("", response_model=CategoryRead, status_code=status.HTTP_201_CREATED)
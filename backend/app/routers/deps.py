@@ -0,0 +1,36 @@
+from fastapi import Depends, Header, HTTPException, status
+from sqlalchemy.orm import Session
+
+from app.db.session import SessionLocal, get_db
+from app.schemas.user import UserRead
+from app.services.auth_service import resolve_token
+
+
+def get_current_user(authorization: str = Header(...), db: Session = Depends(get_db)) -> UserRead:
+    if not authorization.lower().startswith("bearer "):
+        raise HTTPException(status_code=status.HTTP_401_UNAUTHORIZED, detail="Missing bearer token")
+    token = authorization.split(" ", 1)[1]
+    try:
+        _payload, user = resolve_token(db, token)
+    except ValueError:
+        raise HTTPException(status_code=status.HTTP_401_UNAUTHORIZED, detail="Invalid token")
+    if not user:
+        raise HTTPException(status_code=status.HTTP_401_UNAUTHORIZED, detail="User not found")
+    return user
+
+
+def require_admin(current_user: UserRead = Depends(get_current_user)) -> UserRead:
+    if current_user.role != "admin":
+        raise HTTPException(status_code=status.HTTP_403_FORBIDDEN, detail="Admin access required")
+    return current_user
+
+
+def is_admin_authorization(authorization: str) -> bool:
+    db = SessionLocal()
+    try:
+        require_admin(get_current_user(authorization, db))
+    except HTTPException:
+        return False
+    finally:
+        db.close()
+    return True
@@ -0,0 +1,165 @@
+from datetime import datetime
+from typing import Literal
+
+from fastapi import APIRouter, BackgroundTasks, Depends, HTTPException, Query
+from fastapi.concurrency import run_in_threadpool
+from fastapi.responses import FileResponse, StreamingResponse
+from sqlalchemy.orm import Session
+
+from app.core.profiling import ProfiledRoute
+from app.db.session import SessionLocal, get_db
+from app.models.export_job import ExportJob
+from app.schemas.export_job import ExportJobRead, ExportRequest
+from app.services.export_service import (
+    enqueue_export,
+    export_download_name,
+    load_params,
+    stream_export,
+    validate_export,
+)
+from app.services.import_events import export_broker, job_events
+from app.tasks.export_tasks import process_export_job
+from app.utils.export_writers import export_media_type
+
+router = APIRouter(prefix="/exports", tags=["exports"], route_class=ProfiledRoute)
+
+
+def _stream_response(
+    export_type: str,
+    export_format: str,
+    compression: str | None,
+    params: dict,
+) -> StreamingResponse:
+    try:
+        validate_export(export_type, export_format, compression, params)
+    except ValueError as exc:
+        raise HTTPException(status_code=400, detail=str(exc))
+
+    def chunks():
+        db = SessionLocal()
+        try:
+            yield from stream_export(db, export_type, export_format, compression, params)
+        finally:
+            db.close()
+
+    filename = export_download_name(export_type, export_format, compression, params)
+    return StreamingResponse(
+        chunks(),
+        media_type=export_media_type(export_format, compression),
+        headers={"Content-Disposition": f'attachment; filename="{filename}"'},
+    )
+
+
+@router.get("/sales")
+def export_sales(
+    store_id: int | None = Query(default=None),
+    date_start: datetime | None = Query(default=None),
+    date_end: datetime | None = Query(default=None),
+    format: Literal["csv", "xlsx"] = Query(default="csv"),
+    compression: Literal["gzip"] | None = Query(default=None),
+) -> StreamingResponse:
+    params = {"store_id": store_id, "date_start": date_start, "date_end": date_end}
+    return _stream_response("sales", format, compression, params)
+
+
+@router.get("/tail")
+def export_tail(
+    store_id: int = Query(...),
+    date_start: datetime | None = Query(default=None),
+    date_end: datetime | None = Query(default=None),
+    category_id: int | None = Query(default=None),
+    search: str | None = Query(default=None),
+    classification: Literal["core", "average", "tail"] | None = Query(default=None),
+    format: Literal["csv", "xlsx"] = Query(default="csv"),
+    compression: Literal["gzip"] | None = Query(default=None),
+) -> StreamingResponse:
+    params = {
+        "store_id": store_id,
+        "date_start": date_start,
+        "date_end": date_end,
+        "category_id": category_id,
+        "search": search,
+        "classification": classification,
+    }
+    return _stream_response("tail", format, compression, params)
+
+
+@router.get("/space")
+def export_space(
+    store_id: int = Query(...),
+    date_start: datetime | None = Query(default=None),
+    date_end: datetime | None = Query(default=None),
+    format: Literal["csv", "xlsx"] = Query(default="csv"),
+    compression: Literal["gzip"] | None = Query(default=None),
+) -> StreamingResponse:
+    params = {"store_id": store_id, "date_start": date_start, "date_end": date_end}
+    return _stream_response("space", format, compression, params)
+
+
+@router.post("", response_model=ExportJobRead, status_code=201)
+def create_export(
+    payload: ExportRequest,
+    background_tasks: BackgroundTasks,
+    db: Session = Depends(get_db),
+) -> ExportJobRead:
+    params = payload.model_dump(exclude={"type", "format", "compression", "user_id"}, exclude_none=True)
+    try:
+        job = enqueue_export(db, payload.user_id, payload.type, payload.format, payload.compression, params)
+    except ValueError as exc:
+        raise HTTPException(status_code=400, detail=str(exc))
+    background_tasks.add_task(process_export_job, job.id)
+    return ExportJobRead.model_validate(job)
+
+
+@router.get("/{export_id}", response_model=ExportJobRead)
+def get_export(export_id: int, db: Session = Depends(get_db)) -> ExportJobRead:
+    job = db.query(ExportJob).filter(ExportJob.id == export_id).first()
+    if not job:
+        raise HTTPException(status_code=404, detail="Export not found")
+    return ExportJobRead.model_validate(job)
+
+
+@router.get("/{export_id}/download")
+def download_export(export_id: int, db: Session = Depends(get_db)) -> FileResponse:
+    job = db.query(ExportJob).filter(ExportJob.id == export_id).first()
+    if not job:
+        raise HTTPException(status_code=404, detail="Export not found")
+    if job.status != "completed" or job.purged_at is not None or not job.file_path:
+        raise HTTPException(status_code=409, detail=f"Export is not available for download ({job.status})")
+    return FileResponse(
+        job.file_path,
+        media_type=export_media_type(job.format, job.compression),
+        filename=export_download_name(job.type, job.format, job.compression, load_params(job.params)),
+    )
+
+
+def _export_snapshot(export_id: int) -> dict | None:
+    db = SessionLocal()
+    try:
+        job = db.get(ExportJob, export_id)
+        if not job:
+            return None
+        return {
+            "id": job.id,
+            "status": job.status,
+            "processed_rows": job.processed_rows or 0,
+            "error_count": 1 if job.status == "failed" else 0,
+            "rows_per_sec": 0.0,
+        }
+    finally:
+        db.close()
+
+
+@router.get("/{export_id}/events")
+async def stream_export_events(export_id: int) -> StreamingResponse:
+    queue = export_broker.subscribe(export_id)
+    snapshot = await run_in_threadpool(_export_snapshot, export_id)
+    if snapshot is None:
+        export_broker.unsubscribe(export_id, queue)
+        raise HTTPException(status_code=404, detail="Export not found")
+
+    return StreamingResponse(
+        job_events(export_broker, export_id, queue, snapshot, lambda: _export_snapshot(export_id)),
+        media_type="text/event-stream",
+        headers={"Cache-Control": "no-cache", "X-Accel-Buffering": "no"},
+    )
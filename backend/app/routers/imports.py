@@ -1,25 +1,56 @@
-from fastapi import APIRouter, Depends, File, Form, UploadFile, HTTPException
+import zipfile
+
+from fastapi import APIRouter, BackgroundTasks, Depends, File, Form, UploadFile, HTTPException
+from fastapi.concurrency import run_in_threadpool
+from fastapi.responses import StreamingResponse
 from sqlalchemy.orm import Session
 
-from app.db.session import get_db
+from app.core.profiling import ProfiledRoute
+from app.db.session import SessionLocal, get_db
 from app.models.import_job import ImportJob
-from app.schemas.import_job import ImportJobRead
-from app.services.import_service import enqueue_import
+from app.schemas.import_job import ImportBundleRead, ImportJobRead
+from app.services.import_events import broker, job_events
+from app.services.import_service import enqueue_import, enqueue_import_bundle
+from app.tasks.import_tasks import process_import_bundle, process_import_job
 
-router = APIRouter(prefix="/imports", tags=["imports"])
+router = APIRouter(prefix="/imports", tags=["imports"], route_class=ProfiledRoute)
 
 
 @router.post("", response_model=ImportJobRead, status_code=201)
 def upload_import(
+    background_tasks: BackgroundTasks,
     file: UploadFile = File(...),
     import_type: str = Form(...),
     user_id: int = Form(...),
     db: Session = Depends(get_db),
 ) -> ImportJobRead:
-    job = enqueue_import(db, user_id=user_id, import_type=import_type, file=file)
+    try:
+        job, created = enqueue_import(db, user_id=user_id, import_type=import_type, file=file)
+    except ValueError as exc:
+        raise HTTPException(status_code=400, detail=str(exc))
+    if created:
+        background_tasks.add_task(process_import_job, job.id)
     return ImportJobRead.model_validate(job)
 
 
+@router.post("/bundle", response_model=ImportBundleRead, status_code=201)
+def upload_import_bundle(
+    background_tasks: BackgroundTasks,
+    files: list[UploadFile] = File(...),
+    user_id: int = Form(...),
+    db: Session = Depends(get_db),
+) -> ImportBundleRead:
+    try:
+        bundle, jobs, run_order = enqueue_import_bundle(db, user_id=user_id, files=files)
+    except (ValueError, zipfile.BadZipFile) as exc:
+        raise HTTPException(status_code=400, detail=str(exc))
+    background_tasks.add_task(process_import_bundle, bundle.id, run_order)
+    return ImportBundleRead(
+        bundle=ImportJobRead.model_validate(bundle),
+        jobs=[ImportJobRead.model_validate(job) for job in jobs],
+    )
+
+
 @router.get("/{import_id}", response_model=ImportJobRead)
 def get_import(import_id: int, db: Session = Depends(get_db)) -> ImportJobRead:
     job = db.query(ImportJob).filter(ImportJob.id == import_id).first()
@@ -31,6 +62,40 @@ def get_import(import_id: int, db: Session = Depends(get_db)) -> ImportJobRead:
 @router.get("/{import_id}/errors")
 def get_import_errors(import_id: int, db: Session = Depends(get_db)) -> dict:
     job = db.query(ImportJob).filter(ImportJob.id == import_id).first()
+    if job and job.purged_at is not None:
+        raise HTTPException(status_code=410, detail="Import files have been purged")
     if not job or not job.error_report_path:
         return {"errors": []}
     return {"error_report_path": job.error_report_path}
+
+
+def _import_snapshot(import_id: int) -> dict | None:
+    db = SessionLocal()
+    try:
+        job = db.get(ImportJob, import_id)
+        if not job:
+            return None
+        return {
+            "id": job.id,
+            "status": job.status,
+            "processed_rows": job.processed_rows or 0,
+            "error_count": job.error_count or 0,
+            "rows_per_sec": 0.0,
+        }
+    finally:
+        db.close()
+
+
+@router.get("/{import_id}/events")
+async def stream_import_events(import_id: int) -> StreamingResponse:
+    queue = broker.subscribe(import_id)
+    snapshot = await run_in_threadpool(_import_snapshot, import_id)
+    if snapshot is None:
+        broker.unsubscribe(import_id, queue)
+        raise HTTPException(status_code=404, detail="Import not found")
+
+    return StreamingResponse(
+        job_events(broker, import_id, queue, snapshot, lambda: _import_snapshot(import_id)),
+        media_type="text/event-stream",
+        headers={"Cache-Control": "no-cache", "X-Accel-Buffering": "no"},
+    )
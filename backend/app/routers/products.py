@@ -1,28 +1,42 @@
-from fastapi import APIRouter, Depends, Query
+from fastapi import APIRouter, Depends, HTTPException, Query, Request, Response
 from sqlalchemy.orm import Session
 
+from app.core.profiling import ProfiledRoute
 from app.db.session import get_db
 from app.schemas.product import ProductCreate, ProductRead
 from app.services.catalog_service import create_product, list_products
+from app.services.reference_cache import cached_response
 
-router = APIRouter(prefix="/products", tags=["products"])
+router = APIRouter(prefix="/products", tags=["products"], route_class=ProfiledRoute)
 
 
 @router.get("", response_model=list[ProductRead])
-def get_products(store_id: int | None = Query(default=None), db: Session = Depends(get_db)) -> list[ProductRead]:
-    products = list_products(db, store_id=store_id)
-    return [ProductRead.model_validate(product) for product in products]
+def get_products(
+    request: Request,
+    store_id: int | None = Query(default=None),
+    db: Session = Depends(get_db),
+) -> Response:
+    return cached_response(
+        request,
+        db,
+        ("products",),
+        ProductRead,
+        lambda: list_products(db, store_id=store_id),
+    )
 
 
 @router.post("", response_model=ProductRead, status_code=201)
 def add_product(payload: ProductCreate, db: Session = Depends(get_db)) -> ProductRead:
-    product = create_product(
-        db,
-        sku=payload.sku,
-        name=payload.name,
-        category_id=payload.category_id,
-        price=payload.price,
-        shelf_space_meters=payload.shelf_space_meters,
-        store_id=payload.store_id,
-    )
+    try:
+        product = create_product(
+            db,
+            sku=payload.sku,
+            name=payload.name,
+            category_id=payload.category_id,
+            price=payload.price,
+            shelf_space_meters=payload.shelf_space_meters,
+            store_id=payload.store_id,
+        )
+    except ValueError as exc:
+        raise HTTPException(status_code=400, detail=str(exc))
     return ProductRead.model_validate(product)
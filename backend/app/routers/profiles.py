@@ -0,0 +1,28 @@
+from fastapi import APIRouter, Depends, HTTPException
+from fastapi.responses import FileResponse
+
+from app.core.profiling import list_profiles, profile_path
+from app.routers.deps import require_admin
+
+router = APIRouter(prefix="/profiles", tags=["profiles"], dependencies=[Depends(require_admin)])
+
+
+@router.get("")
+def get_profiles() -> list[dict]:
+    return list_profiles()
+
+
+@router.get("/{profile_id}")
+def get_profile(profile_id: str) -> FileResponse:
+    path = profile_path(profile_id, ".json")
+    if path is None:
+        raise HTTPException(status_code=404, detail="Profile not found")
+    return FileResponse(path, media_type="application/json")
+
+
+@router.get("/{profile_id}/flamegraph")
+def download_flamegraph(profile_id: str) -> FileResponse:
+    path = profile_path(profile_id, ".folded")
+    if path is None:
+        raise HTTPException(status_code=404, detail="Profile not found")
+    return FileResponse(path, media_type="text/plain", filename=f"{profile_id}.folded")
@@ -1,13 +1,18 @@
 from datetime import datetime
 
-from fastapi import APIRouter, Depends, Query
+from fastapi import APIRouter, BackgroundTasks, Depends, HTTPException, Query, status
 from sqlalchemy.orm import Session
 
+from app.core.profiling import ProfiledRoute
+from app.db.readonly import ReadRow
 from app.db.session import get_db
-from app.schemas.sale import SaleCreate, SaleRead
+from app.routers.deps import require_admin
+from app.schemas.sale import SaleCreate, SaleRead, SalesArchiveRequest
+from app.services.archive_service import archive_cutoff
 from app.services.sales_service import create_sale, list_sales
+from app.tasks.archive_tasks import run_sales_archive
 
-router = APIRouter(prefix="/sales", tags=["sales"])
+router = APIRouter(prefix="/sales", tags=["sales"], route_class=ProfiledRoute)
 
 
 @router.get("", response_model=list[SaleRead])
@@ -16,9 +21,8 @@ def get_sales(
     date_start: datetime | None = Query(default=None),
     date_end: datetime | None = Query(default=None),
     db: Session = Depends(get_db),
-) -> list[SaleRead]:
-    sales = list_sales(db, store_id=store_id, date_start=date_start, date_end=date_end)
-    return [SaleRead.model_validate(sale) for sale in sales]
+) -> list[ReadRow]:
+    return list_sales(db, store_id=store_id, date_start=date_start, date_end=date_end)
 
 
 @router.post("", response_model=SaleRead, status_code=201)
@@ -30,5 +34,15 @@ def add_sale(payload: SaleCreate, db: Session = Depends(get_db)) -> SaleRead:
         date=payload.date,
         units_sold=payload.units_sold,
         revenue=payload.revenue,
+        basket_id=payload.basket_id,
     )
     return SaleRead.model_validate(sale)
+
+
+@router.post("/archive", status_code=status.HTTP_202_ACCEPTED, dependencies=[Depends(require_admin)])
+def archive(payload: SalesArchiveRequest, background_tasks: BackgroundTasks) -> dict:
+    cutoff = payload.cutoff or archive_cutoff()
+    if cutoff > datetime.utcnow():
+        raise HTTPException(status_code=400, detail="Archive cutoff must be in the past")
+    background_tasks.add_task(run_sales_archive, cutoff=cutoff)
+    return {"status": "scheduled", "cutoff": cutoff}
@@ -1,20 +1,21 @@
 from fastapi import APIRouter, Depends, Query
 from sqlalchemy.orm import Session
 
+from app.core.profiling import ProfiledRoute
+from app.db.readonly import ReadRow, read_rows, select_for
 from app.db.session import get_db
 from app.models.shelf_space import ShelfSpace
 from app.schemas.shelf_space import ShelfSpaceCreate, ShelfSpaceRead
 
-router = APIRouter(prefix="/shelf-space", tags=["shelf-space"])
+router = APIRouter(prefix="/shelf-space", tags=["shelf-space"], route_class=ProfiledRoute)
 
 
 @router.get("", response_model=list[ShelfSpaceRead])
-def get_shelf_space(store_id: int | None = Query(default=None), db: Session = Depends(get_db)) -> list[ShelfSpaceRead]:
-    query = db.query(ShelfSpace)
+def get_shelf_space(store_id: int | None = Query(default=None), db: Session = Depends(get_db)) -> list[ReadRow]:
+    stmt = select_for(ShelfSpace, ShelfSpaceRead)
     if store_id is not None:
-        query = query.filter(ShelfSpace.store_id == store_id)
-    rows = query.all()
-    return [ShelfSpaceRead.model_validate(row) for row in rows]
+        stmt = stmt.where(ShelfSpace.store_id == store_id)
+    return read_rows(db, stmt, ShelfSpaceRead)
 
 
 @router.post("", response_model=ShelfSpaceRead, status_code=201)
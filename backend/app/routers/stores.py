@@ -1,17 +1,24 @@
-from fastapi import APIRouter, Depends
+from fastapi import APIRouter, Depends, Request, Response
 from sqlalchemy.orm import Session
 
+from app.core.profiling import ProfiledRoute
 from app.db.session import get_db
 from app.schemas.store import StoreCreate, StoreRead
+from app.services.reference_cache import cached_response
 from app.services.store_service import create_store, list_stores
 
-router = APIRouter(prefix="/stores", tags=["stores"])
+router = APIRouter(prefix="/stores", tags=["stores"], route_class=ProfiledRoute)
 
 
 @router.get("", response_model=list[StoreRead])
-def get_stores(db: Session = Depends(get_db)) -> list[StoreRead]:
-    stores = list_stores(db)
-    return [StoreRead.model_validate(store) for store in stores]
+def get_stores(request: Request, db: Session = Depends(get_db)) -> Response:
+    return cached_response(
+        request,
+        db,
+        ("stores",),
+        StoreRead,
+        lambda: list_stores(db),
+    )
 
 
 @router.post("", response_model=StoreRead, status_code=201)
@@ -1,20 +1,29 @@
-from fastapi import APIRouter, Depends, Query
+from fastapi import APIRouter, Depends, Query, Request, Response
 from sqlalchemy.orm import Session
 
+from app.core.profiling import ProfiledRoute
+from app.db.readonly import ReadRow, read_rows, select_for
 from app.db.session import get_db
 from app.models.traffic_zone import TrafficZone
 from app.schemas.traffic_zone import TrafficZoneCreate, TrafficZoneRead
+from app.services.reference_cache import cached_response
 
-router = APIRouter(prefix="/traffic", tags=["traffic"])
+router = APIRouter(prefix="/traffic", tags=["traffic"], route_class=ProfiledRoute)
 
 
 @router.get("", response_model=list[TrafficZoneRead])
-def get_traffic_zones(store_id: int | None = Query(default=None), db: Session = Depends(get_db)) -> list[TrafficZoneRead]:
-    query = db.query(TrafficZone)
-    if store_id is not None:
-        query = query.filter(TrafficZone.store_id == store_id)
-    zones = query.all()
-    return [TrafficZoneRead.model_validate(zone) for zone in zones]
+def get_traffic_zones(
+    request: Request,
+    store_id: int | None = Query(default=None),
+    db: Session = Depends(get_db),
+) -> Response:
+    def load() -> list[ReadRow]:
+        stmt = select_for(TrafficZone, TrafficZoneRead)
+        if store_id is not None:
+            stmt = stmt.where(TrafficZone.store_id == store_id)
+        return read_rows(db, stmt, TrafficZoneRead)
+
+    return cached_response(request, db, ("traffic_zones",), TrafficZoneRead, load)
 
 
 @router.post("", response_model=TrafficZoneRead, status_code=201)
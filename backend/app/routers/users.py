@@ -1,11 +1,12 @@
 from fastapi import APIRouter, Depends
 from sqlalchemy.orm import Session
 
+from app.core.profiling import ProfiledRoute
 from app.db.session import get_db
 from app.models.user import User
 from app.schemas.user import UserRead
 
-router = APIRouter(prefix="/users", tags=["users"])
+router = APIRouter(prefix="/users", tags=["users"], route_class=ProfiledRoute)
 
 
 @router.get("", response_model=list[UserRead])
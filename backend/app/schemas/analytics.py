@@ -1,3 +1,5 @@
+from datetime import datetime
+
 from pydantic import BaseModel
 
 
@@ -5,12 +7,65 @@ class TailAnalysisResponse(BaseModel):
     summary: dict
     table: list
     chart: dict
+    error_bounds: dict | None = None
+    approximate_range: dict | None = None
+    comparison: dict | None = None
 
 
 class SpaceElasticityResponse(BaseModel):
     table: list
     chart: dict
+    adjacency: list | None = None
+    comparison: dict | None = None
 
 
 class HeatmapResponse(BaseModel):
     zones: list
+
+
+class AffinityResponse(BaseModel):
+    summary: dict
+    pairs: list
+
+
+class AbcXyzResponse(BaseModel):
+    summary: dict
+    table: list
+
+
+class SalesAnomalyRead(BaseModel):
+    product_id: int
+    sku: str
+    product_name: str
+    date: datetime
+    revenue: float
+    baseline: float
+    spread: float
+    score: float
+    direction: str
+    method: str
+
+
+class AnomalyRunRequest(BaseModel):
+    store_id: int | None = None
+    window: int | None = None
+    threshold: float | None = None
+    method: str | None = None
+
+
+class SalesForecastRead(BaseModel):
+    product_id: int
+    sku: str
+    product_name: str
+    method: str
+    start_date: datetime
+    horizon_days: int
+    units: list[float]
+    revenue: list[float]
+    mae: float | None = None
+
+
+class ForecastRunRequest(BaseModel):
+    store_id: int | None = None
+    horizon: int | None = None
+    method: str | None = None
@@ -0,0 +1,32 @@
+from datetime import datetime
+from typing import Literal
+
+from pydantic import BaseModel, ConfigDict
+
+
+class ExportJobRead(BaseModel):
+    model_config = ConfigDict(from_attributes=True)
+
+    id: int
+    type: str
+    status: str
+    format: str
+    compression: str | None = None
+    processed_rows: int | None = None
+    size_bytes: int | None = None
+    error: str | None = None
+    purged_at: datetime | None = None
+    created_at: datetime
+
+
+class ExportRequest(BaseModel):
+    type: Literal["sales", "tail", "space"]
+    format: Literal["csv", "xlsx"] = "csv"
+    compression: Literal["gzip"] | None = None
+    user_id: int
+    store_id: int | None = None
+    date_start: datetime | None = None
+    date_end: datetime | None = None
+    category_id: int | None = None
+    search: str | None = None
+    classification: Literal["core", "average", "tail"] | None = None
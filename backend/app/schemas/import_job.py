@@ -6,11 +6,21 @@ class ImportJobRead(BaseModel):
     model_config = ConfigDict(from_attributes=True)
 
     id: int
+    parent_id: int | None = None
     type: str
     status: str
     original_filename: str | None = None
     total_rows: int | None = None
     processed_rows: int | None = None
+    unchanged_rows: int | None = None
     error_count: int | None = None
     error_report_path: str | None = None
+    size_bytes: int | None = None
+    stored_bytes: int | None = None
+    purged_at: datetime | None = None
     created_at: datetime
+
+
+class ImportBundleRead(BaseModel):
+    bundle: ImportJobRead
+    jobs: list[ImportJobRead]
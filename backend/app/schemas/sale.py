@@ -8,9 +8,14 @@ class SaleCreate(BaseModel):
     date: datetime
     units_sold: int
     revenue: float
+    basket_id: str | None = None
 
 
 class SaleRead(SaleCreate):
     model_config = ConfigDict(from_attributes=True)
 
     id: int
+
+
+class SalesArchiveRequest(BaseModel):
+    cutoff: datetime | None = None
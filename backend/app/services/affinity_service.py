@@ -0,0 +1,224 @@
+import threading
+from datetime import datetime
+from typing import Iterable, NamedTuple
+
+import numpy as np
+from scipy import sparse
+from sqlalchemy import event, select
+from sqlalchemy.orm import Session
+
+from app.core.cache import TTLCache
+from app.core.config import get_settings
+from app.db.partitioning import sales_session
+from app.models.category import Category
+from app.models.product import Product
+from app.models.sale import Sale
+from app.services import sales_feed
+from app.services.sales_feed import CommittedSale
+
+settings = get_settings()
+
+AFFINITY_LEVELS = ("category", "product")
+
+
+class BasketStats(NamedTuple):
+    items: np.ndarray
+    baskets: int
+    support: np.ndarray
+    co_occurrence: sparse.coo_matrix
+
+
+class AffinityStats(NamedTuple):
+    stats: BasketStats
+    names: dict[int, str]
+
+
+_cache = TTLCache(settings.affinity_cache_max_entries, settings.affinity_cache_ttl_seconds)
+_versions: dict[int, int] = {}
+_version_lock = threading.Lock()
+
+
+def basket_stats(basket_keys: np.ndarray, item_keys: np.ndarray) -> BasketStats:
+    if not len(basket_keys):
+        return BasketStats(np.empty(0, dtype=np.int64), 0, np.empty(0), sparse.coo_matrix((0, 0)))
+
+    _, basket_index = np.unique(basket_keys, return_inverse=True)
+    items, item_index = np.unique(item_keys, return_inverse=True)
+    incidence = sparse.csr_matrix(
+        (np.ones(len(basket_index), dtype=np.int64), (basket_index.ravel(), item_index.ravel())),
+        shape=(int(basket_index.max()) + 1, len(items)),
+    )
+    incidence.sum_duplicates()
+    incidence.data[:] = 1
+
+    co_occurrence = (incidence.T @ incidence).tocoo()
+    support = np.asarray(incidence.sum(axis=0)).ravel()
+    return BasketStats(items, incidence.shape[0], support, co_occurrence)
+
+
+def _load_basket_items(
+    db: Session,
+    store_id: int,
+    level: str,
+    date_start: datetime | None,
+    date_end: datetime | None,
+) -> tuple[np.ndarray, np.ndarray, dict[int, str]]:
+    stmt = select(Sale.basket_id, Sale.product_id).where(Sale.store_id == store_id, Sale.basket_id.is_not(None))
+    if date_start is not None:
+        stmt = stmt.where(Sale.date >= date_start)
+    if date_end is not None:
+        stmt = stmt.where(Sale.date <= date_end)
+
+    with sales_session(db, store_id) as sales_db:
+        rows = sales_db.execute(stmt).all()
+    if not rows:
+        return np.empty(0, dtype=object), np.empty(0, dtype=np.int64), {}
+
+    basket_column, product_column = zip(*rows)
+    basket_keys = np.array(basket_column, dtype=object)
+    product_ids = np.array(product_column, dtype=np.int64)
+
+    catalog = db.execute(
+        select(Product.id, Product.sku, Category.id, Category.name)
+        .join(Category, Category.id == Product.category_id)
+        .where(Product.store_id == store_id)
+        .order_by(Product.id)
+    ).all()
+    if level == "product":
+        return basket_keys, product_ids, {product_id: sku for product_id, sku, _, _ in catalog}
+    if not catalog:
+        return np.empty(0, dtype=object), np.empty(0, dtype=np.int64), {}
+
+    product_keys = np.array([row[0] for row in catalog], dtype=np.int64)
+    category_keys = np.array([row[2] for row in catalog], dtype=np.int64)
+    positions = np.minimum(np.searchsorted(product_keys, product_ids), len(product_keys) - 1)
+    known = product_keys[positions] == product_ids
+    names = {category_id: category for _, _, category_id, category in catalog}
+    return basket_keys[known], category_keys[positions[known]], names
+
+
+def affinity_stats(
+    db: Session,
+    store_id: int,
+    level: str = "category",
+    date_start: datetime | None = None,
+    date_end: datetime | None = None,
+) -> AffinityStats:
+    if level not in AFFINITY_LEVELS:
+        raise ValueError(f"Unsupported affinity level: {level}")
+    key = (store_id, level, date_start, date_end)
+    cached = _cache.get(key)
+    if cached is not None:
+        return cached[1]
+
+    with _version_lock:
+        version = _versions.get(store_id, 0)
+    basket_keys, item_keys, names = _load_basket_items(db, store_id, level, date_start, date_end)
+    result = AffinityStats(basket_stats(basket_keys, item_keys), names)
+    with _version_lock:
+        if _versions.get(store_id, 0) == version:
+            _cache.set(key, (store_id, result))
+    return result
+
+
+def affinity_pairs(stats: BasketStats, names: dict[int, str], min_count: int, limit: int | None) -> list[dict]:
+    co_occurrence = stats.co_occurrence
+    if not stats.baskets or not co_occurrence.nnz:
+        return []
+
+    rows, columns, counts = co_occurrence.row, co_occurrence.col, co_occurrence.data
+    keep = (rows < columns) & (counts >= min_count)
+    rows, columns, counts = rows[keep], columns[keep], counts[keep]
+    support_a = stats.support[rows]
+    support_b = stats.support[columns]
+    lift = counts * stats.baskets / (support_a * support_b)
+
+    order = np.lexsort((-counts, -lift))
+    if limit is not None:
+        order = order[:limit]
+
+    items = stats.items
+    return [
+        {
+            "item_a": int(items[row]),
+            "item_b": int(items[column]),
+            "name_a": names.get(int(items[row])),
+            "name_b": names.get(int(items[column])),
+            "co_occurrence": int(count),
+            "support": round(float(count) / stats.baskets, 6),
+            "confidence_ab": round(float(count) / float(a), 6),
+            "confidence_ba": round(float(count) / float(b), 6),
+            "lift": round(float(item_lift), 6),
+        }
+        for row, column, count, a, b, item_lift in zip(
+            rows[order], columns[order], counts[order], support_a[order], support_b[order], lift[order]
+        )
+    ]
+
+
+def affinity_analysis(
+    db: Session,
+    store_id: int,
+    level: str = "category",
+    date_start: datetime | None = None,
+    date_end: datetime | None = None,
+    min_count: int | None = None,
+    limit: int | None = 100,
+) -> dict:
+    result = affinity_stats(db, store_id, level, date_start, date_end)
+    pairs = affinity_pairs(result.stats, result.names, min_count or settings.affinity_min_pair_count, limit)
+    return {
+        "summary": {
+            "level": level,
+            "baskets": result.stats.baskets,
+            "items": int(len(result.stats.items)),
+            "pairs": len(pairs),
+        },
+        "pairs": pairs,
+    }
+
+
+def category_adjacency(
+    db: Session,
+    store_id: int,
+    date_start: datetime | None = None,
+    date_end: datetime | None = None,
+) -> list[dict]:
+    result = affinity_stats(db, store_id, "category", date_start, date_end)
+    partners: dict[str, list[dict]] = {}
+    for pair in affinity_pairs(result.stats, result.names, settings.affinity_min_pair_count, None):
+        if pair["lift"] <= 1:
+            continue
+        for category, partner in ((pair["name_a"], pair["name_b"]), (pair["name_b"], pair["name_a"])):
+            neighbours = partners.setdefault(category, [])
+            if len(neighbours) < settings.affinity_adjacency_per_category:
+                neighbours.append({"category": partner, "lift": pair["lift"], "co_occurrence": pair["co_occurrence"]})
+    return [{"category": category, "place_near": neighbours} for category, neighbours in sorted(partners.items())]
+
+
+def _invalidate_stores(store_ids: set[int] | None) -> None:
+    with _version_lock:
+        for store_id in _versions if store_ids is None else store_ids:
+            _versions[store_id] = _versions.get(store_id, 0) + 1
+    if store_ids is None:
+        _cache.clear()
+    else:
+        _cache.discard_where(lambda entry: entry[0] in store_ids)
+
+
+@sales_feed.subscribe
+def apply_sales(sales: Iterable[CommittedSale]) -> None:
+    _invalidate_stores({sale.store_id for sale in sales})
+
+
+@sales_feed.subscribe_untracked
+def invalidate_store(store_id: int | None = None) -> None:
+    _invalidate_stores(None if store_id is None else {store_id})
+
+
+@event.listens_for(Product, "after_update")
+@event.listens_for(Product, "after_delete")
+@event.listens_for(Category, "after_update")
+@event.listens_for(Category, "after_delete")
+def _invalidate_catalog(_mapper, _connection, _target) -> None:
+    invalidate_store()
@@ -1,103 +1,184 @@
+import math
+from array import array
 from datetime import datetime
+from itertools import islice
+from typing import Callable, Iterator, Sequence
 
-from sqlalchemy import func, select
+from sqlalchemy import Integer, and_, case, func, or_, select, true, type_coerce
 from sqlalchemy.orm import Session
 
+from app.core.config import get_settings
+from app.core.singleflight import coalesce
+from app.db.partitioning import sales_session
+from app.db.readonly import read_snapshot
 from app.models.category import Category
 from app.models.product import Product
 from app.models.sale import Sale
 from app.models.shelf_space import ShelfSpace
 from app.models.traffic_zone import TrafficZone
+from app.services import sketches, tail_engine
+from app.services.affinity_service import category_adjacency
+from app.services.archive_service import sales_source
+from app.services.tail_engine import StoreStamp, TailRow, revenue_rank_key
 
+settings = get_settings()
 
-def tail_analysis(
-    db: Session,
-    store_id: int,
-    date_start: datetime | None,
-    date_end: datetime | None,
-    category_id: int | None,
-    search: str | None,
-) -> dict:
-    stmt = (
+Period = tuple[datetime | None, datetime | None]
+
+
+def _tail_revenue_stmt(sales, store_id: int):
+    return (
         select(
+            Product.id.label("product_id"),
             Product.sku,
             Product.name,
+            Product.category_id,
             Category.name.label("category"),
-            func.sum(Sale.revenue).label("revenue"),
+            func.sum(sales.revenue).label("revenue"),
         )
-        .join(Sale, Sale.product_id == Product.id)
+        .join(sales, sales.product_id == Product.id)
         .join(Category, Category.id == Product.category_id)
-        .where(Sale.store_id == store_id)
+        .where(sales.store_id == store_id)
     )
 
+
+def _load_tail_revenue(db: Session, store_id: int) -> list:
+    with sales_session(db, store_id) as sales_db:
+        stmt = _tail_revenue_stmt(sales_source(db, store_id), store_id)
+        return sales_db.execute(stmt.group_by(Product.id, Category.id)).all()
+
+
+def _store_stamp(db: Session, store_id: int) -> StoreStamp:
+    products = db.execute(select(func.max(Product.updated_at), func.count(Product.id))).one()
+    categories = db.execute(select(func.max(Category.updated_at), func.count(Category.id))).one()
+    stmt = select(
+        func.max(Sale.id),
+        func.count(Sale.id),
+        func.coalesce(func.sum(type_coerce(Sale.revenue, Integer)), 0),
+    ).where(Sale.store_id == store_id)
+    with sales_session(db, store_id) as sales_db:
+        max_sale_id, sale_count, revenue = sales_db.execute(stmt).one()
+    return StoreStamp(max_sale_id or 0, sale_count, revenue, (*products, *categories))
+
+
+def _iter_sketch_sales(db: Session, store_id: int):
+    sales = sales_source(db, store_id)
+    stmt = select(sales.product_id, sales.date, sales.revenue).where(sales.store_id == store_id)
+    with sales_session(db, store_id) as sales_db:
+        yield from sales_db.execute(stmt.execution_options(yield_per=10000))
+
+
+def _filtered_tail_stmt(
+    sales,
+    store_id: int,
+    date_start: datetime | None,
+    date_end: datetime | None,
+    category_id: int | None,
+    search: str | None,
+):
+    stmt = _tail_revenue_stmt(sales, store_id)
+
     if date_start is not None:
-        stmt = stmt.where(Sale.date >= date_start)
+        stmt = stmt.where(sales.date >= date_start)
     if date_end is not None:
-        stmt = stmt.where(Sale.date <= date_end)
+        stmt = stmt.where(sales.date <= date_end)
     if category_id is not None:
         stmt = stmt.where(Product.category_id == category_id)
     if search:
         like = f"%{search}%"
         stmt = stmt.where((Product.name.ilike(like)) | (Product.sku.ilike(like)))
 
-    stmt = stmt.group_by(Product.id, Category.id)
+    return stmt.group_by(Product.id, Category.id)
+
+
+def _use_tail_engine(date_start: datetime | None, date_end: datetime | None, search: str | None) -> bool:
+    return settings.tail_engine_enabled and date_start is None and date_end is None and not search
+
+
+@coalesce
+def tail_analysis(
+    db: Session,
+    store_id: int,
+    date_start: datetime | None,
+    date_end: datetime | None,
+    category_id: int | None,
+    search: str | None,
+    approx: bool = False,
+) -> dict:
+    if approx and category_id is None and not search:
+        store_sketches = sketches.store_sketches(
+            store_id,
+            loader=lambda: _iter_sketch_sales(db, store_id),
+            stamp=lambda: _store_stamp(db, store_id),
+        )
+        result = sketches.approximate_tail(store_sketches.combined(date_start, date_end))
+        result["approximate_range"] = sketches.month_range(date_start, date_end)
+        return result
+
+    if _use_tail_engine(date_start, date_end, search):
+        rows = tail_engine.ranked_rows(
+            store_id,
+            category_id,
+            loader=lambda: _load_tail_revenue(db, store_id),
+            stamp=lambda: _store_stamp(db, store_id),
+        )
+        return classify_tail(rows)
+
+    sales = sales_source(db, store_id, date_start, date_end)
+    stmt = _filtered_tail_stmt(sales, store_id, date_start, date_end, category_id, search)
+    with sales_session(db, store_id) as sales_db:
+        rows = sales_db.execute(stmt).all()
+    return classify_tail(sorted(rows, key=revenue_rank_key))
+
 
-    rows = db.execute(stmt).all()
-    total_revenue = sum(row.revenue or 0 for row in rows)
-    total_skus = len(rows)
+TAIL_CLASSES = ("core", "average", "tail")
+
+
+def _empty_tail() -> dict:
+    return {
+        "summary": {
+            "total_skus": 0,
+            "core_pct": 0,
+            "average_pct": 0,
+            "tail_pct": 0,
+            "tail_sales_share": 0,
+        },
+        "table": [],
+        "chart": {
+            "core_sales_share": 0,
+            "average_sales_share": 0,
+            "tail_sales_share": 0,
+        },
+    }
+
+
+def _classify_revenues(revenues: Sequence[float]) -> tuple[bytearray, dict, dict, float] | None:
+    total_revenue = math.fsum(revenues)
+    total_skus = len(revenues)
 
     if total_revenue == 0 or total_skus == 0:
-        return {
-            "summary": {
-                "total_skus": 0,
-                "core_pct": 0,
-                "average_pct": 0,
-                "tail_pct": 0,
-                "tail_sales_share": 0,
-            },
-            "table": [],
-            "chart": {
-                "core_sales_share": 0,
-                "average_sales_share": 0,
-                "tail_sales_share": 0,
-            },
-        }
-
-    sorted_rows = sorted(rows, key=lambda r: r.revenue or 0, reverse=True)
+        return None
 
     cumulative = 0.0
-    table = []
+    classes = bytearray(total_skus)
     core_count = average_count = tail_count = 0
     core_revenue = average_revenue = tail_revenue = 0.0
 
-    for row in sorted_rows:
-        revenue = float(row.revenue or 0)
-        sales_pct = revenue / total_revenue
-        cumulative += sales_pct
+    for index, revenue in enumerate(revenues):
+        cumulative += revenue / total_revenue
 
         if cumulative <= 0.7:
-            classification = "core"
             core_count += 1
             core_revenue += revenue
         elif cumulative <= 0.9:
-            classification = "average"
+            classes[index] = 1
             average_count += 1
             average_revenue += revenue
         else:
-            classification = "tail"
+            classes[index] = 2
             tail_count += 1
             tail_revenue += revenue
 
-        table.append(
-            {
-                "sku": row.sku,
-                "product_name": row.name,
-                "category": row.category,
-                "sales_pct": round(sales_pct, 6),
-                "classification": classification,
-            }
-        )
-
     summary = {
         "total_skus": total_skus,
         "core_pct": round(core_count / total_skus, 6),
@@ -112,64 +193,349 @@ def tail_analysis(
         "tail_sales_share": round(tail_revenue / total_revenue, 6),
     }
 
+    return classes, summary, chart, total_revenue
+
+
+def _tail_row(row, revenue: float, total_revenue: float, classification: int) -> dict:
+    return {
+        "sku": row.sku,
+        "product_name": row.name,
+        "category": row.category,
+        "sales_pct": round(revenue / total_revenue, 6),
+        "classification": TAIL_CLASSES[classification],
+    }
+
+
+def classify_tail(sorted_rows: list) -> dict:
+    revenues = [float(row.revenue or 0) for row in sorted_rows]
+    classified = _classify_revenues(revenues)
+    if classified is None:
+        return _empty_tail()
+
+    classes, summary, chart, total_revenue = classified
+    table = [
+        _tail_row(row, revenue, total_revenue, classification)
+        for row, revenue, classification in zip(sorted_rows, revenues, classes)
+    ]
     return {"summary": summary, "table": table, "chart": chart}
 
 
-def space_elasticity(
+def stream_tail_analysis(
     db: Session,
     store_id: int,
     date_start: datetime | None,
     date_end: datetime | None,
-) -> dict:
-    sales_stmt = (
-        select(Category.name.label("category"), func.sum(Sale.revenue).label("revenue"))
-        .join(Product, Product.id == Sale.product_id)
-        .join(Category, Category.id == Product.category_id)
-        .where(Sale.store_id == store_id)
+    category_id: int | None,
+    search: str | None,
+    classification: str | None = None,
+    limit: int | None = None,
+) -> Iterator[dict]:
+    if _use_tail_engine(date_start, date_end, search):
+        ranked = tail_engine.ranked_rows(
+            store_id,
+            category_id,
+            loader=lambda: _load_tail_revenue(db, store_id),
+            stamp=lambda: _store_stamp(db, store_id),
+        )
+        revenues = array("d", (float(row.revenue or 0) for row in ranked))
+
+        def rows_from(start: int, stop: int) -> Iterator:
+            return islice(ranked, start, stop)
+
+        yield from _stream_classified(revenues, rows_from, classification, limit)
+        return
+
+    sales = sales_source(db, store_id, date_start, date_end)
+    stmt = _filtered_tail_stmt(sales, store_id, date_start, date_end, category_id, search).order_by(
+        func.sum(sales.revenue).desc(), Product.id.asc()
     )
-    if date_start is not None:
-        sales_stmt = sales_stmt.where(Sale.date >= date_start)
-    if date_end is not None:
-        sales_stmt = sales_stmt.where(Sale.date <= date_end)
+    with sales_session(db, store_id) as sales_db, read_snapshot(sales_db):
+        revenue_stmt = stmt.with_only_columns(func.sum(sales.revenue)).execution_options(yield_per=10000)
+        revenues = array("d", (float(value or 0) for value in sales_db.execute(revenue_stmt).scalars()))
 
-    sales_stmt = sales_stmt.group_by(Category.id)
+        def rows_from(start: int, stop: int) -> Iterator:
+            window = stmt.offset(start).limit(stop - start).execution_options(yield_per=1000)
+            return iter(sales_db.execute(window))
+
+        yield from _stream_classified(revenues, rows_from, classification, limit)
+
+
+def _stream_classified(
+    revenues: Sequence[float],
+    rows_from: Callable[[int, int], Iterator],
+    classification: str | None,
+    limit: int | None,
+) -> Iterator[dict]:
+    classified = _classify_revenues(revenues)
+    if classified is None:
+        empty = _empty_tail()
+        yield {"summary": empty["summary"], "chart": empty["chart"]}
+        return
 
-    sales_rows = db.execute(sales_stmt).all()
-    total_revenue = sum(row.revenue or 0 for row in sales_rows)
+    classes, summary, chart, total_revenue = classified
+    yield {"summary": summary, "chart": chart}
 
+    wanted = TAIL_CLASSES.index(classification) if classification is not None else None
+    start, stop = 0, len(classes)
+    if wanted is not None:
+        start = classes.find(wanted)
+        if start < 0:
+            return
+        stop = classes.rfind(wanted) + 1
+    if limit is not None:
+        stop = min(stop, start + limit)
+
+    for index, row in enumerate(rows_from(start, stop), start=start):
+        yield _tail_row(row, revenues[index], total_revenue, classes[index])
+
+
+def _shelf_meters(db: Session, store_id: int) -> dict[str, float]:
     shelf_stmt = (
         select(Category.name.label("category"), func.sum(ShelfSpace.current_meters).label("meters"))
         .join(Category, Category.id == ShelfSpace.category_id)
         .where(ShelfSpace.store_id == store_id)
         .group_by(Category.id)
     )
-    shelf_rows = {row.category: float(row.meters or 0) for row in db.execute(shelf_stmt).all()}
-    total_current_meters = sum(shelf_rows.values())
+    return {row.category: float(row.meters or 0) for row in db.execute(shelf_stmt).all()}
+
+
+def _space_table(category_revenue: Sequence[tuple[str, float]], shelf_rows: dict[str, float]) -> dict:
+    total_revenue = math.fsum(revenue or 0 for _, revenue in category_revenue)
+    total_current_meters = math.fsum(shelf_rows.values())
 
     table = []
     current_chart = []
     recommended_chart = []
 
-    for row in sales_rows:
-        revenue = float(row.revenue or 0)
+    for category, revenue in category_revenue:
+        revenue = float(revenue or 0)
         sales_pct = revenue / total_revenue if total_revenue else 0
-        current_meters = shelf_rows.get(row.category, 0.0)
+        current_meters = shelf_rows.get(category, 0.0)
         recommended_meters = total_current_meters * sales_pct if total_current_meters else 0.0
 
         table.append(
             {
-                "category": row.category,
+                "category": category,
                 "sales_pct": round(sales_pct, 6),
                 "current_meters": round(current_meters, 4),
                 "recommended_meters": round(recommended_meters, 4),
             }
         )
-        current_chart.append({"category": row.category, "meters": round(current_meters, 4)})
-        recommended_chart.append({"category": row.category, "meters": round(recommended_meters, 4)})
+        current_chart.append({"category": category, "meters": round(current_meters, 4)})
+        recommended_chart.append({"category": category, "meters": round(recommended_meters, 4)})
 
     return {"table": table, "chart": {"current": current_chart, "recommended": recommended_chart}}
 
 
+@coalesce
+def space_elasticity(
+    db: Session,
+    store_id: int,
+    date_start: datetime | None,
+    date_end: datetime | None,
+    include_adjacency: bool = False,
+) -> dict:
+    sales = sales_source(db, store_id, date_start, date_end)
+    sales_stmt = (
+        select(Category.name.label("category"), func.sum(sales.revenue).label("revenue"))
+        .join(Product, Product.id == sales.product_id)
+        .join(Category, Category.id == Product.category_id)
+        .where(sales.store_id == store_id)
+    )
+    if date_start is not None:
+        sales_stmt = sales_stmt.where(sales.date >= date_start)
+    if date_end is not None:
+        sales_stmt = sales_stmt.where(sales.date <= date_end)
+
+    sales_stmt = sales_stmt.group_by(Category.id)
+
+    with sales_session(db, store_id) as sales_db:
+        sales_rows = sales_db.execute(sales_stmt).all()
+    result = _space_table([(row.category, row.revenue) for row in sales_rows], _shelf_meters(db, store_id))
+    if include_adjacency:
+        result["adjacency"] = category_adjacency(db, store_id, date_start, date_end)
+    return result
+
+
+def _period_condition(sales, period: Period):
+    date_start, date_end = period
+    conditions = []
+    if date_start is not None:
+        conditions.append(sales.date >= date_start)
+    if date_end is not None:
+        conditions.append(sales.date <= date_end)
+    return and_(*conditions) if conditions else true()
+
+
+def _comparison_source(db: Session, store_id: int, current: Period, previous: Period):
+    starts = (current[0], previous[0])
+    return sales_source(db, store_id, None if None in starts else min(starts))
+
+
+def _period_columns(sales, current: Period, previous: Period) -> tuple:
+    in_current = _period_condition(sales, current)
+    in_previous = _period_condition(sales, previous)
+    return (
+        func.sum(case((in_current, sales.revenue), else_=0)).label("current_revenue"),
+        func.sum(case((in_current, 1), else_=0)).label("current_rows"),
+        func.sum(case((in_previous, sales.revenue), else_=0)).label("previous_revenue"),
+        func.sum(case((in_previous, 1), else_=0)).label("previous_rows"),
+        or_(in_current, in_previous),
+    )
+
+
+def _migration_label(previous: str | None, current: str | None) -> str:
+    return f"{previous or 'absent'}\u2192{current or 'absent'}"
+
+
+def _delta_pct(current: float, previous: float) -> float | None:
+    return round((current - previous) / previous, 6) if previous else None
+
+
+@coalesce
+def compare_tail_analysis(
+    db: Session,
+    store_id: int,
+    current: Period,
+    previous: Period,
+    category_id: int | None,
+    search: str | None,
+) -> dict:
+    sales = _comparison_source(db, store_id, current, previous)
+    *columns, in_either = _period_columns(sales, current, previous)
+    stmt = (
+        select(Product.id, Product.sku, Product.name, Product.category_id, Category.name, *columns)
+        .join(Product, Product.id == sales.product_id)
+        .join(Category, Category.id == Product.category_id)
+        .where(sales.store_id == store_id, in_either)
+    )
+    if category_id is not None:
+        stmt = stmt.where(Product.category_id == category_id)
+    if search:
+        like = f"%{search}%"
+        stmt = stmt.where((Product.name.ilike(like)) | (Product.sku.ilike(like)))
+    stmt = stmt.group_by(Product.id, Category.id)
+
+    with sales_session(db, store_id) as sales_db:
+        rows = sales_db.execute(stmt).all()
+
+    current_rows = sorted(
+        (TailRow(row[0], row[1], row[2], row[4], row[3], row.current_revenue) for row in rows if row.current_rows),
+        key=revenue_rank_key,
+    )
+    previous_rows = sorted(
+        (TailRow(row[0], row[1], row[2], row[4], row[3], row.previous_revenue) for row in rows if row.previous_rows),
+        key=revenue_rank_key,
+    )
+    current_result = classify_tail(current_rows)
+    previous_result = classify_tail(previous_rows)
+
+    current_by_product = {row.product_id: (row, entry) for row, entry in zip(current_rows, current_result["table"])}
+    previous_by_product = {row.product_id: (row, entry) for row, entry in zip(previous_rows, previous_result["table"])}
+
+    table = []
+    migrations: dict[str, int] = {}
+    for product_id in current_by_product.keys() | previous_by_product.keys():
+        current_row, current_entry = current_by_product.get(product_id, (None, None))
+        previous_row, previous_entry = previous_by_product.get(product_id, (None, None))
+        row = current_row or previous_row
+        current_revenue = float(current_row.revenue) if current_row else 0.0
+        previous_revenue = float(previous_row.revenue) if previous_row else 0.0
+        current_class = current_entry["classification"] if current_entry else None
+        previous_class = previous_entry["classification"] if previous_entry else None
+        migration = _migration_label(previous_class, current_class)
+        migrations[migration] = migrations.get(migration, 0) + 1
+
+        table.append(
+            {
+                "sku": row.sku,
+                "product_name": row.name,
+                "category": row.category,
+                "current_revenue": round(current_revenue, 6),
+                "previous_revenue": round(previous_revenue, 6),
+                "revenue_delta": round(current_revenue - previous_revenue, 6),
+                "revenue_delta_pct": _delta_pct(current_revenue, previous_revenue),
+                "current_sales_pct": current_entry["sales_pct"] if current_entry else 0,
+                "previous_sales_pct": previous_entry["sales_pct"] if previous_entry else 0,
+                "current_classification": current_class,
+                "previous_classification": previous_class,
+                "migration": migration,
+            }
+        )
+    table.sort(key=lambda entry: (-abs(entry["revenue_delta"]), entry["sku"]))
+
+    summary_delta = {
+        key: round(current_result["summary"][key] - previous_result["summary"][key], 6)
+        for key in current_result["summary"]
+    }
+    current_result["comparison"] = {
+        "previous": {"summary": previous_result["summary"], "chart": previous_result["chart"]},
+        "summary_delta": summary_delta,
+        "migrations": migrations,
+        "table": table,
+    }
+    return current_result
+
+
+@coalesce
+def compare_space_elasticity(
+    db: Session,
+    store_id: int,
+    current: Period,
+    previous: Period,
+    include_adjacency: bool = False,
+) -> dict:
+    sales = _comparison_source(db, store_id, current, previous)
+    *columns, in_either = _period_columns(sales, current, previous)
+    stmt = (
+        select(Category.name.label("category"), *columns)
+        .join(Product, Product.id == sales.product_id)
+        .join(Category, Category.id == Product.category_id)
+        .where(sales.store_id == store_id, in_either)
+        .group_by(Category.id)
+    )
+
+    with sales_session(db, store_id) as sales_db:
+        rows = sales_db.execute(stmt).all()
+    shelf_rows = _shelf_meters(db, store_id)
+
+    current_result = _space_table(
+        [(row.category, row.current_revenue) for row in rows if row.current_rows],
+        shelf_rows,
+    )
+    previous_result = _space_table(
+        [(row.category, row.previous_revenue) for row in rows if row.previous_rows],
+        shelf_rows,
+    )
+
+    current_by_category = {entry["category"]: entry for entry in current_result["table"]}
+    previous_by_category = {entry["category"]: entry for entry in previous_result["table"]}
+    table = []
+    for category in sorted(current_by_category.keys() | previous_by_category.keys()):
+        current_entry = current_by_category.get(category, {})
+        previous_entry = previous_by_category.get(category, {})
+        current_pct = current_entry.get("sales_pct", 0)
+        previous_pct = previous_entry.get("sales_pct", 0)
+        current_meters = current_entry.get("recommended_meters", 0.0)
+        previous_meters = previous_entry.get("recommended_meters", 0.0)
+        table.append(
+            {
+                "category": category,
+                "current_sales_pct": current_pct,
+                "previous_sales_pct": previous_pct,
+                "sales_pct_delta": round(current_pct - previous_pct, 6),
+                "current_recommended_meters": current_meters,
+                "previous_recommended_meters": previous_meters,
+                "recommended_meters_delta": round(current_meters - previous_meters, 4),
+            }
+        )
+
+    if include_adjacency:
+        current_result["adjacency"] = category_adjacency(db, store_id, *current)
+    current_result["comparison"] = {"previous": previous_result, "table": table}
+    return current_result
+
+
 def heatmap_analysis(
     db: Session,
     store_id: int,
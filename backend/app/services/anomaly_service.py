@@ -0,0 +1,188 @@
+from datetime import datetime
+from typing import NamedTuple
+
+import numpy as np
+from numpy.lib.stride_tricks import sliding_window_view
+from sqlalchemy import delete, func, insert, select
+from sqlalchemy.orm import Session
+
+from app.core.config import get_settings
+from app.models.product import Product
+from app.models.sales_anomaly import SalesAnomaly
+from app.models.store import Store
+from app.services.daily_sales import load_daily_sales
+
+settings = get_settings()
+
+ANOMALY_METHODS = ("mad", "zscore")
+MAD_SCALE = 1.4826
+BLOCK_CELLS = 4_000_000
+
+
+class DailyRevenue(NamedTuple):
+    product_ids: np.ndarray
+    first_day: np.datetime64
+    matrix: np.ndarray
+
+
+class AnomalyScores(NamedTuple):
+    baseline: np.ndarray
+    spread: np.ndarray
+    score: np.ndarray
+
+
+def load_daily_revenue(db: Session, store_id: int) -> DailyRevenue | None:
+    daily = load_daily_sales(db, store_id)
+    if daily is None:
+        return None
+    return DailyRevenue(daily.product_ids, daily.first_day, daily.revenue)
+
+
+def score_daily_revenue(matrix: np.ndarray, window: int, method: str, min_spread: float) -> AnomalyScores:
+    history = sliding_window_view(matrix[:, :-1], window, axis=1)
+    if method == "mad":
+        baseline = np.median(history, axis=2)
+        spread = MAD_SCALE * np.median(np.abs(history - baseline[..., None]), axis=2)
+    else:
+        baseline = history.mean(axis=2)
+        spread = history.std(axis=2)
+    spread = np.maximum(spread, min_spread)
+    score = (matrix[:, window:] - baseline) / spread
+    return AnomalyScores(baseline, spread, score)
+
+
+def find_anomalies(
+    daily: DailyRevenue,
+    window: int,
+    threshold: float,
+    method: str,
+    min_spread: float,
+) -> list[dict]:
+    matrix = daily.matrix
+    product_count, day_count = matrix.shape
+    if day_count <= window:
+        return []
+
+    first_sale = np.argmax(matrix > 0, axis=1)
+    offsets = np.arange(day_count - window)
+    block_rows = max(1, BLOCK_CELLS // ((day_count - window) * window))
+    records: list[dict] = []
+
+    for start in range(0, product_count, block_rows):
+        block = matrix[start:start + block_rows]
+        scores = score_daily_revenue(block, window, method, min_spread)
+        flagged = (np.abs(scores.score) >= threshold) & (offsets[None, :] >= first_sale[start:start + block_rows, None])
+        rows, columns = np.nonzero(flagged)
+        if not len(rows):
+            continue
+
+        dates = (daily.first_day + (columns + window)).astype("datetime64[s]").tolist()
+        values = block[rows, columns + window].tolist()
+        baselines = scores.baseline[rows, columns].tolist()
+        spreads = scores.spread[rows, columns].tolist()
+        score_values = scores.score[rows, columns].tolist()
+        product_ids = daily.product_ids[start + rows].tolist()
+
+        for product_id, date, revenue, baseline, spread, score in zip(
+            product_ids, dates, values, baselines, spreads, score_values
+        ):
+            records.append(
+                {
+                    "product_id": product_id,
+                    "date": date,
+                    "revenue": revenue,
+                    "baseline": baseline,
+                    "spread": spread,
+                    "score": score,
+                    "direction": "spike" if score > 0 else "drop",
+                    "method": method,
+                }
+            )
+    return records
+
+
+def detect_store_anomalies(
+    db: Session,
+    store_id: int,
+    window: int | None = None,
+    threshold: float | None = None,
+    method: str | None = None,
+) -> int:
+    if window is None:
+        window = settings.anomaly_window_days
+    if threshold is None:
+        threshold = settings.anomaly_threshold
+    if method is None:
+        method = settings.anomaly_method
+    if method not in ANOMALY_METHODS:
+        raise ValueError(f"Unsupported anomaly method: {method}")
+    if window < 2:
+        raise ValueError("Anomaly window must be at least 2 days")
+
+    daily = load_daily_revenue(db, store_id)
+    records = [] if daily is None else find_anomalies(daily, window, threshold, method, settings.anomaly_min_spread)
+
+    db.execute(delete(SalesAnomaly).where(SalesAnomaly.store_id == store_id))
+    if records:
+        created_at = datetime.utcnow()
+        for record in records:
+            record["store_id"] = store_id
+            record["created_at"] = created_at
+        db.execute(insert(SalesAnomaly), records)
+    db.commit()
+    return len(records)
+
+
+def detect_anomalies(
+    db: Session,
+    store_id: int | None = None,
+    window: int | None = None,
+    threshold: float | None = None,
+    method: str | None = None,
+) -> dict[int, int]:
+    if store_id is not None:
+        store_ids = [store_id]
+    else:
+        store_ids = db.execute(select(Store.id).order_by(Store.id)).scalars().all()
+    return {
+        current: detect_store_anomalies(db, current, window=window, threshold=threshold, method=method)
+        for current in store_ids
+    }
+
+
+def list_anomalies(
+    db: Session,
+    store_id: int,
+    date_start: datetime | None = None,
+    date_end: datetime | None = None,
+    direction: str | None = None,
+    limit: int = 100,
+) -> list[dict]:
+    stmt = (
+        select(SalesAnomaly, Product.sku, Product.name)
+        .join(Product, Product.id == SalesAnomaly.product_id)
+        .where(SalesAnomaly.store_id == store_id)
+    )
+    if date_start is not None:
+        stmt = stmt.where(SalesAnomaly.date >= date_start)
+    if date_end is not None:
+        stmt = stmt.where(SalesAnomaly.date <= date_end)
+    if direction is not None:
+        stmt = stmt.where(SalesAnomaly.direction == direction)
+    stmt = stmt.order_by(SalesAnomaly.date.desc(), func.abs(SalesAnomaly.score).desc()).limit(limit)
+
+    return [
+        {
+            "product_id": anomaly.product_id,
+            "sku": sku,
+            "product_name": name,
+            "date": anomaly.date,
+            "revenue": anomaly.revenue,
+            "baseline": round(anomaly.baseline, 6),
+            "spread": round(anomaly.spread, 6),
+            "score": round(anomaly.score, 6),
+            "direction": anomaly.direction,
+            "method": anomaly.method,
+        }
+        for anomaly, sku, name in db.execute(stmt).all()
+    ]
@@ -0,0 +1,208 @@
+import csv
+import gzip
+import os
+from datetime import datetime, timedelta
+from pathlib import Path
+from typing import Iterator
+from sqlalchemy import case, delete, func, insert, select, union_all
+from sqlalchemy.orm import Session, aliased
+
+from app.core.config import get_settings
+from app.db.partitioning import sales_session
+from app.db.readonly import ReadRow, row_type
+from app.models.sale import Sale
+from app.models.sales_archive import SalesArchive
+from app.models.sales_rollup import SalesDailyRollup
+from app.models.store import Store
+from app.schemas.sale import SaleRead
+from app.services import sales_feed
+
+settings = get_settings()
+
+ARCHIVE_COLUMNS = ("id", "product_id", "store_id", "date", "units_sold", "revenue", "basket_id", "created_at")
+
+def archive_cutoff(now: datetime | None = None) -> datetime:
+    boundary = (now or datetime.utcnow()) - timedelta(days=settings.sales_hot_days)
+    return datetime(boundary.year, boundary.month, 1)
+
+
+def archived_until(db: Session) -> datetime | None:
+    return db.execute(select(func.max(SalesArchive.period_end))).scalar()
+
+
+def sales_source(
+    db: Session,
+    store_id: int | None = None,
+    date_start: datetime | None = None,
+    date_end: datetime | None = None,
+):
+    watermark = archived_until(db)
+    if watermark is None or (date_start is not None and date_start >= watermark):
+        return Sale
+
+    hot = select(Sale.product_id, Sale.store_id, Sale.date, Sale.units_sold, Sale.revenue)
+    cold_date = SalesDailyRollup.date
+    if date_start is not None:
+        cold_date = case((SalesDailyRollup.date < date_start, date_start), else_=SalesDailyRollup.date)
+    cold = select(
+        SalesDailyRollup.product_id,
+        SalesDailyRollup.store_id,
+        cold_date.label("date"),
+        SalesDailyRollup.units_sold,
+        SalesDailyRollup.revenue,
+    )
+    if store_id is not None:
+        hot = hot.where(Sale.store_id == store_id)
+        cold = cold.where(SalesDailyRollup.store_id == store_id)
+    if date_start is not None:
+        hot = hot.where(Sale.date >= date_start)
+        cold = cold.where(SalesDailyRollup.date >= datetime(date_start.year, date_start.month, date_start.day))
+    if date_end is not None:
+        hot = hot.where(Sale.date <= date_end)
+        cold = cold.where(SalesDailyRollup.date <= date_end)
+    return aliased(Sale, union_all(hot, cold).subquery("sales_all"))
+
+
+def _next_month(value: datetime) -> datetime:
+    return datetime(value.year + value.month // 12, value.month % 12 + 1, 1)
+
+
+def _archive_path(store_id: int, period_start: datetime) -> str:
+    root = Path(settings.archive_dir)
+    if not root.is_absolute():
+        root = Path(__file__).resolve().parents[3] / root
+    directory = root / "sales" / f"{period_start:%Y-%m}"
+    directory.mkdir(parents=True, exist_ok=True)
+    return (directory / f"store_{store_id}_{datetime.utcnow():%Y%m%d%H%M%S%f}.csv.gz").as_posix()
+
+
+def _archive_period(
+    db: Session,
+    sales_db: Session,
+    store_id: int,
+    period_start: datetime,
+    period_end: datetime,
+) -> int:
+    in_period = (Sale.store_id == store_id, Sale.date >= period_start, Sale.date < period_end)
+    path = _archive_path(store_id, period_start)
+    row_count = 0
+    rows = sales_db.execute(
+        select(*(getattr(Sale, column) for column in ARCHIVE_COLUMNS))
+        .where(*in_period)
+        .order_by(Sale.date, Sale.id)
+        .execution_options(yield_per=10000)
+    )
+    with gzip.open(path, "wt", newline="", encoding="utf-8", compresslevel=settings.archive_compress_level) as stream:
+        writer = csv.writer(stream)
+        writer.writerow(ARCHIVE_COLUMNS)
+        for row in rows:
+            writer.writerow(
+                [value.isoformat() if isinstance(value, datetime) else value for value in row]
+            )
+            row_count += 1
+    if not row_count:
+        os.remove(path)
+        return 0
+
+    try:
+        day = func.date(Sale.date)
+        rollups = [
+            {
+                "product_id": product_id,
+                "store_id": store_id,
+                "date": datetime.fromisoformat(rollup_day),
+                "units_sold": units_sold,
+                "revenue": revenue,
+                "sale_count": sale_count,
+            }
+            for product_id, rollup_day, units_sold, revenue, sale_count in sales_db.execute(
+                select(Sale.product_id, day, func.sum(Sale.units_sold), func.sum(Sale.revenue), func.count())
+                .where(*in_period)
+                .group_by(Sale.product_id, day)
+            )
+        ]
+        sales_db.execute(insert(SalesDailyRollup), rollups)
+        sales_db.execute(delete(Sale).where(*in_period))
+        db.add(
+            SalesArchive(
+                store_id=store_id,
+                period_start=period_start,
+                period_end=period_end,
+                file_path=path,
+                row_count=row_count,
+                stored_bytes=os.path.getsize(path),
+            )
+        )
+        if sales_db is not db:
+            sales_db.commit()
+        db.commit()
+    except Exception:
+        sales_db.rollback()
+        db.rollback()
+        os.remove(path)
+        raise
+    return row_count
+
+
+def archive_sales(db: Session, cutoff: datetime | None = None) -> dict[int, int]:
+    cutoff = cutoff or archive_cutoff()
+    archived: dict[int, int] = {}
+    for store_id in db.execute(select(Store.id).order_by(Store.id)).scalars().all():
+        moved = 0
+        with sales_session(db, store_id) as sales_db:
+            first = sales_db.execute(
+                select(func.min(Sale.date)).where(Sale.store_id == store_id, Sale.date < cutoff)
+            ).scalar()
+            period_start = datetime(first.year, first.month, 1) if first is not None else cutoff
+            while period_start < cutoff:
+                period_end = min(_next_month(period_start), cutoff)
+                moved += _archive_period(db, sales_db, store_id, period_start, period_end)
+                period_start = period_end
+        if moved:
+            archived[store_id] = moved
+            sales_feed.publish_untracked(store_id)
+    return archived
+
+
+def _parse_archived(row: dict) -> tuple:
+    return (
+        int(row["product_id"]),
+        int(row["store_id"]),
+        datetime.fromisoformat(row["date"]),
+        int(row["units_sold"]),
+        float(row["revenue"]),
+        row["basket_id"] or None,
+        int(row["id"]),
+    )
+
+
+def iter_archived_sales(
+    db: Session,
+    store_id: int | None,
+    date_start: datetime | None,
+    date_end: datetime | None,
+) -> Iterator[ReadRow]:
+    stmt = select(SalesArchive.file_path).order_by(SalesArchive.period_start, SalesArchive.id)
+    if store_id is not None:
+        stmt = stmt.where(SalesArchive.store_id == store_id)
+    if date_start is not None:
+        stmt = stmt.where(SalesArchive.period_end > date_start)
+    if date_end is not None:
+        stmt = stmt.where(SalesArchive.period_start <= date_end)
+
+    row_class = row_type(SaleRead)
+    for path in db.execute(stmt).scalars().all():
+        with gzip.open(path, "rt", newline="", encoding="utf-8") as stream:
+            for record in csv.DictReader(stream):
+                row = row_class(*_parse_archived(record))
+                if (date_start is None or row.date >= date_start) and (date_end is None or row.date <= date_end):
+                    yield row
+
+
+def read_archived_sales(
+    db: Session,
+    store_id: int | None,
+    date_start: datetime | None,
+    date_end: datetime | None,
+) -> list[ReadRow]:
+    return sorted(iter_archived_sales(db, store_id, date_start, date_end), key=lambda row: row.date, reverse=True)
@@ -1,19 +1,54 @@
+import time
+from typing import Any, Callable, TypeVar
+
+from fastapi.concurrency import run_in_threadpool
+from sqlalchemy import event
 from sqlalchemy.orm import Session
 
-from app.core.security import create_access_token, create_refresh_token, hash_password, verify_password
+from app.core.cache import TTLCache
+from app.core.config import get_settings
+from app.core.security import (
+    create_access_token,
+    create_refresh_token,
+    decode_token,
+    hash_password,
+    hash_password_async,
+    verify_password,
+    verify_password_async,
+)
+from app.db.session import SessionLocal
 from app.models.user import User
+from app.schemas.user import UserRead
+
+settings = get_settings()
+
+T = TypeVar("T")
+
+token_cache = TTLCache(maxsize=settings.auth_cache_max_entries, ttl=settings.auth_cache_ttl_seconds)
 
 
 def get_user_by_email(db: Session, email: str) -> User | None:
     return db.query(User).filter(User.email == email).first()
 
 
-def create_user(db: Session, email: str, password: str, full_name: str | None = None) -> User:
+def _in_session(function: Callable[..., T], *args: Any) -> T:
+    db = SessionLocal()
+    try:
+        return function(db, *args)
+    finally:
+        db.close()
+
+
+async def get_user_by_email_async(email: str) -> User | None:
+    return await run_in_threadpool(_in_session, get_user_by_email, email)
+
+
+def _save_user(db: Session, email: str, password_hash: str, full_name: str | None, role: str) -> User:
     user = User(
         email=email,
-        password_hash=hash_password(password),
+        password_hash=password_hash,
         full_name=full_name,
-        role="analyst",
+        role=role,
         is_active=True,
     )
     db.add(user)
@@ -22,6 +57,15 @@ def create_user(db: Session, email: str, password: str, full_name: str | None =
     return user
 
 
+def create_user(db: Session, email: str, password: str, full_name: str | None = None) -> User:
+    return _save_user(db, email, hash_password(password), full_name, "analyst")
+
+
+async def create_user_async(email: str, password: str, full_name: str | None = None) -> User:
+    password_hash = await hash_password_async(password)
+    return await run_in_threadpool(_in_session, _save_user, email, password_hash, full_name, "analyst")
+
+
 def authenticate_user(db: Session, email: str, password: str) -> User | None:
     user = get_user_by_email(db, email)
     if not user:
@@ -31,6 +75,15 @@ def authenticate_user(db: Session, email: str, password: str) -> User | None:
     return user
 
 
+async def authenticate_user_async(email: str, password: str) -> User | None:
+    user = await get_user_by_email_async(email)
+    if not user:
+        return None
+    if not await verify_password_async(password, user.password_hash):
+        return None
+    return user
+
+
 def issue_tokens(user: User) -> dict:
     access_token = create_access_token(str(user.id))
     refresh_token = create_refresh_token(str(user.id))
@@ -46,14 +99,35 @@ def has_users(db: Session) -> bool:
 
 
 def create_admin_user(db: Session, email: str, password: str, full_name: str | None = None) -> User:
-    user = User(
-        email=email,
-        password_hash=hash_password(password),
-        full_name=full_name,
-        role="admin",
-        is_active=True,
-    )
-    db.add(user)
-    db.commit()
-    db.refresh(user)
-    return user
+    return _save_user(db, email, hash_password(password), full_name, "admin")
+
+
+def resolve_token(db: Session, token: str) -> tuple[dict, UserRead | None]:
+    cached = token_cache.get(token)
+    if cached is not None:
+        return cached
+
+    payload = decode_token(token)
+    subject = payload.get("sub")
+    if subject is None:
+        raise ValueError("Invalid token")
+
+    user = db.query(User).filter(User.id == int(subject)).first()
+    if not user:
+        return payload, None
+
+    entry = (payload, UserRead.model_validate(user))
+    expires_at = payload.get("exp")
+    ttl = expires_at - time.time() if expires_at is not None else None
+    token_cache.set(token, entry, ttl=ttl)
+    return entry
+
+
+def invalidate_user_tokens(user_id: int) -> None:
+    token_cache.discard_where(lambda entry: entry[1].id == user_id)
+
+
+@event.listens_for(User, "after_update")
+@event.listens_for(User, "after_delete")
+def _invalidate_cached_user(_mapper, _connection, target: User) -> None:
+    invalidate_user_tokens(target.id)
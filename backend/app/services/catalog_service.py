@@ -1,11 +1,17 @@
+from sqlalchemy import select
+from sqlalchemy.exc import IntegrityError
 from sqlalchemy.orm import Session
 
+from app.db.readonly import ReadRow, read_rows, select_for
 from app.models.category import Category
+from app.models.master_sku import MasterSku
 from app.models.product import Product
+from app.schemas.category import CategoryRead
+from app.schemas.product import ProductRead
 
 
-def list_categories(db: Session) -> list[Category]:
-    return db.query(Category).order_by(Category.name.asc()).all()
+def list_categories(db: Session) -> list[ReadRow]:
+    return read_rows(db, select_for(Category, CategoryRead).order_by(Category.name.asc()), CategoryRead)
 
 
 def create_category(db: Session, name: str, description: str | None = None) -> Category:
@@ -16,11 +22,29 @@ def create_category(db: Session, name: str, description: str | None = None) -> C
     return category
 
 
-def list_products(db: Session, store_id: int | None = None) -> list[Product]:
-    query = db.query(Product)
+def list_products(db: Session, store_id: int | None = None) -> list[ReadRow]:
+    stmt = select_for(Product, ProductRead)
     if store_id is not None:
-        query = query.filter(Product.store_id == store_id)
-    return query.order_by(Product.name.asc()).all()
+        stmt = stmt.where(Product.store_id == store_id)
+    return read_rows(db, stmt.order_by(Product.name.asc()), ProductRead)
+
+
+def find_product(db: Session, store_id: int, sku: str) -> Product | None:
+    return (
+        db.query(Product)
+        .join(MasterSku, MasterSku.id == Product.master_sku_id)
+        .filter(MasterSku.code == sku, Product.store_id == store_id)
+        .first()
+    )
+
+
+def find_product_id(db: Session, store_id: int, sku: str) -> int | None:
+    stmt = (
+        select(Product.id)
+        .join(MasterSku, MasterSku.id == Product.master_sku_id)
+        .where(MasterSku.code == sku, Product.store_id == store_id)
+    )
+    return db.execute(stmt).scalar()
 
 
 def create_product(
@@ -32,6 +56,8 @@ def create_product(
     shelf_space_meters: float | None,
     store_id: int,
 ) -> Product:
+    if find_product_id(db, store_id, sku) is not None:
+        raise ValueError(f"SKU {sku} already exists in store {store_id}")
     product = Product(
         sku=sku,
         name=name,
@@ -41,6 +67,12 @@ def create_product(
         store_id=store_id,
     )
     db.add(product)
-    db.commit()
+    try:
+        db.commit()
+    except IntegrityError:
+        db.rollback()
+        if find_product_id(db, store_id, sku) is None:
+            raise
+        raise ValueError(f"SKU {sku} already exists in store {store_id}")
     db.refresh(product)
     return product
@@ -0,0 +1,269 @@
+import threading
+from datetime import datetime
+from typing import Iterable, NamedTuple
+
+import numpy as np
+from sqlalchemy import event, func, select
+from sqlalchemy.orm import Session
+
+from app.core.cache import TTLCache
+from app.core.config import get_settings
+from app.db.partitioning import fan_out, sales_session
+from app.models.category import Category
+from app.models.product import Product
+from app.services import sales_feed
+from app.services.sales_feed import CommittedSale
+from app.services.archive_service import sales_source
+
+settings = get_settings()
+
+ABC_METRICS = ("revenue", "units")
+
+
+class SalesAggregates(NamedTuple):
+    store_ids: np.ndarray
+    product_ids: np.ndarray
+    revenue: np.ndarray
+    units: np.ndarray
+    cv: np.ndarray
+    products: dict[int, tuple[str, str, str]]
+
+
+_cache = TTLCache(settings.classification_cache_max_entries, settings.classification_cache_ttl_seconds)
+_versions: dict[int | None, int] = {}
+_version_lock = threading.Lock()
+
+
+def _daily_sales(db: Session, store_id: int | None, date_start: datetime | None, date_end: datetime | None) -> list:
+    sales = sales_source(db, store_id, date_start, date_end)
+    day = func.date(sales.date)
+    stmt = select(sales.store_id, sales.product_id, day, func.sum(sales.units_sold), func.sum(sales.revenue))
+    if store_id is not None:
+        stmt = stmt.where(sales.store_id == store_id)
+    if date_start is not None:
+        stmt = stmt.where(sales.date >= date_start)
+    if date_end is not None:
+        stmt = stmt.where(sales.date <= date_end)
+    stmt = stmt.group_by(sales.store_id, sales.product_id, day)
+    if store_id is not None:
+        with sales_session(db, store_id) as sales_db:
+            return sales_db.execute(stmt).all()
+    return [row for rows in fan_out(db, lambda session: session.execute(stmt).all()) for row in rows]
+
+
+def _product_details(db: Session, product_ids: np.ndarray) -> dict[int, tuple[str, str, str]]:
+    if not len(product_ids):
+        return {}
+    stmt = (
+        select(Product.id, Product.sku, Product.name, Category.name)
+        .join(Category, Category.id == Product.category_id)
+        .where(Product.id.in_(np.unique(product_ids).tolist()))
+    )
+    return {product_id: (sku, name, category) for product_id, sku, name, category in db.execute(stmt).all()}
+
+
+def build_aggregates(
+    db: Session,
+    store_id: int | None,
+    date_start: datetime | None,
+    date_end: datetime | None,
+) -> SalesAggregates:
+    rows = _daily_sales(db, store_id, date_start, date_end)
+    if not rows:
+        empty = np.empty(0)
+        return SalesAggregates(empty.astype(np.int64), empty.astype(np.int64), empty, empty, empty, {})
+
+    store_column, product_column, day_column, units_column, revenue_column = zip(*rows)
+    stores = np.array(store_column, dtype=np.int64)
+    days = np.array(day_column, dtype="datetime64[D]").astype(np.int64)
+    units = np.array(units_column, dtype=np.float64)
+    revenue = np.array(revenue_column, dtype=np.float64)
+
+    pairs, index = np.unique(
+        np.stack([stores, np.array(product_column, dtype=np.int64)], axis=1),
+        axis=0,
+        return_inverse=True,
+    )
+    index = index.ravel()
+    count = len(pairs)
+    unit_sum = np.bincount(index, weights=units, minlength=count)
+    unit_squares = np.bincount(index, weights=units * units, minlength=count)
+    revenue_sum = np.bincount(index, weights=revenue, minlength=count)
+
+    store_keys, store_index = np.unique(stores, return_inverse=True)
+    first_day = np.full(len(store_keys), np.iinfo(np.int64).max)
+    last_day = np.full(len(store_keys), np.iinfo(np.int64).min)
+    np.minimum.at(first_day, store_index, days)
+    np.maximum.at(last_day, store_index, days)
+    if date_start is not None:
+        first_day[:] = np.datetime64(date_start.date(), "D").astype(np.int64)
+    if date_end is not None:
+        last_day[:] = np.datetime64(date_end.date(), "D").astype(np.int64)
+    span = (last_day - first_day + 1)[np.searchsorted(store_keys, pairs[:, 0])]
+
+    mean = unit_sum / span
+    std = np.sqrt(np.maximum(unit_squares / span - mean * mean, 0.0))
+    cv = np.divide(std, mean, out=np.full(count, np.inf), where=mean > 0)
+
+    return SalesAggregates(
+        pairs[:, 0],
+        pairs[:, 1],
+        revenue_sum,
+        unit_sum,
+        cv,
+        _product_details(db, pairs[:, 1]),
+    )
+
+
+def sales_aggregates(
+    db: Session,
+    store_id: int | None,
+    date_start: datetime | None,
+    date_end: datetime | None,
+) -> SalesAggregates:
+    key = (store_id, date_start, date_end)
+    cached = _cache.get(key)
+    if cached is not None:
+        return cached[1]
+    with _version_lock:
+        version = _versions.get(store_id, 0)
+    aggregates = build_aggregates(db, store_id, date_start, date_end)
+    with _version_lock:
+        if _versions.get(store_id, 0) == version:
+            _cache.set(key, (store_id, aggregates))
+    return aggregates
+
+
+def invalidate_aggregates(store_ids: set[int] | None = None) -> None:
+    with _version_lock:
+        for store_id in _versions if store_ids is None else store_ids | {None}:
+            _versions[store_id] = _versions.get(store_id, 0) + 1
+    if store_ids is None:
+        _cache.clear()
+    else:
+        _cache.discard_where(lambda entry: entry[0] is None or entry[0] in store_ids)
+
+
+@sales_feed.subscribe
+def apply_sales(sales: Iterable[CommittedSale]) -> None:
+    invalidate_aggregates({sale.store_id for sale in sales})
+
+
+@sales_feed.subscribe_untracked
+def invalidate_store(store_id: int | None = None) -> None:
+    invalidate_aggregates(None if store_id is None else {store_id})
+
+
+@event.listens_for(Product, "after_update")
+@event.listens_for(Product, "after_delete")
+@event.listens_for(Category, "after_update")
+@event.listens_for(Category, "after_delete")
+def _invalidate_catalog(_mapper, _connection, _target) -> None:
+    invalidate_aggregates()
+
+
+def _validate_thresholds(abc_thresholds: tuple[float, float], xyz_thresholds: tuple[float, float]) -> None:
+    a, b = abc_thresholds
+    if not 0 < a < b <= 1:
+        raise ValueError("ABC thresholds must satisfy 0 < a < b <= 1")
+    x, y = xyz_thresholds
+    if not 0 <= x < y:
+        raise ValueError("XYZ thresholds must satisfy 0 <= x < y")
+
+
+def classify_abc_xyz(
+    aggregates: SalesAggregates,
+    store_id: int | None,
+    metric: str,
+    abc_thresholds: tuple[float, float],
+    xyz_thresholds: tuple[float, float],
+) -> dict:
+    if metric not in ABC_METRICS:
+        raise ValueError(f"Unsupported ABC metric: {metric}")
+    _validate_thresholds(abc_thresholds, xyz_thresholds)
+
+    stores = aggregates.store_ids
+    selected = stores == store_id if store_id is not None else np.ones(len(stores), dtype=bool)
+    stores = stores[selected]
+    products = aggregates.product_ids[selected]
+    revenue = aggregates.revenue[selected]
+    units = aggregates.units[selected]
+    cv = aggregates.cv[selected]
+    values = revenue if metric == "revenue" else units
+
+    order = np.lexsort((products, -values, stores))
+    stores, products, revenue, units, cv, values = (
+        column[order] for column in (stores, products, revenue, units, cv, values)
+    )
+
+    store_keys, group_starts, group_index = np.unique(stores, return_index=True, return_inverse=True)
+    totals = np.bincount(group_index, weights=values, minlength=len(store_keys))
+    cumulative = np.cumsum(values)
+    cumulative -= np.concatenate(([0.0], cumulative))[group_starts][group_index]
+    store_totals = totals[group_index]
+    share = np.divide(cumulative, store_totals, out=np.ones(len(values)), where=store_totals > 0)
+
+    a, b = abc_thresholds
+    x, y = xyz_thresholds
+    abc = np.where(share <= a, "A", np.where(share <= b, "B", "C"))
+    xyz = np.where(cv <= x, "X", np.where(cv <= y, "Y", "Z"))
+
+    grand_total = float(values.sum())
+    summary: dict = {"total_skus": int(len(values)), "metric": metric, "classes": {}}
+    for abc_class in "ABC":
+        for xyz_class in "XYZ":
+            members = (abc == abc_class) & (xyz == xyz_class)
+            summary["classes"][abc_class + xyz_class] = {
+                "skus": int(members.sum()),
+                "share": round(float(values[members].sum()) / grand_total, 6) if grand_total else 0,
+            }
+
+    table = []
+    for row in zip(
+        stores.tolist(),
+        products.tolist(),
+        revenue.tolist(),
+        units.tolist(),
+        cv.tolist(),
+        abc.tolist(),
+        xyz.tolist(),
+    ):
+        row_store, product_id, row_revenue, row_units, row_cv, abc_class, xyz_class = row
+        sku, name, category = aggregates.products.get(product_id, (None, None, None))
+        table.append(
+            {
+                "store_id": row_store,
+                "product_id": product_id,
+                "sku": sku,
+                "product_name": name,
+                "category": category,
+                "revenue": round(row_revenue, 6),
+                "units": int(row_units),
+                "cv": round(row_cv, 6) if np.isfinite(row_cv) else None,
+                "abc": abc_class,
+                "xyz": xyz_class,
+                "classification": abc_class + xyz_class,
+            }
+        )
+
+    return {"summary": summary, "table": table}
+
+
+def abc_xyz_analysis(
+    db: Session,
+    store_id: int | None,
+    date_start: datetime | None,
+    date_end: datetime | None,
+    metric: str | None = None,
+    abc_thresholds: tuple[float | None, float | None] = (None, None),
+    xyz_thresholds: tuple[float | None, float | None] = (None, None),
+) -> dict:
+    a, b = abc_thresholds
+    x, y = xyz_thresholds
+    return classify_abc_xyz(
+        sales_aggregates(db, store_id, date_start, date_end),
+        store_id,
+        metric or settings.abc_metric,
+        (a if a is not None else settings.abc_threshold_a, b if b is not None else settings.abc_threshold_b),
+        (x if x is not None else settings.xyz_threshold_x, y if y is not None else settings.xyz_threshold_y),
+    )
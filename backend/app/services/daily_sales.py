@@ -0,0 +1,53 @@
+from datetime import datetime, timedelta
+from typing import NamedTuple
+
+import numpy as np
+from sqlalchemy import func, select
+from sqlalchemy.orm import Session
+
+from app.db.partitioning import sales_session
+from app.services.archive_service import sales_source
+
+
+class DailySales(NamedTuple):
+    product_ids: np.ndarray
+    first_day: np.datetime64
+    units: np.ndarray
+    revenue: np.ndarray
+
+
+def load_daily_sales(db: Session, store_id: int, history_days: int | None = None) -> DailySales | None:
+    since = None
+    with sales_session(db, store_id) as sales_db:
+        if history_days is not None:
+            sales = sales_source(db, store_id)
+            latest = sales_db.execute(select(func.max(sales.date)).where(sales.store_id == store_id)).scalar()
+            if latest is None:
+                return None
+            since = datetime.combine(latest.date(), datetime.min.time()) - timedelta(days=history_days - 1)
+
+        sales = sales_source(db, store_id, since)
+        day = func.date(sales.date)
+        stmt = (
+            select(sales.product_id, day, func.sum(sales.units_sold), func.sum(sales.revenue))
+            .where(sales.store_id == store_id)
+            .group_by(sales.product_id, day)
+        )
+        if since is not None:
+            stmt = stmt.where(sales.date >= since)
+        rows = sales_db.execute(stmt).all()
+    if not rows:
+        return None
+
+    product_column, day_column, units_column, revenue_column = zip(*rows)
+    product_ids, product_index = np.unique(np.array(product_column, dtype=np.int64), return_inverse=True)
+    days = np.array(day_column, dtype="datetime64[D]")
+    first_day = days.min()
+    day_index = (days - first_day).astype(np.int64)
+
+    shape = (len(product_ids), int(day_index.max()) + 1)
+    units = np.zeros(shape)
+    revenue = np.zeros(shape)
+    units[product_index, day_index] = np.array(units_column, dtype=np.float64)
+    revenue[product_index, day_index] = np.array(revenue_column, dtype=np.float64)
+    return DailySales(product_ids, first_day, units, revenue)
@@ -0,0 +1,184 @@
+import json
+import os
+from datetime import datetime, timedelta
+from pathlib import Path
+from typing import Any, Callable, Iterable, Iterator, Sequence
+
+from sqlalchemy import select
+from sqlalchemy.orm import Session
+
+from app.core.config import get_settings
+from app.db.partitioning import partition_sessions, sales_session
+from app.models.export_job import ExportJob
+from app.models.sale import Sale
+from app.services.analytics_service import space_elasticity, stream_tail_analysis
+from app.services.archive_service import archived_until, iter_archived_sales
+from app.utils.export_writers import EXPORT_COMPRESSIONS, EXPORT_FORMATS, encode_rows, export_filename
+
+settings = get_settings()
+
+EXPORT_TYPES = ("sales", "tail", "space")
+STORE_SCOPED_TYPES = ("tail", "space")
+
+SALES_COLUMNS = ("id", "product_id", "store_id", "date", "units_sold", "revenue", "basket_id")
+TAIL_COLUMNS = ("sku", "product_name", "category", "sales_pct", "classification")
+SPACE_COLUMNS = ("category", "sales_pct", "current_meters", "recommended_meters")
+
+DATE_PARAMS = ("date_start", "date_end")
+
+
+def validate_export(export_type: str, export_format: str, compression: str | None, params: dict) -> None:
+    if export_type not in EXPORT_TYPES:
+        raise ValueError(f"Unsupported export type: {export_type}")
+    if export_format not in EXPORT_FORMATS:
+        raise ValueError(f"Unsupported export format: {export_format}")
+    if compression is not None and compression not in EXPORT_COMPRESSIONS:
+        raise ValueError(f"Unsupported export compression: {compression}")
+    if export_type in STORE_SCOPED_TYPES and params.get("store_id") is None:
+        raise ValueError(f"store_id is required for {export_type} exports")
+
+
+def _hot_sales(db: Session, store_id: int | None, date_start: datetime | None, date_end: datetime | None) -> Iterator:
+    stmt = select(*(getattr(Sale, column) for column in SALES_COLUMNS))
+    if store_id is not None:
+        stmt = stmt.where(Sale.store_id == store_id)
+    if date_start is not None:
+        stmt = stmt.where(Sale.date >= date_start)
+    if date_end is not None:
+        stmt = stmt.where(Sale.date <= date_end)
+    stmt = stmt.order_by(Sale.date, Sale.id).execution_options(yield_per=5000)
+
+    if store_id is not None:
+        with sales_session(db, store_id) as sales_db:
+            yield from sales_db.execute(stmt)
+        return
+    for sales_db in partition_sessions(db):
+        yield from sales_db.execute(stmt)
+
+
+def _sales_rows(db: Session, params: dict) -> Iterator[tuple]:
+    store_id, date_start, date_end = params.get("store_id"), params.get("date_start"), params.get("date_end")
+    watermark = archived_until(db)
+    if watermark is not None and (date_start is None or date_start < watermark):
+        for row in iter_archived_sales(db, store_id, date_start, date_end):
+            yield tuple(getattr(row, column) for column in SALES_COLUMNS)
+    for row in _hot_sales(db, store_id, date_start, date_end):
+        yield tuple(row)
+
+
+def _tail_rows(db: Session, params: dict) -> Iterator[tuple]:
+    items = stream_tail_analysis(
+        db,
+        params["store_id"],
+        params.get("date_start"),
+        params.get("date_end"),
+        params.get("category_id"),
+        params.get("search"),
+        params.get("classification"),
+    )
+    next(items, None)
+    for item in items:
+        yield tuple(item[column] for column in TAIL_COLUMNS)
+
+
+def _space_rows(db: Session, params: dict) -> Iterator[tuple]:
+    result = space_elasticity(db, params["store_id"], params.get("date_start"), params.get("date_end"))
+    for entry in result["table"]:
+        yield tuple(entry[column] for column in SPACE_COLUMNS)
+
+
+EXPORT_SOURCES: dict[str, tuple[Sequence[str], Callable[[Session, dict], Iterable[tuple]]]] = {
+    "sales": (SALES_COLUMNS, _sales_rows),
+    "tail": (TAIL_COLUMNS, _tail_rows),
+    "space": (SPACE_COLUMNS, _space_rows),
+}
+
+
+def stream_export(
+    db: Session,
+    export_type: str,
+    export_format: str,
+    compression: str | None,
+    params: dict,
+    on_row: Callable[[], None] | None = None,
+) -> Iterator[bytes]:
+    validate_export(export_type, export_format, compression, params)
+    header, source = EXPORT_SOURCES[export_type]
+    return encode_rows(
+        header,
+        source(db, params),
+        export_format,
+        compression,
+        compress_level=settings.export_compress_level,
+        sheet_name=export_type,
+        on_row=on_row,
+    )
+
+
+def export_download_name(export_type: str, export_format: str, compression: str | None, params: dict) -> str:
+    stem = export_type if params.get("store_id") is None else f"{export_type}_store_{params['store_id']}"
+    return export_filename(stem, export_format, compression)
+
+
+def dump_params(params: dict) -> str:
+    return json.dumps({key: value.isoformat() if isinstance(value, datetime) else value for key, value in params.items()})
+
+
+def load_params(raw: str) -> dict[str, Any]:
+    params = json.loads(raw or "{}")
+    for key in DATE_PARAMS:
+        if params.get(key) is not None:
+            params[key] = datetime.fromisoformat(params[key])
+    return params
+
+
+def export_path(job: ExportJob) -> str:
+    root = Path(settings.export_dir)
+    if not root.is_absolute():
+        root = Path(__file__).resolve().parents[3] / root
+    root.mkdir(parents=True, exist_ok=True)
+    return (root / export_filename(f"{job.id}_{job.type}", job.format, job.compression)).as_posix()
+
+
+def enqueue_export(
+    db: Session,
+    user_id: int,
+    export_type: str,
+    export_format: str,
+    compression: str | None,
+    params: dict,
+) -> ExportJob:
+    validate_export(export_type, export_format, compression, params)
+    job = ExportJob(
+        user_id=user_id,
+        type=export_type,
+        status="queued",
+        format=export_format,
+        compression=compression,
+        params=dump_params(params),
+    )
+    db.add(job)
+    db.commit()
+    db.refresh(job)
+    return job
+
+
+def sweep_export_files(db: Session) -> int:
+    cutoff = datetime.utcnow() - timedelta(days=settings.export_retention_days)
+    jobs = (
+        db.query(ExportJob)
+        .filter(
+            ExportJob.status.in_(("completed", "failed")),
+            ExportJob.purged_at.is_(None),
+            ExportJob.file_path.isnot(None),
+            ExportJob.created_at < cutoff,
+        )
+        .all()
+    )
+    for job in jobs:
+        if os.path.exists(job.file_path):
+            os.remove(job.file_path)
+        job.purged_at = datetime.utcnow()
+    if jobs:
+        db.commit()
+    return len(jobs)
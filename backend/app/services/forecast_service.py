@@ -0,0 +1,158 @@
+from datetime import datetime
+from typing import NamedTuple
+
+import numpy as np
+from sqlalchemy import delete, insert, select
+from sqlalchemy.orm import Session
+
+from app.core.config import get_settings
+from app.models.product import Product
+from app.models.sales_forecast import SalesForecast
+from app.services.daily_sales import load_daily_sales
+
+settings = get_settings()
+
+FORECAST_METHODS = ("auto", "ses", "seasonal_naive")
+SMOOTHING_ALPHAS = (0.05, 0.1, 0.2, 0.3, 0.5, 0.8)
+BLOCK_ROWS = 20_000
+INSERT_BATCH_SIZE = 5_000
+
+
+class UnitForecast(NamedTuple):
+    units: np.ndarray
+    mae: np.ndarray
+    methods: np.ndarray
+
+
+def exponential_smoothing(matrix: np.ndarray, horizon: int) -> tuple[np.ndarray, np.ndarray]:
+    alphas = np.array(SMOOTHING_ALPHAS)[:, None]
+    level = np.repeat(matrix[None, :, 0], len(alphas), axis=0)
+    abs_error = np.zeros_like(level)
+    for day in range(1, matrix.shape[1]):
+        error = matrix[:, day] - level
+        abs_error += np.abs(error)
+        level += alphas * error
+
+    best = np.argmin(abs_error, axis=0)
+    rows = np.arange(matrix.shape[0])
+    mae = abs_error[best, rows] / max(matrix.shape[1] - 1, 1)
+    return np.repeat(level[best, rows][:, None], horizon, axis=1), mae
+
+
+def seasonal_naive(matrix: np.ndarray, horizon: int, season: int) -> tuple[np.ndarray, np.ndarray]:
+    days = matrix.shape[1]
+    season = min(season, days)
+    forecast = matrix[:, days - season:][:, np.arange(horizon) % season]
+    if days > season:
+        mae = np.abs(matrix[:, season:] - matrix[:, :-season]).mean(axis=1)
+    else:
+        mae = np.full(matrix.shape[0], np.inf)
+    return forecast, mae
+
+
+def forecast_units(matrix: np.ndarray, horizon: int, method: str, season: int) -> UnitForecast:
+    if method == "ses":
+        units, mae = exponential_smoothing(matrix, horizon)
+        return UnitForecast(units, mae, np.full(len(mae), "ses"))
+    if method == "seasonal_naive":
+        units, mae = seasonal_naive(matrix, horizon, season)
+        return UnitForecast(units, mae, np.full(len(mae), "seasonal_naive"))
+
+    smoothed, smoothed_mae = exponential_smoothing(matrix, horizon)
+    seasonal, seasonal_mae = seasonal_naive(matrix, horizon, season)
+    use_seasonal = seasonal_mae < smoothed_mae
+    return UnitForecast(
+        np.where(use_seasonal[:, None], seasonal, smoothed),
+        np.where(use_seasonal, seasonal_mae, smoothed_mae),
+        np.where(use_seasonal, "seasonal_naive", "ses"),
+    )
+
+
+def forecast_store(db: Session, store_id: int, horizon: int | None = None, method: str | None = None) -> int:
+    horizon = horizon or settings.forecast_horizon_days
+    method = method or settings.forecast_method
+    if method not in FORECAST_METHODS:
+        raise ValueError(f"Unsupported forecast method: {method}")
+    if horizon < 1:
+        raise ValueError("Forecast horizon must be at least 1 day")
+
+    daily = load_daily_sales(db, store_id, settings.forecast_history_days)
+    db.execute(delete(SalesForecast).where(SalesForecast.store_id == store_id))
+    if daily is None:
+        db.commit()
+        return 0
+
+    start_date = (daily.first_day + daily.units.shape[1]).astype("datetime64[s]").item()
+    created_at = datetime.utcnow()
+    records: list[dict] = []
+
+    for start in range(0, len(daily.product_ids), BLOCK_ROWS):
+        units = daily.units[start:start + BLOCK_ROWS]
+        unit_totals = units.sum(axis=1)
+        revenue_totals = daily.revenue[start:start + BLOCK_ROWS].sum(axis=1)
+        price = np.divide(revenue_totals, unit_totals, out=np.zeros(len(unit_totals)), where=unit_totals > 0)
+
+        forecast = forecast_units(units, horizon, method, settings.forecast_season_days)
+        unit_values = np.maximum(forecast.units, 0.0).round(4)
+        revenue_values = (unit_values * price[:, None]).round(4)
+
+        for product_id, product_units, product_revenue, mae, product_method in zip(
+            daily.product_ids[start:start + BLOCK_ROWS].tolist(),
+            unit_values.tolist(),
+            revenue_values.tolist(),
+            forecast.mae.tolist(),
+            forecast.methods.tolist(),
+        ):
+            records.append(
+                {
+                    "store_id": store_id,
+                    "product_id": product_id,
+                    "method": product_method,
+                    "start_date": start_date,
+                    "horizon_days": horizon,
+                    "units_json": product_units,
+                    "revenue_json": product_revenue,
+                    "mae": round(mae, 6) if np.isfinite(mae) else None,
+                    "created_at": created_at,
+                }
+            )
+            if len(records) >= INSERT_BATCH_SIZE:
+                db.execute(insert(SalesForecast), records)
+                records = []
+
+    if records:
+        db.execute(insert(SalesForecast), records)
+    db.commit()
+    return len(daily.product_ids)
+
+
+def list_forecasts(
+    db: Session,
+    store_id: int,
+    product_id: int | None = None,
+    limit: int = 100,
+    offset: int = 0,
+) -> list[dict]:
+    stmt = (
+        select(SalesForecast, Product.sku, Product.name)
+        .join(Product, Product.id == SalesForecast.product_id)
+        .where(SalesForecast.store_id == store_id)
+    )
+    if product_id is not None:
+        stmt = stmt.where(SalesForecast.product_id == product_id)
+    stmt = stmt.order_by(SalesForecast.product_id.asc()).offset(offset).limit(limit)
+
+    return [
+        {
+            "product_id": forecast.product_id,
+            "sku": sku,
+            "product_name": name,
+            "method": forecast.method,
+            "start_date": forecast.start_date,
+            "horizon_days": forecast.horizon_days,
+            "units": forecast.units_json,
+            "revenue": forecast.revenue_json,
+            "mae": forecast.mae,
+        }
+        for forecast, sku, name in db.execute(stmt).all()
+    ]
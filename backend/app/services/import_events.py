@@ -0,0 +1,107 @@
+import asyncio
+import json
+import threading
+import time
+from typing import AsyncIterator, Callable
+
+from app.core.config import get_settings
+
+settings = get_settings()
+
+TERMINAL_STATUSES = ("completed", "failed")
+
+
+class ProgressBroker:
+    def __init__(self) -> None:
+        self._subscribers: dict[int, set[tuple[asyncio.AbstractEventLoop, asyncio.Queue]]] = {}
+        self._lock = threading.Lock()
+
+    def subscribe(self, job_id: int) -> asyncio.Queue:
+        queue: asyncio.Queue = asyncio.Queue()
+        with self._lock:
+            self._subscribers.setdefault(job_id, set()).add((asyncio.get_running_loop(), queue))
+        return queue
+
+    def unsubscribe(self, job_id: int, queue: asyncio.Queue) -> None:
+        with self._lock:
+            subscribers = self._subscribers.get(job_id, set())
+            for entry in [entry for entry in subscribers if entry[1] is queue]:
+                subscribers.discard(entry)
+            if not subscribers:
+                self._subscribers.pop(job_id, None)
+
+    def publish(self, job_id: int, event: dict) -> None:
+        with self._lock:
+            subscribers = list(self._subscribers.get(job_id, ()))
+        for loop, queue in subscribers:
+            loop.call_soon_threadsafe(queue.put_nowait, event)
+
+
+broker = ProgressBroker()
+export_broker = ProgressBroker()
+
+
+class ProgressReporter:
+    def __init__(self, job_id: int, progress_broker: ProgressBroker = broker) -> None:
+        self.job_id = job_id
+        self.broker = progress_broker
+        self.interval = settings.import_progress_interval_seconds
+        self._last_time = time.monotonic()
+        self._last_rows = 0
+
+    def update(self, status: str, processed_rows: int, error_count: int, force: bool = False) -> None:
+        now = time.monotonic()
+        elapsed = now - self._last_time
+        if not force and elapsed < self.interval:
+            return
+        rows_per_sec = (processed_rows - self._last_rows) / elapsed if elapsed > 0 else 0.0
+        self._last_time = now
+        self._last_rows = processed_rows
+        self.broker.publish(
+            self.job_id,
+            {
+                "id": self.job_id,
+                "status": status,
+                "processed_rows": processed_rows,
+                "error_count": error_count,
+                "rows_per_sec": round(rows_per_sec, 1),
+            },
+        )
+
+
+def format_event(event: dict) -> str:
+    name = "complete" if event["status"] in TERMINAL_STATUSES else "progress"
+    return f"event: {name}\ndata: {json.dumps(event)}\n\n"
+
+
+async def job_events(
+    progress_broker: ProgressBroker,
+    job_id: int,
+    queue: asyncio.Queue,
+    snapshot: dict,
+    reload: Callable[[], dict | None],
+) -> AsyncIterator[str]:
+    started = time.monotonic()
+    try:
+        yield format_event(snapshot)
+        if snapshot["status"] in TERMINAL_STATUSES:
+            return
+        while True:
+            try:
+                event = await asyncio.wait_for(queue.get(), timeout=settings.import_events_keepalive_seconds)
+            except asyncio.TimeoutError:
+                current = await asyncio.to_thread(reload)
+                if current is None:
+                    return
+                if current["status"] in TERMINAL_STATUSES:
+                    yield format_event(current)
+                    return
+                if time.monotonic() - started >= settings.import_events_max_seconds:
+                    return
+                yield ": keepalive\n\n"
+                continue
+            yield format_event(event)
+            if event["status"] in TERMINAL_STATUSES:
+                return
+    finally:
+        progress_broker.unsubscribe(job_id, queue)
@@ -1,32 +1,439 @@
+import gzip
+import hashlib
+import io
 import os
-from datetime import datetime
+import threading
+import zipfile
+from collections import Counter
+from contextlib import ExitStack, suppress
+from datetime import datetime, timedelta
+from typing import Callable
 
 from fastapi import UploadFile
 from sqlalchemy.orm import Session
 
+from app.core.config import get_settings
+from app.db.partitioning import sales_session
+from app.models.category import Category
 from app.models.import_job import ImportJob
+from app.models.product import Product
+from app.models.sale import Sale
+from app.models.shelf_space import ShelfSpace
+from app.models.store import Store
+from app.models.traffic_zone import TrafficZone
+from app.services.catalog_service import find_product, find_product_id
+from app.utils.validators import normalize_import_type
 
+settings = get_settings()
 
-def enqueue_import(db: Session, user_id: int, import_type: str, file: UploadFile) -> ImportJob:
-    os.makedirs("backend/data/imports", exist_ok=True)
-    timestamp = datetime.utcnow().strftime("%Y%m%d%H%M%S")
-    safe_name = f"{timestamp}_{file.filename}"
-    file_path = os.path.join("backend/data/imports", safe_name)
+IMPORT_DIR = "backend/data/imports"
+ROW_HASH_SIZE = 8
+UPLOAD_CHUNK_SIZE = 1024 * 1024
 
-    with open(file_path, "wb") as output:
-        output.write(file.file.read())
+
+def _store_upload(file: UploadFile) -> tuple[str, str, int]:
+    os.makedirs(IMPORT_DIR, exist_ok=True)
+    timestamp = datetime.utcnow().strftime("%Y%m%d%H%M%S%f")
+    file_path = os.path.join(IMPORT_DIR, f"{timestamp}_{file.filename}.gz")
+
+    digest = hashlib.sha256()
+    size = 0
+    with gzip.open(file_path, "wb", compresslevel=settings.import_compress_level) as output:
+        while chunk := file.file.read(UPLOAD_CHUNK_SIZE):
+            digest.update(chunk)
+            size += len(chunk)
+            output.write(chunk)
+    return file_path, digest.hexdigest(), size
+
+
+def open_import_file(file_path: str) -> io.TextIOBase:
+    if file_path.endswith(".gz"):
+        return gzip.open(file_path, "rt", newline="", encoding="utf-8-sig")
+    return open(file_path, newline="", encoding="utf-8-sig")
+
+
+def find_duplicate_import(db: Session, import_type: str, content_hash: str) -> ImportJob | None:
+    return (
+        db.query(ImportJob)
+        .filter(
+            ImportJob.type == import_type,
+            ImportJob.content_hash == content_hash,
+            ImportJob.status != "failed",
+        )
+        .order_by(ImportJob.id.desc())
+        .first()
+    )
+
+
+def enqueue_import(db: Session, user_id: int, import_type: str, file: UploadFile) -> tuple[ImportJob, bool]:
+    import_type = normalize_import_type(import_type)
+    file_path, content_hash, size = _store_upload(file)
+
+    existing = find_duplicate_import(db, import_type, content_hash)
+    if existing:
+        os.remove(file_path)
+        return existing, False
 
     job = ImportJob(
         user_id=user_id,
         type=import_type,
         status="queued",
         original_filename=file.filename,
+        file_path=file_path,
+        content_hash=content_hash,
+        size_bytes=size,
+        stored_bytes=os.path.getsize(file_path),
         total_rows=None,
         processed_rows=None,
+        unchanged_rows=None,
         error_count=None,
         error_report_path=None,
     )
     db.add(job)
     db.commit()
     db.refresh(job)
-    return job
+    return job, True
+
+
+def row_hash(row: dict[str, str]) -> bytes:
+    payload = "\x1f".join(f"{key}\x1e{value}" for key, value in sorted(row.items()))
+    return hashlib.blake2b(payload.encode("utf-8"), digest_size=ROW_HASH_SIZE).digest()
+
+
+def row_hashes_path(job: ImportJob) -> str:
+    return f"{job.file_path.removesuffix('.gz')}.rowhashes"
+
+
+def previous_imports(db: Session, job: ImportJob) -> list[ImportJob]:
+    completed = (
+        db.query(ImportJob)
+        .filter(ImportJob.type == job.type, ImportJob.status == "completed", ImportJob.id < job.id)
+        .order_by(ImportJob.id.desc())
+        .first()
+    )
+    interrupted = db.query(ImportJob).filter(
+        ImportJob.type == job.type,
+        ImportJob.status.in_(("failed", "processing")),
+        ImportJob.id > (completed.id if completed else 0),
+        ImportJob.id < job.id,
+    )
+    return ([completed] if completed else []) + interrupted.order_by(ImportJob.id).all()
+
+
+def _remove_file(path: str | None) -> None:
+    if path:
+        with suppress(FileNotFoundError):
+            os.remove(path)
+
+
+def discard_row_hashes(job: ImportJob | None) -> None:
+    if job and job.file_path:
+        _remove_file(row_hashes_path(job))
+
+
+def previous_row_hashes(previous: list[ImportJob]) -> set[bytes]:
+    hashes: set[bytes] = set()
+    for job in previous:
+        if not job.file_path or not os.path.exists(row_hashes_path(job)):
+            continue
+        with open(row_hashes_path(job), "rb") as stream:
+            data = stream.read()
+        hashes.update(data[offset : offset + ROW_HASH_SIZE] for offset in range(0, len(data), ROW_HASH_SIZE))
+    return hashes
+
+
+def _purge_job_files(job: ImportJob, keep_row_hashes: bool) -> None:
+    _remove_file(job.file_path)
+    _remove_file(job.error_report_path)
+    job.error_report_path = None
+    if not keep_row_hashes:
+        discard_row_hashes(job)
+    job.purged_at = datetime.utcnow()
+
+
+def sweep_import_files(db: Session) -> int:
+    jobs = (
+        db.query(ImportJob)
+        .filter(
+            ImportJob.status.in_(("completed", "failed")),
+            ImportJob.purged_at.is_(None),
+            ImportJob.file_path.isnot(None),
+        )
+        .order_by(ImportJob.created_at.asc(), ImportJob.id.asc())
+        .all()
+    )
+    latest_by_type: dict[str, int] = {}
+    for job in jobs:
+        if job.status == "completed":
+            latest_by_type[job.type] = job.id
+
+    cutoff = datetime.utcnow() - timedelta(days=settings.import_retention_days)
+    budget = settings.import_storage_budget_mb * 1024 * 1024
+    stored = sum(job.stored_bytes or 0 for job in jobs)
+    purged = 0
+    for job in jobs:
+        if job.created_at >= cutoff and stored <= budget:
+            break
+        _purge_job_files(job, keep_row_hashes=job.id >= latest_by_type.get(job.type, 0))
+        stored -= job.stored_bytes or 0
+        purged += 1
+    if purged:
+        db.commit()
+    return purged
+
+
+IMPORT_DEPENDENCIES = {
+    "stores": (),
+    "categories": (),
+    "products": ("stores", "categories"),
+    "shelf_space": ("stores", "categories"),
+    "traffic": ("stores",),
+    "sales": ("stores", "products"),
+}
+
+
+def dependency_order(import_types: list[str]) -> list[str]:
+    ordered: list[str] = []
+    remaining = set(import_types)
+    while remaining:
+        ready = sorted(
+            import_type
+            for import_type in remaining
+            if not any(dependency in remaining for dependency in IMPORT_DEPENDENCIES[import_type])
+        )
+        ordered.extend(ready)
+        remaining.difference_update(ready)
+    return ordered
+
+
+class ImportGate:
+    def __init__(self, import_types: list[str]) -> None:
+        self._condition = threading.Condition()
+        self._running = Counter(import_types)
+        self._versions = {import_type: 0 for import_type in import_types}
+
+    def version(self, import_type: str) -> int:
+        with self._condition:
+            return self._versions.get(import_type, 0)
+
+    def committed(self, import_type: str) -> None:
+        with self._condition:
+            self._versions[import_type] = self._versions.get(import_type, 0) + 1
+            self._condition.notify_all()
+
+    def finished(self, import_type: str) -> None:
+        with self._condition:
+            self._running[import_type] -= 1
+            self._condition.notify_all()
+
+    def wait_for_change(self, import_type: str, seen_version: int) -> bool:
+        with self._condition:
+            while self._running[import_type] > 0 and self._versions.get(import_type, 0) == seen_version:
+                self._condition.wait()
+            return self._versions.get(import_type, 0) != seen_version
+
+
+def infer_import_type(filename: str) -> str:
+    stem = os.path.basename(filename).split(".", 1)[0]
+    try:
+        return normalize_import_type(stem)
+    except ValueError as exc:
+        raise ValueError(f"Cannot infer import type from file name: {filename}") from exc
+
+
+def _expand_bundle(files: list[UploadFile], stack: ExitStack) -> list[UploadFile]:
+    expanded = []
+    for file in files:
+        if not (file.filename or "").lower().endswith(".zip"):
+            expanded.append(file)
+            continue
+        archive = stack.enter_context(zipfile.ZipFile(file.file))
+        for member in archive.infolist():
+            if member.is_dir() or os.path.basename(member.filename).startswith("."):
+                continue
+            expanded.append(
+                UploadFile(stack.enter_context(archive.open(member)), filename=os.path.basename(member.filename))
+            )
+    return expanded
+
+
+def enqueue_import_bundle(
+    db: Session, user_id: int, files: list[UploadFile]
+) -> tuple[ImportJob, list[ImportJob], list[int]]:
+    with ExitStack() as stack:
+        uploads = _expand_bundle(files, stack)
+        if not uploads:
+            raise ValueError("Bundle contains no files")
+        typed_uploads = [(infer_import_type(upload.filename or ""), upload) for upload in uploads]
+
+        bundle = ImportJob(
+            user_id=user_id,
+            type="bundle",
+            status="queued",
+            original_filename=", ".join(upload.filename or "" for upload in uploads)[:255],
+        )
+        db.add(bundle)
+        db.commit()
+
+        jobs: list[ImportJob] = []
+        created_ids: dict[str, list[int]] = {}
+        for import_type, upload in typed_uploads:
+            job, created = enqueue_import(db, user_id=user_id, import_type=import_type, file=upload)
+            if created:
+                job.parent_id = bundle.id
+                created_ids.setdefault(job.type, []).append(job.id)
+            jobs.append(job)
+        db.commit()
+
+    run_order = [job_id for import_type in dependency_order(list(created_ids)) for job_id in created_ids[import_type]]
+    return bundle, jobs, run_order
+
+
+class RowApplier:
+    def __init__(self, db: Session, import_type: str, gate: ImportGate | None = None) -> None:
+        self.db = db
+        self.import_type = import_type
+        self.gate = gate
+        self._categories: dict[str, int] = {}
+        self._products: dict[tuple[int, str], int] = {}
+        self._sales_sessions: dict[int, Session] = {}
+        self._stack = ExitStack()
+        self.on_commit: Callable[[], None] | None = None
+
+    def _resolve(self, upstream_type: str, lookup: Callable[[], int | None]) -> int | None:
+        while True:
+            seen_version = self.gate.version(upstream_type) if self.gate else 0
+            found = lookup()
+            if found is not None or self.gate is None:
+                return found
+            self.commit()
+            if not self.gate.wait_for_change(upstream_type, seen_version):
+                return lookup()
+
+    def _category_id(self, values: dict) -> int:
+        if values.get("category_id") is not None:
+            return values["category_id"]
+        name = values["category"]
+        if name not in self._categories:
+            category_id = self._resolve(
+                "categories",
+                lambda: self.db.query(Category.id).filter(Category.name == name).scalar(),
+            )
+            if category_id is None:
+                raise ValueError(f"Unknown category: {name}")
+            self._categories[name] = category_id
+        return self._categories[name]
+
+    def _product_id(self, values: dict) -> int:
+        if values.get("product_id") is not None:
+            return values["product_id"]
+        key = (values["store_id"], values["sku"])
+        if key not in self._products:
+            product_id = self._resolve("products", lambda: find_product_id(self.db, *key))
+            if product_id is None:
+                raise ValueError(f"Unknown sku: {key[1]} in store {key[0]}")
+            self._products[key] = product_id
+        return self._products[key]
+
+    def _sales_db(self, store_id: int) -> Session:
+        if store_id not in self._sales_sessions:
+            self._sales_sessions[store_id] = self._stack.enter_context(sales_session(self.db, store_id))
+        return self._sales_sessions[store_id]
+
+    def apply(self, values: dict) -> None:
+        try:
+            getattr(self, f"_apply_{self.import_type}")(values)
+        except ValueError:
+            if self.import_type != "sales":
+                for pending in list(self.db.new):
+                    self.db.expunge(pending)
+            raise
+        if self.import_type != "sales":
+            self.db.flush()
+
+    def _apply_stores(self, values: dict) -> None:
+        store = None
+        if values["id"] is not None:
+            store = self.db.get(Store, values["id"])
+        if store is None:
+            store = self.db.query(Store).filter(Store.name == values["name"]).first()
+        if store is None:
+            store = Store(id=values["id"])
+            self.db.add(store)
+        for field in ("name", "address", "city", "state", "country"):
+            setattr(store, field, values[field])
+
+    def _apply_categories(self, values: dict) -> None:
+        category = self.db.query(Category).filter(Category.name == values["name"]).first()
+        if category is None:
+            category = Category(name=values["name"])
+            self.db.add(category)
+        category.description = values["description"]
+
+    def _apply_products(self, values: dict) -> None:
+        category_id = self._category_id(values)
+        product = find_product(self.db, values["store_id"], values["sku"])
+        if product is None:
+            product = Product(sku=values["sku"], store_id=values["store_id"])
+            self.db.add(product)
+        product.name = values["name"]
+        product.category_id = category_id
+        product.price = values["price"]
+        product.shelf_space_meters = values["shelf_space_meters"]
+        product.store_id = values["store_id"]
+
+    def _apply_sales(self, values: dict) -> None:
+        self._sales_db(values["store_id"]).add(
+            Sale(
+                product_id=self._product_id(values),
+                store_id=values["store_id"],
+                date=values["date"],
+                units_sold=values["units_sold"],
+                revenue=values["revenue"],
+                basket_id=values["basket_id"],
+            )
+        )
+
+    def _apply_shelf_space(self, values: dict) -> None:
+        category_id = self._category_id(values)
+        record = (
+            self.db.query(ShelfSpace)
+            .filter(ShelfSpace.store_id == values["store_id"], ShelfSpace.category_id == category_id)
+            .first()
+        )
+        if record is None:
+            record = ShelfSpace(store_id=values["store_id"], category_id=category_id)
+            self.db.add(record)
+        record.current_meters = values["current_meters"]
+
+    def _apply_traffic(self, values: dict) -> None:
+        zone = (
+            self.db.query(TrafficZone)
+            .filter(TrafficZone.store_id == values["store_id"], TrafficZone.zone_name == values["zone_name"])
+            .first()
+        )
+        if zone is None:
+            zone = TrafficZone(store_id=values["store_id"], zone_name=values["zone_name"])
+            self.db.add(zone)
+        zone.x = values["x"]
+        zone.y = values["y"]
+        zone.traffic_score = values["traffic_score"]
+
+    def commit(self) -> None:
+        for sales_db in self._sales_sessions.values():
+            if sales_db is not self.db:
+                sales_db.commit()
+        self.db.commit()
+        if self.on_commit is not None:
+            self.on_commit()
+        if self.gate is not None:
+            self.gate.committed(self.import_type)
+
+    def rollback(self) -> None:
+        for sales_db in self._sales_sessions.values():
+            if sales_db is not self.db:
+                sales_db.rollback()
+        self.db.rollback()
+
+    def close(self) -> None:
+        self._stack.close()
@@ -0,0 +1,129 @@
+import hashlib
+import threading
+from datetime import datetime, timezone
+from email.utils import formatdate, parsedate_to_datetime
+from typing import Any, Callable
+
+from fastapi import Request, Response
+from pydantic import TypeAdapter
+from sqlalchemy import event, func, select
+from sqlalchemy.orm import Session, object_session
+
+from app.core.cache import TTLCache
+from app.core.config import get_settings
+from app.models.category import Category
+from app.models.product import Product
+from app.models.store import Store
+from app.models.traffic_zone import TrafficZone
+
+settings = get_settings()
+
+_models = {model.__tablename__: model for model in (Store, Category, Product, TrafficZone)}
+_versions: dict[str, int] = {}
+_lock = threading.Lock()
+_stamps = TTLCache(len(_models), settings.reference_cache_recheck_seconds)
+_adapters: dict[Any, TypeAdapter] = {}
+
+response_cache = TTLCache(settings.reference_cache_max_entries, settings.reference_cache_ttl_seconds)
+
+
+def table_version(db: Session, table: str) -> tuple[int | None, int, datetime | None]:
+    with _lock:
+        version = _versions.get(table, 0)
+    cached = _stamps.get(table)
+    if cached is None or cached[0] != version:
+        model = _models[table]
+        stamp = db.execute(select(func.max(model.id), func.count(model.id), func.max(model.updated_at))).one()
+        cached = (version, tuple(stamp))
+        _stamps.set(table, cached)
+    return cached[1]
+
+
+def bump_tables(tables: set[str]) -> None:
+    with _lock:
+        for table in tables:
+            _versions[table] = _versions.get(table, 0) + 1
+
+
+def _adapter(schema: Any) -> TypeAdapter:
+    adapter = _adapters.get(schema)
+    if adapter is None:
+        adapter = _adapters[schema] = TypeAdapter(list[schema])
+    return adapter
+
+
+def _not_modified(request: Request, etag: str, last_modified: float) -> bool:
+    if_none_match = request.headers.get("if-none-match")
+    if if_none_match is not None:
+        candidates = {value.strip().removeprefix("W/") for value in if_none_match.split(",")}
+        return etag in candidates or "*" in candidates
+    if_modified_since = request.headers.get("if-modified-since")
+    if if_modified_since:
+        try:
+            since = parsedate_to_datetime(if_modified_since).timestamp()
+        except (TypeError, ValueError):
+            return False
+        return int(last_modified) <= since
+    return False
+
+
+def cached_response(
+    request: Request,
+    db: Session,
+    tables: tuple[str, ...],
+    schema: Any,
+    load: Callable[[], list],
+) -> Response:
+    versions = tuple(table_version(db, table) for table in tables)
+    etag = f'"{hashlib.blake2b(repr(versions).encode(), digest_size=8).hexdigest()}"'
+    modified = [modified_at for _, _, modified_at in versions if modified_at is not None]
+    last_modified = max(modified).replace(tzinfo=timezone.utc).timestamp() if modified else 0.0
+    headers = {
+        "ETag": etag,
+        "Last-Modified": formatdate(last_modified, usegmt=True),
+        "Cache-Control": "no-cache",
+    }
+
+    if _not_modified(request, etag, last_modified):
+        return Response(status_code=304, headers=headers)
+
+    key = (request.url.path, tuple(sorted(request.query_params.multi_items())), etag)
+    body = response_cache.get(key)
+    if body is None:
+        adapter = _adapter(schema)
+        body = adapter.dump_json(adapter.validate_python(load(), from_attributes=True))
+        response_cache.set(key, body)
+    return Response(content=body, media_type="application/json", headers=headers)
+
+
+@event.listens_for(Store, "after_insert")
+@event.listens_for(Store, "after_update")
+@event.listens_for(Store, "after_delete")
+@event.listens_for(Category, "after_insert")
+@event.listens_for(Category, "after_update")
+@event.listens_for(Category, "after_delete")
+@event.listens_for(Product, "after_insert")
+@event.listens_for(Product, "after_update")
+@event.listens_for(Product, "after_delete")
+@event.listens_for(TrafficZone, "after_insert")
+@event.listens_for(TrafficZone, "after_update")
+@event.listens_for(TrafficZone, "after_delete")
+def _queue_table_change(mapper, _connection, target) -> None:
+    table = mapper.local_table.name
+    session = object_session(target)
+    if session is None:
+        bump_tables({table})
+        return
+    session.info.setdefault("reference_tables_pending", set()).add(table)
+
+
+@event.listens_for(Session, "after_commit")
+def _bump_committed_tables(session: Session) -> None:
+    pending = session.info.pop("reference_tables_pending", None)
+    if pending:
+        bump_tables(pending)
+
+
+@event.listens_for(Session, "after_rollback")
+def _discard_pending_tables(session: Session) -> None:
+    session.info.pop("reference_tables_pending", None)
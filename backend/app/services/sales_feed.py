@@ -0,0 +1,77 @@
+from datetime import datetime
+from typing import Callable, NamedTuple
+
+from sqlalchemy import event
+from sqlalchemy.orm import Session, object_session
+
+from app.db.types import Money
+from app.models.sale import Sale
+
+
+class CommittedSale(NamedTuple):
+    store_id: int
+    product_id: int
+    date: datetime
+    units_sold: int
+    revenue_cents: int
+    sale_id: int
+
+
+_subscribers: list[Callable[[list[CommittedSale]], None]] = []
+_untracked_subscribers: list[Callable[[int], None]] = []
+
+
+def subscribe(callback: Callable[[list[CommittedSale]], None]) -> Callable[[list[CommittedSale]], None]:
+    _subscribers.append(callback)
+    return callback
+
+
+def subscribe_untracked(callback: Callable[[int], None]) -> Callable[[int], None]:
+    _untracked_subscribers.append(callback)
+    return callback
+
+
+def publish(sales: list[CommittedSale]) -> None:
+    for callback in _subscribers:
+        callback(sales)
+
+
+def publish_untracked(store_id: int) -> None:
+    for callback in _untracked_subscribers:
+        callback(store_id)
+
+
+@event.listens_for(Sale, "after_insert")
+def _queue_inserted_sale(_mapper, _connection, target: Sale) -> None:
+    session = object_session(target)
+    if session is None:
+        publish_untracked(target.store_id)
+        return
+    session.info.setdefault("sales_feed_pending", []).append(
+        CommittedSale(
+            target.store_id,
+            target.product_id,
+            target.date,
+            target.units_sold,
+            Money.to_units(target.revenue),
+            target.id,
+        )
+    )
+
+
+@event.listens_for(Sale, "after_update")
+@event.listens_for(Sale, "after_delete")
+def _report_changed_sale(_mapper, _connection, target: Sale) -> None:
+    publish_untracked(target.store_id)
+
+
+@event.listens_for(Session, "after_commit")
+def _publish_committed_sales(session: Session) -> None:
+    pending = session.info.pop("sales_feed_pending", None)
+    if pending:
+        publish(pending)
+
+
+@event.listens_for(Session, "after_rollback")
+def _discard_pending_sales(session: Session) -> None:
+    session.info.pop("sales_feed_pending", None)
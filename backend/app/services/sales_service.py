@@ -1,8 +1,29 @@
+import heapq
 from datetime import datetime
 
 from sqlalchemy.orm import Session
 
+from app.db.partitioning import fan_out, sales_session
+from app.db.readonly import ReadRow, read_rows, select_for
 from app.models.sale import Sale
+from app.schemas.sale import SaleRead
+from app.services.archive_service import archived_until, read_archived_sales
+
+
+def _query_sales(
+    db: Session,
+    store_id: int | None,
+    date_start: datetime | None,
+    date_end: datetime | None,
+) -> list[ReadRow]:
+    stmt = select_for(Sale, SaleRead)
+    if store_id is not None:
+        stmt = stmt.where(Sale.store_id == store_id)
+    if date_start is not None:
+        stmt = stmt.where(Sale.date >= date_start)
+    if date_end is not None:
+        stmt = stmt.where(Sale.date <= date_end)
+    return read_rows(db, stmt.order_by(Sale.date.desc()), SaleRead)
 
 
 def list_sales(
@@ -10,15 +31,18 @@ def list_sales(
     store_id: int | None = None,
     date_start: datetime | None = None,
     date_end: datetime | None = None,
-) -> list[Sale]:
-    query = db.query(Sale)
+) -> list[ReadRow]:
     if store_id is not None:
-        query = query.filter(Sale.store_id == store_id)
-    if date_start is not None:
-        query = query.filter(Sale.date >= date_start)
-    if date_end is not None:
-        query = query.filter(Sale.date <= date_end)
-    return query.order_by(Sale.date.desc()).all()
+        with sales_session(db, store_id) as sales_db:
+            partitions = [_query_sales(sales_db, store_id, date_start, date_end)]
+    else:
+        partitions = fan_out(db, lambda sales_db: _query_sales(sales_db, None, date_start, date_end))
+    watermark = archived_until(db)
+    if watermark is not None and (date_start is None or date_start < watermark):
+        partitions.append(read_archived_sales(db, store_id, date_start, date_end))
+    if len(partitions) == 1:
+        return partitions[0]
+    return list(heapq.merge(*partitions, key=lambda sale: sale.date, reverse=True))
 
 
 def create_sale(
@@ -28,6 +52,7 @@ def create_sale(
     date: datetime,
     units_sold: int,
     revenue: float,
+    basket_id: str | None = None,
 ) -> Sale:
     sale = Sale(
         product_id=product_id,
@@ -35,8 +60,10 @@ def create_sale(
         date=date,
         units_sold=units_sold,
         revenue=revenue,
+        basket_id=basket_id,
     )
-    db.add(sale)
-    db.commit()
-    db.refresh(sale)
+    with sales_session(db, store_id) as sales_db:
+        sales_db.add(sale)
+        sales_db.commit()
+        sales_db.refresh(sale)
     return sale
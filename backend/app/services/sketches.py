@@ -0,0 +1,289 @@
+import heapq
+import math
+import operator
+import threading
+from array import array
+from datetime import datetime, timedelta
+from typing import Callable, Iterable
+
+from app.core.config import get_settings
+from app.db.types import Money
+from app.services import sales_feed
+from app.services.sales_feed import CommittedSale
+from app.services.tail_engine import StoreStamp
+
+settings = get_settings()
+
+_MASK64 = (1 << 64) - 1
+
+
+def _mix64(value: int) -> int:
+    value = (value + 0x9E3779B97F4A7C15) & _MASK64
+    value = ((value ^ (value >> 30)) * 0xBF58476D1CE4E5B9) & _MASK64
+    value = ((value ^ (value >> 27)) * 0x94D049BB133111EB) & _MASK64
+    return value ^ (value >> 31)
+
+
+class CountMinSketch:
+    def __init__(self, width: int, depth: int) -> None:
+        self.width = width
+        self.depth = depth
+        self.table = array("q", bytes(8 * width * depth))
+
+    def _cells(self, key: int) -> list[int]:
+        return [row * self.width + _mix64(key ^ (row * 0x5851F42D4C957F2D)) % self.width for row in range(self.depth)]
+
+    def add(self, key: int, amount: int) -> int:
+        table = self.table
+        cells = self._cells(key)
+        for cell in cells:
+            table[cell] += amount
+        return min(table[cell] for cell in cells)
+
+    def estimate(self, key: int) -> int:
+        return min(self.table[cell] for cell in self._cells(key))
+
+    def merge(self, other: "CountMinSketch") -> None:
+        self.table = array("q", map(operator.add, self.table, other.table))
+
+    @property
+    def epsilon(self) -> float:
+        return math.e / self.width
+
+    @property
+    def delta(self) -> float:
+        return math.exp(-self.depth)
+
+
+class HyperLogLog:
+    def __init__(self, precision: int) -> None:
+        self.precision = precision
+        self.registers = bytearray(1 << precision)
+
+    def add(self, key: int) -> None:
+        hashed = _mix64(key)
+        index = hashed >> (64 - self.precision)
+        remainder = (hashed << self.precision) & _MASK64
+        rank = 64 - self.precision + 1 if remainder == 0 else 65 - remainder.bit_length()
+        if rank > self.registers[index]:
+            self.registers[index] = rank
+
+    def merge(self, other: "HyperLogLog") -> None:
+        self.registers = bytearray(map(max, self.registers, other.registers))
+
+    def estimate(self) -> float:
+        m = len(self.registers)
+        alpha = 0.7213 / (1 + 1.079 / m)
+        raw = alpha * m * m / sum(2.0 ** -register for register in self.registers)
+        zeros = self.registers.count(0)
+        if raw <= 2.5 * m and zeros:
+            return m * math.log(m / zeros)
+        return raw
+
+    @property
+    def relative_error(self) -> float:
+        return 1.04 / math.sqrt(len(self.registers))
+
+
+class SalesSketch:
+    def __init__(self) -> None:
+        self.revenue = CountMinSketch(settings.sketch_cms_width, settings.sketch_cms_depth)
+        self.skus = HyperLogLog(settings.sketch_hll_precision)
+        self.total_revenue = 0
+        self.candidates: dict[int, int] = {}
+        self._floor = 0
+
+    def add(self, product_id: int, revenue_cents: int) -> None:
+        self.skus.add(product_id)
+        self.total_revenue += revenue_cents
+        self._track(product_id, self.revenue.add(product_id, revenue_cents))
+
+    def _track(self, product_id: int, estimate: int) -> None:
+        candidates = self.candidates
+        if product_id in candidates or len(candidates) < settings.sketch_heavy_hitters:
+            candidates[product_id] = estimate
+            return
+        if estimate <= self._floor:
+            return
+        smallest = min(candidates, key=candidates.__getitem__)
+        if estimate > candidates[smallest]:
+            del candidates[smallest]
+            candidates[product_id] = estimate
+        self._floor = min(candidates.values())
+
+    @classmethod
+    def merged(cls, sketches: list["SalesSketch"]) -> "SalesSketch":
+        result = cls()
+        for sketch in sketches:
+            result.revenue.merge(sketch.revenue)
+            result.skus.merge(sketch.skus)
+            result.total_revenue += sketch.total_revenue
+        candidate_ids = set().union(*(sketch.candidates for sketch in sketches))
+        estimates = ((result.revenue.estimate(product_id), product_id) for product_id in candidate_ids)
+        top = heapq.nlargest(settings.sketch_heavy_hitters, estimates)
+        result.candidates = {product_id: estimate for estimate, product_id in top}
+        result._floor = top[-1][0] if top else 0
+        return result
+
+
+def _month(value: datetime) -> tuple[int, int]:
+    return value.year, value.month
+
+
+def month_range(date_start: datetime | None, date_end: datetime | None) -> dict:
+    start = date_start.replace(day=1, hour=0, minute=0, second=0, microsecond=0) if date_start is not None else None
+    end = None
+    if date_end is not None:
+        year, month = divmod(date_end.year * 12 + date_end.month, 12)
+        end = datetime(year, month + 1, 1) - timedelta(microseconds=1)
+    return {"date_start": start, "date_end": end}
+
+
+class StoreSketches:
+    def __init__(self) -> None:
+        self.months: dict[tuple[int, int], SalesSketch] = {}
+        self._combined: dict[tuple, SalesSketch] = {}
+        self._lock = threading.Lock()
+
+    def add(self, date: datetime, product_id: int, revenue_cents: int) -> None:
+        with self._lock:
+            self._combined.clear()
+            sketch = self.months.get(_month(date))
+            if sketch is None:
+                sketch = self.months[_month(date)] = SalesSketch()
+            sketch.add(product_id, revenue_cents)
+
+    def combined(self, date_start: datetime | None, date_end: datetime | None) -> SalesSketch:
+        first = _month(date_start) if date_start is not None else None
+        last = _month(date_end) if date_end is not None else None
+        with self._lock:
+            result = self._combined.get((first, last))
+            if result is None:
+                selected = [
+                    sketch
+                    for month, sketch in self.months.items()
+                    if (first is None or month >= first) and (last is None or month <= last)
+                ]
+                result = self._combined[(first, last)] = SalesSketch.merged(selected)
+        return result
+
+
+_stores: dict[int, StoreSketches] = {}
+_versions: dict[int, int] = {}
+_stamps: dict[int, StoreStamp] = {}
+_registry_lock = threading.Lock()
+
+
+def store_sketches(store_id: int, loader: Callable[[], Iterable], stamp: Callable[[], StoreStamp]) -> StoreSketches:
+    current = stamp()
+    with _registry_lock:
+        if _stamps.get(store_id) != current:
+            _stamps[store_id] = current
+            _versions[store_id] = _versions.get(store_id, 0) + 1
+            _stores.pop(store_id, None)
+        sketches = _stores.get(store_id)
+        version = _versions.get(store_id, 0)
+    if sketches is None:
+        sketches = StoreSketches()
+        for row in loader():
+            sketches.add(row.date, row.product_id, Money.to_units(row.revenue))
+        with _registry_lock:
+            if _versions.get(store_id, 0) == version:
+                _stores[store_id] = sketches
+    return sketches
+
+
+@sales_feed.subscribe
+def apply_sales(sales: Iterable[CommittedSale]) -> None:
+    with _registry_lock:
+        for sale in sales:
+            _versions[sale.store_id] = _versions.get(sale.store_id, 0) + 1
+            if sale.store_id in _stamps:
+                _stamps[sale.store_id] = _stamps[sale.store_id].with_sale(sale.sale_id, sale.revenue_cents)
+            sketches = _stores.get(sale.store_id)
+            if sketches is not None:
+                sketches.add(sale.date, sale.product_id, sale.revenue_cents)
+
+
+@sales_feed.subscribe_untracked
+def invalidate_store(store_id: int) -> None:
+    with _registry_lock:
+        _versions[store_id] = _versions.get(store_id, 0) + 1
+        _stores.pop(store_id, None)
+
+
+def approximate_tail(sketch: SalesSketch) -> dict:
+    total_revenue = sketch.total_revenue
+    distinct_skus = round(sketch.skus.estimate())
+    error_bounds = {
+        "revenue_per_sku_abs": round(Money.from_units(sketch.revenue.epsilon * total_revenue), 6),
+        "sales_share_abs": 0.0,
+        "total_skus_rel": round(sketch.skus.relative_error, 6),
+        "confidence": round(1 - sketch.revenue.delta, 6),
+    }
+    if total_revenue <= 0 or distinct_skus == 0:
+        return {
+            "summary": {"total_skus": 0, "core_pct": 0, "average_pct": 0, "tail_pct": 0, "tail_sales_share": 0},
+            "table": [],
+            "chart": {"core_sales_share": 0, "average_sales_share": 0, "tail_sales_share": 0},
+            "error_bounds": error_bounds,
+        }
+
+    estimates = sorted(
+        (min(sketch.revenue.estimate(product_id), total_revenue) for product_id in sketch.candidates),
+        reverse=True,
+    )
+    cumulative = 0.0
+    core_count = average_count = 0
+    core_revenue = average_revenue = 0.0
+    for revenue in estimates:
+        cumulative += revenue / total_revenue
+        if cumulative <= 0.7:
+            core_count += 1
+            core_revenue += revenue
+        elif cumulative <= 0.9:
+            average_count += 1
+            average_revenue += revenue
+        else:
+            break
+
+    distinct_skus = max(distinct_skus, len(estimates))
+    extrapolated = 0
+    if cumulative <= 0.9 and distinct_skus > len(estimates):
+        untracked_skus = distinct_skus - len(estimates)
+        per_sku = max(total_revenue - core_revenue - average_revenue, 0.0) / untracked_skus
+        if per_sku > 0:
+            if cumulative < 0.7:
+                extra = min(untracked_skus, int((0.7 - cumulative) * total_revenue / per_sku))
+                core_count += extra
+                core_revenue += extra * per_sku
+                cumulative += extra * per_sku / total_revenue
+                untracked_skus -= extra
+                extrapolated += extra
+            extra = min(untracked_skus, int((0.9 - cumulative) * total_revenue / per_sku))
+            average_count += extra
+            average_revenue += extra * per_sku
+            extrapolated += extra
+
+    tail_count = distinct_skus - core_count - average_count
+    tail_revenue = max(total_revenue - core_revenue - average_revenue, 0.0)
+    share_error = (core_count + average_count - extrapolated) * sketch.revenue.epsilon
+    error_bounds["sales_share_abs"] = round(min(share_error, 1.0), 6)
+    error_bounds["extrapolated_skus"] = extrapolated
+
+    return {
+        "summary": {
+            "total_skus": distinct_skus,
+            "core_pct": round(core_count / distinct_skus, 6),
+            "average_pct": round(average_count / distinct_skus, 6),
+            "tail_pct": round(tail_count / distinct_skus, 6),
+            "tail_sales_share": round(tail_revenue / total_revenue, 6),
+        },
+        "table": [],
+        "chart": {
+            "core_sales_share": round(core_revenue / total_revenue, 6),
+            "average_sales_share": round(average_revenue / total_revenue, 6),
+            "tail_sales_share": round(tail_revenue / total_revenue, 6),
+        },
+        "error_bounds": error_bounds,
+    }
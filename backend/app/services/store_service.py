@@ -1,10 +1,12 @@
 from sqlalchemy.orm import Session
 
+from app.db.readonly import ReadRow, read_rows, select_for
 from app.models.store import Store
+from app.schemas.store import StoreRead
 
 
-def list_stores(db: Session) -> list[Store]:
-    return db.query(Store).order_by(Store.name.asc()).all()
+def list_stores(db: Session) -> list[ReadRow]:
+    return read_rows(db, select_for(Store, StoreRead).order_by(Store.name.asc()), StoreRead)
 
 
 def create_store(
@@ -0,0 +1,223 @@
+import random
+import threading
+from typing import Callable, Iterable, Iterator, NamedTuple
+
+from sqlalchemy import event
+
+from app.db.types import Money
+from app.models.category import Category
+from app.models.product import Product
+from app.services import sales_feed
+from app.services.sales_feed import CommittedSale
+
+
+class TailRow:
+    __slots__ = ("product_id", "sku", "name", "category", "category_id", "revenue")
+
+    def __init__(
+        self,
+        product_id: int,
+        sku: str,
+        name: str,
+        category: str,
+        category_id: int,
+        revenue: int,
+    ) -> None:
+        self.product_id = product_id
+        self.sku = sku
+        self.name = name
+        self.category = category
+        self.category_id = category_id
+        self.revenue = revenue
+
+
+class StoreStamp(NamedTuple):
+    max_sale_id: int
+    sale_count: int
+    revenue: int
+    catalog: tuple
+
+    def with_sale(self, sale_id: int, revenue_cents: int) -> "StoreStamp":
+        return self._replace(
+            max_sale_id=max(self.max_sale_id, sale_id),
+            sale_count=self.sale_count + 1,
+            revenue=self.revenue + revenue_cents,
+        )
+
+
+def revenue_rank_key(row) -> tuple[float, int]:
+    return (-(row.revenue or 0), row.product_id)
+
+
+class _Node:
+    __slots__ = ("key", "priority", "left", "right")
+
+    def __init__(self, key: tuple[int, int]) -> None:
+        self.key = key
+        self.priority = random.random()
+        self.left: _Node | None = None
+        self.right: _Node | None = None
+
+
+class RevenueTreap:
+    def __init__(self) -> None:
+        self._root: _Node | None = None
+        self._size = 0
+
+    def __len__(self) -> int:
+        return self._size
+
+    def _split(self, node: _Node | None, key: tuple[int, int]) -> tuple[_Node | None, _Node | None]:
+        if node is None:
+            return None, None
+        if node.key < key:
+            left, right = self._split(node.right, key)
+            node.right = left
+            return node, right
+        left, right = self._split(node.left, key)
+        node.left = right
+        return left, node
+
+    def _merge(self, left: _Node | None, right: _Node | None) -> _Node | None:
+        if left is None:
+            return right
+        if right is None:
+            return left
+        if left.priority > right.priority:
+            left.right = self._merge(left.right, right)
+            return left
+        right.left = self._merge(left, right.left)
+        return right
+
+    def insert(self, key: tuple[int, int]) -> None:
+        left, right = self._split(self._root, key)
+        self._root = self._merge(self._merge(left, _Node(key)), right)
+        self._size += 1
+
+    def remove(self, key: tuple[int, int]) -> None:
+        parent: _Node | None = None
+        node = self._root
+        while node is not None and node.key != key:
+            parent = node
+            node = node.left if key < node.key else node.right
+        if node is None:
+            raise KeyError(key)
+        merged = self._merge(node.left, node.right)
+        if parent is None:
+            self._root = merged
+        elif parent.left is node:
+            parent.left = merged
+        else:
+            parent.right = merged
+        self._size -= 1
+
+    def __iter__(self) -> Iterator[tuple[int, int]]:
+        stack: list[_Node] = []
+        node = self._root
+        while stack or node is not None:
+            while node is not None:
+                stack.append(node)
+                node = node.left
+            node = stack.pop()
+            yield node.key
+            node = node.right
+
+
+class StoreTailIndex:
+    def __init__(self, rows: Iterable) -> None:
+        self._rows: dict[int, TailRow] = {}
+        self._order = RevenueTreap()
+        self._lock = threading.Lock()
+        for row in rows:
+            tail_row = TailRow(
+                row.product_id,
+                row.sku,
+                row.name,
+                row.category,
+                row.category_id,
+                Money.to_units(row.revenue or 0),
+            )
+            self._rows[tail_row.product_id] = tail_row
+            self._order.insert(revenue_rank_key(tail_row))
+
+    def add_revenue(self, product_id: int, amount: int) -> bool:
+        with self._lock:
+            row = self._rows.get(product_id)
+            if row is None:
+                return False
+            self._order.remove(revenue_rank_key(row))
+            row.revenue += amount
+            self._order.insert(revenue_rank_key(row))
+            return True
+
+    def ranked(self, category_id: int | None = None) -> list[TailRow]:
+        with self._lock:
+            rows = [self._rows[product_id] for _, product_id in self._order]
+        if category_id is not None:
+            rows = [row for row in rows if row.category_id == category_id]
+        return rows
+
+
+_indexes: dict[int, StoreTailIndex] = {}
+_versions: dict[int, int] = {}
+_stamps: dict[int, StoreStamp] = {}
+_registry_lock = threading.Lock()
+
+
+def _sync_store(store_id: int, stamp: StoreStamp) -> None:
+    if _stamps.get(store_id) == stamp:
+        return
+    _stamps[store_id] = stamp
+    _versions[store_id] = _versions.get(store_id, 0) + 1
+    _indexes.pop(store_id, None)
+
+
+def ranked_rows(
+    store_id: int,
+    category_id: int | None,
+    loader: Callable[[], Iterable],
+    stamp: Callable[[], StoreStamp],
+) -> list[TailRow]:
+    current = stamp()
+    with _registry_lock:
+        _sync_store(store_id, current)
+        index = _indexes.get(store_id)
+        version = _versions.get(store_id, 0)
+    if index is None:
+        index = StoreTailIndex(loader())
+        with _registry_lock:
+            if _versions.get(store_id, 0) == version:
+                _indexes[store_id] = index
+    return index.ranked(category_id)
+
+
+@sales_feed.subscribe
+def apply_sales(sales: Iterable[CommittedSale]) -> None:
+    with _registry_lock:
+        for sale in sales:
+            _versions[sale.store_id] = _versions.get(sale.store_id, 0) + 1
+            if sale.store_id in _stamps:
+                _stamps[sale.store_id] = _stamps[sale.store_id].with_sale(sale.sale_id, sale.revenue_cents)
+            index = _indexes.get(sale.store_id)
+            if index is not None and not index.add_revenue(sale.product_id, sale.revenue_cents):
+                del _indexes[sale.store_id]
+
+
+@sales_feed.subscribe_untracked
+def invalidate_store(store_id: int | None = None) -> None:
+    with _registry_lock:
+        if store_id is None:
+            for key in list(_versions):
+                _versions[key] += 1
+            _indexes.clear()
+            return
+        _versions[store_id] = _versions.get(store_id, 0) + 1
+        _indexes.pop(store_id, None)
+
+
+@event.listens_for(Product, "after_update")
+@event.listens_for(Product, "after_delete")
+@event.listens_for(Category, "after_update")
+@event.listens_for(Category, "after_delete")
+def _invalidate_catalog(_mapper, _connection, _target) -> None:
+    invalidate_store()
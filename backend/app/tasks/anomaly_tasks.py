@@ -0,0 +1,31 @@
+import logging
+
+from app.core.logging import configure_logging
+from app.db.session import SessionLocal
+from app.services.anomaly_service import detect_anomalies
+
+logger = logging.getLogger(__name__)
+
+
+def run_anomaly_detection(
+    store_id: int | None = None,
+    window: int | None = None,
+    threshold: float | None = None,
+    method: str | None = None,
+) -> dict[int, int]:
+    db = SessionLocal()
+    try:
+        counts = detect_anomalies(db, store_id=store_id, window=window, threshold=threshold, method=method)
+    except Exception:
+        db.rollback()
+        logger.exception("Anomaly detection failed for store %s", store_id)
+        return {}
+    finally:
+        db.close()
+    logger.info("Anomaly detection flagged %s", counts)
+    return counts
+
+
+if __name__ == "__main__":
+    configure_logging()
+    run_anomaly_detection()
@@ -0,0 +1,27 @@
+import logging
+from datetime import datetime
+
+from app.core.logging import configure_logging
+from app.db.session import SessionLocal
+from app.services.archive_service import archive_sales
+
+logger = logging.getLogger(__name__)
+
+
+def run_sales_archive(cutoff: datetime | None = None) -> dict[int, int]:
+    db = SessionLocal()
+    try:
+        archived = archive_sales(db, cutoff=cutoff)
+    except Exception:
+        db.rollback()
+        logger.exception("Sales archival failed for cutoff %s", cutoff)
+        return {}
+    finally:
+        db.close()
+    logger.info("Sales archival moved %s", archived)
+    return archived
+
+
+if __name__ == "__main__":
+    configure_logging()
+    run_sales_archive()
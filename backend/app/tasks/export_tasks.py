@@ -0,0 +1,59 @@
+import logging
+import os
+
+from app.db.session import SessionLocal
+from app.models.export_job import ExportJob
+from app.services.export_service import export_path, load_params, stream_export, sweep_export_files
+from app.services.import_events import ProgressReporter, export_broker
+
+logger = logging.getLogger(__name__)
+
+CHUNK_SIZE = 5000
+
+
+def process_export_job(job_id: int) -> None:
+    db = SessionLocal()
+    try:
+        job = db.get(ExportJob, job_id)
+        if job is None or job.status != "queued":
+            return
+        job.status = "processing"
+        job.file_path = export_path(job)
+        db.commit()
+        progress = ProgressReporter(job_id, export_broker)
+        progress.update("processing", 0, 0, force=True)
+
+        processed = 0
+
+        def on_row() -> None:
+            nonlocal processed
+            processed += 1
+            if processed % CHUNK_SIZE == 0:
+                progress.update("processing", processed, 0)
+
+        try:
+            chunks = stream_export(db, job.type, job.format, job.compression, load_params(job.params), on_row)
+            with open(job.file_path, "wb") as stream:
+                for chunk in chunks:
+                    stream.write(chunk)
+        except Exception as exc:
+            logger.exception("Export %s failed", job_id)
+            db.rollback()
+            if os.path.exists(job.file_path):
+                os.remove(job.file_path)
+            job.status = "failed"
+            job.file_path = None
+            job.processed_rows = processed
+            job.error = str(exc)[:500]
+            db.commit()
+            progress.update("failed", processed, 1, force=True)
+            return
+
+        job.status = "completed"
+        job.processed_rows = processed
+        job.size_bytes = os.path.getsize(job.file_path)
+        db.commit()
+        progress.update("completed", processed, 0, force=True)
+        sweep_export_files(db)
+    finally:
+        db.close()
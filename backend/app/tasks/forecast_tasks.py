@@ -0,0 +1,68 @@
+import logging
+import multiprocessing
+from concurrent.futures import ProcessPoolExecutor
+
+from sqlalchemy import select
+
+from app.core.config import get_settings
+from app.core.logging import configure_logging
+from app.db.session import SessionLocal
+from app.models.store import Store
+from app.services.forecast_service import forecast_store
+
+logger = logging.getLogger(__name__)
+
+settings = get_settings()
+
+
+def _forecast_store_job(store_id: int, horizon: int | None, method: str | None) -> int:
+    db = SessionLocal()
+    try:
+        return forecast_store(db, store_id, horizon=horizon, method=method)
+    except Exception:
+        db.rollback()
+        raise
+    finally:
+        db.close()
+
+
+def run_forecasts(
+    store_id: int | None = None,
+    horizon: int | None = None,
+    method: str | None = None,
+) -> dict[int, int]:
+    if store_id is not None:
+        store_ids = [store_id]
+    else:
+        db = SessionLocal()
+        try:
+            store_ids = db.execute(select(Store.id).order_by(Store.id)).scalars().all()
+        finally:
+            db.close()
+
+    counts: dict[int, int] = {}
+    workers = min(settings.forecast_workers, len(store_ids))
+    if workers <= 1:
+        for current in store_ids:
+            try:
+                counts[current] = _forecast_store_job(current, horizon, method)
+            except Exception:
+                logger.exception("Forecasting failed for store %s", current)
+    else:
+        with ProcessPoolExecutor(max_workers=workers, mp_context=multiprocessing.get_context("spawn")) as executor:
+            futures = {
+                current: executor.submit(_forecast_store_job, current, horizon, method) for current in store_ids
+            }
+            for current, future in futures.items():
+                try:
+                    counts[current] = future.result()
+                except Exception:
+                    logger.exception("Forecasting failed for store %s", current)
+
+    logger.info("Forecasts written %s", counts)
+    return counts
+
+
+if __name__ == "__main__":
+    configure_logging()
+    run_forecasts()
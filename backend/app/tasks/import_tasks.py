@@ -1,2 +1,177 @@
-def process_import_job(*_args, **_kwargs):
-    raise NotImplementedError("Import task not implemented")
+import csv
+import logging
+from concurrent.futures import ThreadPoolExecutor
+from functools import partial
+from typing import BinaryIO
+
+from sqlalchemy.orm import Session
+
+from app.core.config import get_settings
+from app.db.session import SessionLocal
+from app.models.import_job import ImportJob
+from app.services.import_events import ProgressReporter
+from app.services.import_service import (
+    ImportGate,
+    RowApplier,
+    discard_row_hashes,
+    open_import_file,
+    previous_imports,
+    previous_row_hashes,
+    row_hash,
+    row_hashes_path,
+    sweep_import_files,
+)
+from app.utils.csv_parser import parse_csv
+from app.utils.validators import validate_row
+
+logger = logging.getLogger(__name__)
+
+settings = get_settings()
+
+CHUNK_SIZE = 500
+
+
+def _write_error_report(job: ImportJob, errors: list[tuple[int, str]]) -> str | None:
+    if not errors:
+        return None
+    path = f"{job.file_path.removesuffix('.gz')}.errors.csv"
+    with open(path, "w", newline="", encoding="utf-8") as stream:
+        writer = csv.writer(stream)
+        writer.writerow(["line", "error"])
+        writer.writerows(errors)
+    return path
+
+
+def _flush_hashes(hashes: BinaryIO, pending: list[bytes]) -> None:
+    hashes.write(b"".join(pending))
+    hashes.flush()
+    pending.clear()
+
+
+def process_import_job(job_id: int, gate: ImportGate | None = None, import_type: str | None = None) -> None:
+    db = SessionLocal()
+    try:
+        job = db.get(ImportJob, job_id)
+        if job is None or job.status != "queued":
+            return
+        job.status = "processing"
+        db.commit()
+        progress = ProgressReporter(job_id)
+        progress.update("processing", 0, 0, force=True)
+
+        previous_jobs = previous_imports(db, job)
+        previous = previous_row_hashes(previous_jobs)
+        applier = RowApplier(db, job.type, gate=gate)
+        errors: list[tuple[int, str]] = []
+        total = processed = unchanged = 0
+        pending: list[bytes] = []
+
+        try:
+            with open_import_file(job.file_path) as stream, open(row_hashes_path(job), "wb") as hashes:
+                applier.on_commit = partial(_flush_hashes, hashes, pending)
+                for line, row in enumerate(parse_csv(stream), start=2):
+                    total += 1
+                    digest = row_hash(row)
+                    if digest in previous:
+                        pending.append(digest)
+                        unchanged += 1
+                        continue
+                    try:
+                        applier.apply(validate_row(job.type, row))
+                    except ValueError as exc:
+                        errors.append((line, str(exc)))
+                        continue
+                    pending.append(digest)
+                    processed += 1
+                    if processed % CHUNK_SIZE == 0:
+                        job.processed_rows = processed
+                        job.error_count = len(errors)
+                        applier.commit()
+                        progress.update("processing", processed, len(errors))
+                applier.commit()
+        except Exception:
+            logger.exception("Import %s failed", job_id)
+            applier.rollback()
+            job.status = "failed"
+            job.error_count = len(errors)
+            db.commit()
+            progress.update("failed", processed, len(errors), force=True)
+            return
+        finally:
+            applier.close()
+
+        job.status = "completed"
+        job.total_rows = total
+        job.processed_rows = processed
+        job.unchanged_rows = unchanged
+        job.error_count = len(errors)
+        job.error_report_path = _write_error_report(job, errors)
+        for previous_job in previous_jobs:
+            discard_row_hashes(previous_job)
+        db.commit()
+        progress.update("completed", processed, len(errors), force=True)
+        try:
+            sweep_import_files(db)
+        except Exception:
+            db.rollback()
+            logger.exception("Sweeping import files after %s failed", job_id)
+    finally:
+        if gate is not None and import_type is not None:
+            gate.finished(import_type)
+        db.close()
+
+
+def _run_bundle_child(job_id: int, gate: ImportGate, import_type: str) -> Exception | None:
+    try:
+        process_import_job(job_id, gate=gate, import_type=import_type)
+    except Exception as exc:
+        logger.exception("Bundle import %s failed", job_id)
+        return exc
+    return None
+
+
+def _fail_orphaned_children(db: Session, bundle_id: int) -> None:
+    for child in db.query(ImportJob).filter(
+        ImportJob.parent_id == bundle_id, ImportJob.status.in_(("queued", "processing"))
+    ):
+        child.status = "failed"
+
+
+def process_import_bundle(bundle_id: int, job_ids: list[int]) -> None:
+    db = SessionLocal()
+    bundle = None
+    try:
+        bundle = db.get(ImportJob, bundle_id)
+        bundle.status = "processing"
+        db.commit()
+
+        job_types = dict(db.query(ImportJob.id, ImportJob.type).filter(ImportJob.id.in_(job_ids)).all())
+        gate = ImportGate([job_types[job_id] for job_id in job_ids])
+        workers = max(1, min(len(job_ids), settings.import_bundle_workers))
+        with ThreadPoolExecutor(max_workers=workers, thread_name_prefix="import-bundle") as pool:
+            failures = [
+                failure
+                for failure in pool.map(lambda job_id: _run_bundle_child(job_id, gate, job_types[job_id]), job_ids)
+                if failure is not None
+            ]
+
+        db.expire_all()
+        if failures:
+            _fail_orphaned_children(db, bundle_id)
+        children = db.query(ImportJob).filter(ImportJob.parent_id == bundle_id).all()
+        succeeded = not failures and all(child.status == "completed" for child in children)
+        bundle.status = "completed" if succeeded else "failed"
+        bundle.total_rows = sum(child.total_rows or 0 for child in children)
+        bundle.processed_rows = sum(child.processed_rows or 0 for child in children)
+        bundle.unchanged_rows = sum(child.unchanged_rows or 0 for child in children)
+        bundle.error_count = sum(child.error_count or 0 for child in children)
+        db.commit()
+    except Exception:
+        logger.exception("Import bundle %s failed", bundle_id)
+        db.rollback()
+        if bundle is not None:
+            _fail_orphaned_children(db, bundle_id)
+            bundle.status = "failed"
+            db.commit()
+    finally:
+        db.close()
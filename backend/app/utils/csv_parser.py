@@ -1,2 +1,15 @@
-def parse_csv(*_args, **_kwargs):
-    raise NotImplementedError("CSV parser not implemented")
+import csv
+from typing import Iterator, TextIO
+
+
+def parse_csv(stream: TextIO) -> Iterator[dict[str, str]]:
+    header: list[str] | None = None
+    for record in csv.reader(stream):
+        if len(record) == 1 and "," in record[0]:
+            record = next(csv.reader([record[0]]))
+        if not any(field.strip() for field in record):
+            continue
+        if header is None:
+            header = [field.strip().lower().replace(" ", "_") for field in record]
+            continue
+        yield dict(zip(header, (field.strip() for field in record)))
@@ -1,2 +1,127 @@
-def validate_import_rows(*_args, **_kwargs):
-    raise NotImplementedError("Validation not implemented")
+from datetime import datetime
+from typing import Iterable, Iterator
+
+IMPORT_TYPE_ALIASES = {
+    "store": "stores",
+    "stores": "stores",
+    "category": "categories",
+    "categories": "categories",
+    "product": "products",
+    "products": "products",
+    "sale": "sales",
+    "sales": "sales",
+    "shelf_space": "shelf_space",
+    "shelf-space": "shelf_space",
+    "shelfspace": "shelf_space",
+    "traffic": "traffic",
+    "traffic_zones": "traffic",
+    "traffic-zones": "traffic",
+}
+
+
+def normalize_import_type(import_type: str) -> str:
+    normalized = IMPORT_TYPE_ALIASES.get(import_type.strip().lower())
+    if normalized is None:
+        raise ValueError(f"Unsupported import type: {import_type}")
+    return normalized
+
+
+def _text(row: dict, field: str, required: bool = True) -> str | None:
+    value = row.get(field) or None
+    if value is None and required:
+        raise ValueError(f"Missing {field}")
+    return value
+
+
+def _int(row: dict, field: str, required: bool = True) -> int | None:
+    value = _text(row, field, required)
+    if value is None:
+        return None
+    try:
+        return int(float(value))
+    except ValueError as exc:
+        raise ValueError(f"Invalid {field}: {value}") from exc
+
+
+def _float(row: dict, field: str, required: bool = True) -> float | None:
+    value = _text(row, field, required)
+    if value is None:
+        return None
+    try:
+        return float(value)
+    except ValueError as exc:
+        raise ValueError(f"Invalid {field}: {value}") from exc
+
+
+def _date(row: dict, field: str) -> datetime:
+    value = _text(row, field)
+    try:
+        return datetime.fromisoformat(value)
+    except ValueError as exc:
+        raise ValueError(f"Invalid {field}: {value}") from exc
+
+
+def _one_of(row: dict, id_field: str, name_field: str) -> None:
+    if not row.get(id_field) and not row.get(name_field):
+        raise ValueError(f"Missing {id_field} or {name_field}")
+
+
+def validate_row(import_type: str, row: dict) -> dict:
+    if import_type == "stores":
+        return {
+            "id": _int(row, "id", required=False),
+            "name": _text(row, "name"),
+            "address": _text(row, "address", required=False),
+            "city": _text(row, "city", required=False),
+            "state": _text(row, "state", required=False),
+            "country": _text(row, "country", required=False),
+        }
+    if import_type == "categories":
+        return {"name": _text(row, "name"), "description": _text(row, "description", required=False)}
+    if import_type == "products":
+        _one_of(row, "category_id", "category")
+        return {
+            "sku": _text(row, "sku"),
+            "name": _text(row, "name"),
+            "category_id": _int(row, "category_id", required=False),
+            "category": _text(row, "category", required=False),
+            "price": _float(row, "price", required=False),
+            "shelf_space_meters": _float(row, "shelf_space_meters", required=False),
+            "store_id": _int(row, "store_id"),
+        }
+    if import_type == "sales":
+        _one_of(row, "product_id", "sku")
+        return {
+            "product_id": _int(row, "product_id", required=False),
+            "sku": _text(row, "sku", required=False),
+            "store_id": _int(row, "store_id"),
+            "date": _date(row, "date"),
+            "units_sold": _int(row, "units_sold"),
+            "revenue": _float(row, "revenue"),
+            "basket_id": _text(row, "basket_id", required=False),
+        }
+    if import_type == "shelf_space":
+        _one_of(row, "category_id", "category")
+        return {
+            "store_id": _int(row, "store_id"),
+            "category_id": _int(row, "category_id", required=False),
+            "category": _text(row, "category", required=False),
+            "current_meters": _float(row, "current_meters"),
+        }
+    if import_type == "traffic":
+        return {
+            "store_id": _int(row, "store_id"),
+            "zone_name": _text(row, "zone_name"),
+            "x": _int(row, "x"),
+            "y": _int(row, "y"),
+            "traffic_score": _float(row, "traffic_score"),
+        }
+    raise ValueError(f"Unsupported import type: {import_type}")
+
+
+def validate_import_rows(import_type: str, rows: Iterable[dict]) -> Iterator[tuple[dict | None, str | None]]:
+    for row in rows:
+        try:
+            yield validate_row(import_type, row), None
+        except ValueError as exc:
+            yield None, str(exc)
@@ -0,0 +1,52 @@
+import time
+
+from sqlalchemy import create_engine
+from sqlalchemy.orm import sessionmaker
+from sqlalchemy.pool import StaticPool
+
+from app import models  # noqa: F401
+from app.core.security import create_access_token, decode_token
+from app.db.base import Base
+from app.models.user import User
+from app.services.auth_service import resolve_token, token_cache
+
+ITERATIONS = 5000
+
+
+def uncached_lookup(db, token: str) -> User | None:
+    payload = decode_token(token)
+    return db.query(User).filter(User.id == int(payload["sub"])).first()
+
+
+def cached_lookup(db, token: str):
+    return resolve_token(db, token)[1]
+
+
+def measure(label: str, lookup, db, token: str) -> float:
+    started = time.perf_counter()
+    for _ in range(ITERATIONS):
+        lookup(db, token)
+    per_call_us = (time.perf_counter() - started) / ITERATIONS * 1_000_000
+    print(f"{label:<10} {per_call_us:10.1f} us/request")
+    return per_call_us
+
+
+def main() -> None:
+    engine = create_engine(
+        "sqlite://", connect_args={"check_same_thread": False}, poolclass=StaticPool, future=True
+    )
+    Base.metadata.create_all(bind=engine)
+    session = sessionmaker(bind=engine, future=True)()
+    user = User(email="bench@example.com", password_hash="x", role="analyst", is_active=True)
+    session.add(user)
+    session.commit()
+    token = create_access_token(str(user.id))
+
+    token_cache.clear()
+    before = measure("uncached", uncached_lookup, session, token)
+    after = measure("cached", cached_lookup, session, token)
+    print(f"speedup    {before / after:10.1f}x")
+
+
+if __name__ == "__main__":
+    main()
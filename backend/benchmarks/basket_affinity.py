@@ -0,0 +1,31 @@
+import time
+
+import numpy as np
+
+from app.services.affinity_service import basket_stats
+
+BASKETS = 2_000_000
+PRODUCTS = 20_000
+MEAN_BASKET_SIZE = 4
+
+
+def synthetic_baskets(seed: int = 3) -> tuple[np.ndarray, np.ndarray]:
+    rng = np.random.default_rng(seed)
+    sizes = rng.poisson(MEAN_BASKET_SIZE - 1, size=BASKETS) + 1
+    basket_ids = np.array([f"POS-{index:08d}" for index in range(BASKETS)], dtype=object)
+    basket_keys = np.repeat(basket_ids, sizes)
+    item_keys = np.minimum(rng.zipf(1.3, size=len(basket_keys)), PRODUCTS)
+    return basket_keys, item_keys
+
+
+def main() -> None:
+    basket_keys, item_keys = synthetic_baskets()
+    print(f"{BASKETS:,} baskets, {len(basket_keys):,} lines")
+    started = time.perf_counter()
+    stats = basket_stats(basket_keys, item_keys)
+    elapsed = time.perf_counter() - started
+    print(f"co-occurrence {elapsed:8.2f} s  {len(stats.items):,} items  {stats.co_occurrence.nnz:,} non-zero pairs")
+
+
+if __name__ == "__main__":
+    main()
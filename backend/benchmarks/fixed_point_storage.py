@@ -0,0 +1,105 @@
+import random
+import time
+from datetime import datetime, timedelta
+
+from sqlalchemy import Column, DateTime, Float, Integer, MetaData, Table, create_engine, func, insert, select
+from sqlalchemy.pool import StaticPool
+
+from app.models.sale import Sale
+
+ROWS = 1_000_000
+PRODUCTS = 5_000
+BATCH = 100_000
+ROUNDS = 3
+
+legacy_metadata = MetaData()
+legacy_sales = Table(
+    "legacy_sales",
+    legacy_metadata,
+    Column("id", Integer, primary_key=True),
+    Column("product_id", Integer, nullable=False),
+    Column("store_id", Integer, nullable=False),
+    Column("date", DateTime, nullable=False),
+    Column("units_sold", Integer, nullable=False),
+    Column("revenue", Float, nullable=False),
+)
+fixed_metadata = MetaData()
+fixed_sales = Table(
+    "sales",
+    fixed_metadata,
+    Column("id", Integer, primary_key=True),
+    Column("product_id", Integer, nullable=False),
+    Column("store_id", Integer, nullable=False),
+    Column("date", DateTime, nullable=False),
+    Column("units_sold", Integer, nullable=False),
+    Column("revenue", Sale.revenue.type, nullable=False),
+)
+
+
+def rows(seed: int = 7):
+    rng = random.Random(seed)
+    for index in range(ROWS):
+        units = rng.randint(1, 6)
+        yield {
+            "product_id": rng.randint(1, PRODUCTS),
+            "store_id": 1,
+            "date": datetime(2025, 1, 1) + timedelta(seconds=index * 30),
+            "units_sold": units,
+            "revenue": round(units * rng.uniform(0.1, 30), 2),
+        }
+
+
+def table_bytes(connection, name: str) -> int:
+    return connection.exec_driver_sql("SELECT sum(pgsize) FROM dbstat WHERE name = ?", (name,)).scalar()
+
+
+def best_of(call) -> tuple[float, object]:
+    best, result = float("inf"), None
+    for _ in range(ROUNDS):
+        started = time.perf_counter()
+        result = call()
+        best = min(best, time.perf_counter() - started)
+    return best, result
+
+
+def main() -> None:
+    engine = create_engine("sqlite://", connect_args={"check_same_thread": False}, poolclass=StaticPool, future=True)
+    legacy_metadata.create_all(engine)
+    fixed_metadata.create_all(engine)
+    with engine.begin() as connection:
+        connection.exec_driver_sql("CREATE VIRTUAL TABLE temp.dbstat USING dbstat(main)")
+        batch = []
+        for row in rows():
+            batch.append(row)
+            if len(batch) == BATCH:
+                connection.execute(insert(legacy_sales), batch)
+                connection.execute(insert(fixed_sales), batch)
+                batch = []
+
+    print(f"{ROWS:,} sales rows, best of {ROUNDS}")
+    with engine.connect() as connection:
+        legacy_size = table_bytes(connection, "legacy_sales")
+        fixed_size = table_bytes(connection, "sales")
+        print(f"{'table size':<18} float {legacy_size / 2**20:8.1f} MiB  fixed {fixed_size / 2**20:8.1f} MiB")
+
+        def by_product(table):
+            stmt = select(table.c.product_id, func.sum(table.c.revenue)).group_by(table.c.product_id)
+            return lambda: connection.execute(stmt).all()
+
+        legacy_seconds, legacy_groups = best_of(by_product(legacy_sales))
+        fixed_seconds, fixed_groups = best_of(by_product(fixed_sales))
+        print(f"{'sum by product':<18} float {legacy_seconds * 1000:8.1f} ms  fixed {fixed_seconds * 1000:8.1f} ms")
+
+        legacy_total = connection.execute(select(func.sum(legacy_sales.c.revenue))).scalar()
+        fixed_total = connection.execute(select(func.sum(fixed_sales.c.revenue))).scalar()
+        descending = select(legacy_sales.c.revenue).order_by(legacy_sales.c.revenue.desc()).subquery()
+        reordered = connection.execute(select(func.sum(descending.c.revenue))).scalar()
+        print(f"{'grand total':<18} float {legacy_total!r} (reordered {reordered!r})  fixed {fixed_total!r}")
+        drifted = sum(
+            1 for (_, legacy), (_, fixed) in zip(sorted(legacy_groups), sorted(fixed_groups)) if legacy != fixed
+        )
+        print(f"{'per-product totals':<18} {drifted:,} of {len(fixed_groups):,} float sums differ from exact cents")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,31 @@
+import time
+
+import numpy as np
+
+from app.services.forecast_service import BLOCK_ROWS, FORECAST_METHODS, forecast_units
+
+PRODUCTS = 100_000
+DAYS = 182
+HORIZON = 28
+SEASON = 7
+
+
+def synthetic_units(seed: int = 11) -> np.ndarray:
+    rng = np.random.default_rng(seed)
+    level = rng.gamma(1.5, 4.0, size=(PRODUCTS, 1))
+    weekly = 1 + 0.3 * np.sin(2 * np.pi * np.arange(DAYS) / SEASON)
+    return rng.poisson(level * weekly).astype(np.float64)
+
+
+def main() -> None:
+    units = synthetic_units()
+    print(f"{PRODUCTS:,} SKUs x {DAYS} days, horizon {HORIZON}")
+    for method in FORECAST_METHODS:
+        started = time.process_time()
+        for start in range(0, PRODUCTS, BLOCK_ROWS):
+            forecast_units(units[start:start + BLOCK_ROWS], HORIZON, method, SEASON)
+        print(f"{method:<15} {time.process_time() - started:8.2f} CPU-s")
+
+
+if __name__ == "__main__":
+    main()
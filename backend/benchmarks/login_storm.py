@@ -0,0 +1,95 @@
+import asyncio
+import os
+import statistics
+import tempfile
+import time
+from datetime import datetime
+
+os.environ.setdefault("DATABASE_URL", f"sqlite:///{tempfile.mkdtemp()}/login_storm.db")
+os.environ.setdefault("ADMISSION_ENABLED", "false")
+
+import httpx  # noqa: E402
+
+from app.core.security import hash_password, shutdown_password_executor  # noqa: E402
+from app.db.base import Base  # noqa: E402
+from app.db.session import SessionLocal, engine  # noqa: E402
+from app.main import app  # noqa: E402
+from app.models import Category, Product, Sale, Store, User  # noqa: E402
+
+ANALYTICS_REQUESTS = 200
+LOGIN_STORM = 64
+PASSWORD = "storm-password"
+
+
+def seed() -> int:
+    Base.metadata.create_all(bind=engine)
+    db = SessionLocal()
+    store = Store(name="Bench store")
+    category = Category(name="Bench category")
+    db.add_all([store, category])
+    db.flush()
+    products = [
+        Product(sku=f"SKU-{i}", name=f"Product {i}", category_id=category.id, store_id=store.id)
+        for i in range(200)
+    ]
+    db.add_all(products)
+    db.flush()
+    db.add_all(
+        Sale(product_id=p.id, store_id=store.id, date=datetime.utcnow(), units_sold=1, revenue=float(i + 1))
+        for i, p in enumerate(products)
+    )
+    db.add(User(email="storm@example.com", password_hash=hash_password(PASSWORD), role="analyst", is_active=True))
+    db.commit()
+    store_id = store.id
+    db.close()
+    return store_id
+
+
+def percentile(samples: list[float], pct: float) -> float:
+    ordered = sorted(samples)
+    return ordered[min(len(ordered) - 1, int(len(ordered) * pct))]
+
+
+async def analytics_latencies(client: httpx.AsyncClient, store_id: int) -> list[float]:
+    latencies = []
+
+    async def one() -> None:
+        started = time.perf_counter()
+        response = await client.get("/api/analytics/tail", params={"store_id": store_id})
+        response.raise_for_status()
+        latencies.append((time.perf_counter() - started) * 1000)
+
+    for _ in range(ANALYTICS_REQUESTS // 10):
+        await asyncio.gather(*(one() for _ in range(10)))
+    return latencies
+
+
+async def login_storm(client: httpx.AsyncClient) -> None:
+    await asyncio.gather(
+        *(
+            client.post("/api/auth/login", json={"email": "storm@example.com", "password": PASSWORD})
+            for _ in range(LOGIN_STORM)
+        )
+    )
+
+
+def report(label: str, latencies: list[float]) -> None:
+    print(
+        f"{label:<14} p50={statistics.median(latencies):7.1f} ms  "
+        f"p99={percentile(latencies, 0.99):7.1f} ms"
+    )
+
+
+async def main() -> None:
+    store_id = seed()
+    transport = httpx.ASGITransport(app=app)
+    async with httpx.AsyncClient(transport=transport, base_url="http://bench") as client:
+        report("idle", await analytics_latencies(client, store_id))
+        storm = asyncio.create_task(login_storm(client))
+        report("login storm", await analytics_latencies(client, store_id))
+        await storm
+    shutdown_password_executor()
+
+
+if __name__ == "__main__":
+    asyncio.run(main())
@@ -0,0 +1,90 @@
+import gc
+import time
+import tracemalloc
+from datetime import datetime, timedelta
+
+from pydantic import TypeAdapter
+from sqlalchemy import create_engine
+from sqlalchemy.orm import sessionmaker
+from sqlalchemy.pool import StaticPool
+
+from app import models  # noqa: F401
+from app.db.base import Base
+from app.db.readonly import read_rows, select_for
+from app.models.sale import Sale
+from app.schemas.sale import SaleRead
+
+ROWS = 100_000
+
+sales_adapter = TypeAdapter(list[SaleRead])
+
+
+def orm_fetch(session) -> list:
+    return session.query(Sale).all()
+
+
+def core_fetch(session) -> list:
+    return read_rows(session, select_for(Sale, SaleRead), SaleRead)
+
+
+def orm_response(session) -> bytes:
+    return sales_adapter.dump_json([SaleRead.model_validate(sale) for sale in orm_fetch(session)])
+
+
+def core_response(session) -> bytes:
+    return sales_adapter.dump_json(sales_adapter.validate_python(core_fetch(session), from_attributes=True))
+
+
+def rows_per_second(make_session, call) -> float:
+    session = make_session()
+    started = time.perf_counter()
+    call(session)
+    elapsed = time.perf_counter() - started
+    session.close()
+    return ROWS / elapsed
+
+
+def bytes_per_row(make_session, fetch) -> float:
+    session = make_session()
+    gc.collect()
+    tracemalloc.start()
+    rows = fetch(session)
+    current, _ = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    del rows
+    session.close()
+    return current / ROWS
+
+
+def main() -> None:
+    engine = create_engine(
+        "sqlite://", connect_args={"check_same_thread": False}, poolclass=StaticPool, future=True
+    )
+    Base.metadata.create_all(bind=engine)
+    make_session = sessionmaker(bind=engine, future=True)
+    with engine.begin() as connection:
+        connection.execute(
+            Sale.__table__.insert(),
+            [
+                {
+                    "product_id": index % 500 + 1,
+                    "store_id": index % 7 + 1,
+                    "date": datetime(2026, 1, 1) + timedelta(minutes=index),
+                    "units_sold": index % 5 + 1,
+                    "revenue": (index % 97) * 1.25,
+                }
+                for index in range(ROWS)
+            ],
+        )
+
+    print(f"{ROWS:,} sales rows")
+    print(f"{'path':<6} {'fetch rows/s':>14} {'response rows/s':>16} {'bytes/row':>10}")
+    for label, fetch, respond in (("orm", orm_fetch, orm_response), ("core", core_fetch, core_response)):
+        fetch_rate = rows_per_second(make_session, fetch)
+        response_rate = rows_per_second(make_session, respond)
+        memory = bytes_per_row(make_session, fetch)
+        print(f"{label:<6} {fetch_rate:14,.0f} {response_rate:16,.0f} {memory:10,.0f}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,95 @@
+import os
+import tempfile
+import threading
+import time
+from datetime import datetime, timedelta
+
+os.environ.setdefault("DATABASE_URL", f"sqlite:///{tempfile.mkdtemp()}/coalescing.db")
+
+from sqlalchemy import insert  # noqa: E402
+
+from app.core.metrics import metrics  # noqa: E402
+from app.db.base import Base  # noqa: E402
+from app.db.session import SessionLocal, engine  # noqa: E402
+from app.models import Category, MasterSku, Product, Sale, Store  # noqa: E402
+from app.services.analytics_service import tail_analysis  # noqa: E402
+
+PRODUCTS = 2_000
+SALES = 200_000
+CONCURRENT = 16
+ROUNDS = 3
+
+
+def seed() -> int:
+    Base.metadata.create_all(bind=engine)
+    db = SessionLocal()
+    store = Store(name="Bench store")
+    category = Category(name="Bench category")
+    db.add_all([store, category])
+    db.flush()
+    db.execute(insert(MasterSku), [{"code": f"SKU-{index}"} for index in range(PRODUCTS)])
+    db.execute(
+        insert(Product),
+        [
+            {
+                "sku": f"SKU-{index}",
+                "master_sku_id": index + 1,
+                "name": f"Product {index}",
+                "category_id": category.id,
+                "store_id": store.id,
+            }
+            for index in range(PRODUCTS)
+        ],
+    )
+    db.execute(
+        insert(Sale),
+        [
+            {
+                "product_id": index % PRODUCTS + 1,
+                "store_id": store.id,
+                "date": datetime(2025, 1, 1) + timedelta(minutes=index * 3),
+                "units_sold": 1,
+                "revenue": float(index % 97 + 1),
+            }
+            for index in range(SALES)
+        ],
+    )
+    db.commit()
+    store_id = store.id
+    db.close()
+    return store_id
+
+
+def burst(call, store_id: int) -> float:
+    barrier = threading.Barrier(CONCURRENT)
+
+    def one() -> None:
+        db = SessionLocal()
+        try:
+            barrier.wait()
+            call(db, store_id, datetime(2025, 3, 1), None, None, None)
+        finally:
+            db.close()
+
+    threads = [threading.Thread(target=one) for _ in range(CONCURRENT)]
+    started = time.perf_counter()
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+    return time.perf_counter() - started
+
+
+def main() -> None:
+    store_id = seed()
+    print(f"{SALES:,} sales, {CONCURRENT} identical concurrent tail requests, best of {ROUNDS}")
+    for label, call in (("direct", tail_analysis.__wrapped__), ("coalesced", tail_analysis)):
+        leaders = metrics.value("singleflight_calls_total", name="tail_analysis", role="leader")
+        elapsed = min(burst(call, store_id) for _ in range(ROUNDS))
+        computations = metrics.value("singleflight_calls_total", name="tail_analysis", role="leader") - leaders
+        computations = computations / ROUNDS if label == "coalesced" else CONCURRENT
+        print(f"{label:<10} {elapsed * 1000:9.1f} ms per burst  {computations:5.1f} aggregations per burst")
+
+
+if __name__ == "__main__":
+    main()
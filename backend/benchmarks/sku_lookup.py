@@ -0,0 +1,127 @@
+import random
+import time
+
+from sqlalchemy import create_engine
+from sqlalchemy.pool import StaticPool
+
+from app import models  # noqa: F401
+from app.db.base import Base
+
+STORES = 200
+CATALOG = 10_000
+LOOKUPS = 100_000
+IMPORT_ROWS = 500_000
+BATCH = 200_000
+
+LEGACY_SCHEMA = (
+    "CREATE TABLE legacy_products (id INTEGER PRIMARY KEY, sku VARCHAR(120) NOT NULL, store_id INTEGER NOT NULL)",
+    "CREATE UNIQUE INDEX ix_legacy_products_sku ON legacy_products (sku)",
+)
+
+LEGACY_LOOKUP = "SELECT id FROM legacy_products WHERE sku = ?"
+SCOPED_LOOKUP = (
+    "SELECT products.id FROM products JOIN master_skus ON master_skus.id = products.master_sku_id "
+    "WHERE master_skus.code = ? AND products.store_id = ?"
+)
+LEGACY_JOIN = (
+    "SELECT count(legacy_products.id) FROM staged "
+    "JOIN legacy_products ON legacy_products.sku = staged.code || '-store' || staged.store_id"
+)
+SCOPED_JOIN = (
+    "SELECT count(products.id) FROM staged "
+    "JOIN master_skus ON master_skus.code = staged.code "
+    "JOIN products ON products.store_id = staged.store_id AND products.master_sku_id = master_skus.id"
+)
+
+
+def sku_code(index: int) -> str:
+    return f"SKU-{index:07d}"
+
+
+def batched(rows, size: int = BATCH):
+    batch = []
+    for row in rows:
+        batch.append(row)
+        if len(batch) == size:
+            yield batch
+            batch = []
+    if batch:
+        yield batch
+
+
+def seed(connection) -> None:
+    for statement in LEGACY_SCHEMA:
+        connection.execute(statement)
+    connection.executemany(
+        "INSERT INTO stores (id, name) VALUES (?, ?)",
+        ((store_id, f"Store {store_id}") for store_id in range(1, STORES + 1)),
+    )
+    connection.execute("INSERT INTO categories (id, name) VALUES (1, 'Bench category')")
+    connection.executemany(
+        "INSERT INTO master_skus (id, code) VALUES (?, ?)",
+        ((index + 1, sku_code(index)) for index in range(CATALOG)),
+    )
+    products = ((store_id, index) for store_id in range(1, STORES + 1) for index in range(CATALOG))
+    for batch in batched(products):
+        connection.executemany(
+            "INSERT INTO products (sku, master_sku_id, name, category_id, store_id) VALUES (?, ?, ?, 1, ?)",
+            ((sku_code(index), index + 1, sku_code(index), store_id) for store_id, index in batch),
+        )
+        connection.executemany(
+            "INSERT INTO legacy_products (sku, store_id) VALUES (?, ?)",
+            ((f"{sku_code(index)}-store{store_id}", store_id) for store_id, index in batch),
+        )
+    connection.commit()
+
+
+def index_bytes(connection, names: tuple[str, ...]) -> int:
+    placeholders = ", ".join("?" for _ in names)
+    return connection.execute(f"SELECT sum(pgsize) FROM dbstat WHERE name IN ({placeholders})", names).fetchone()[0]
+
+
+def timed(call) -> tuple[float, object]:
+    started = time.perf_counter()
+    result = call()
+    return time.perf_counter() - started, result
+
+
+def main() -> None:
+    engine = create_engine("sqlite://", connect_args={"check_same_thread": False}, poolclass=StaticPool, future=True)
+    Base.metadata.create_all(bind=engine)
+    connection = engine.raw_connection()
+    connection.execute("CREATE VIRTUAL TABLE temp.dbstat USING dbstat(main)")
+    seed(connection)
+    print(f"{STORES * CATALOG:,} products ({STORES} stores x {CATALOG:,} chain SKUs)")
+
+    legacy_bytes = index_bytes(connection, ("ix_legacy_products_sku",))
+    scoped_bytes = index_bytes(connection, ("ix_products_store_id_master_sku_id", "ix_master_skus_code"))
+    print(f"{'index size':<14} legacy {legacy_bytes / 2**20:8.1f} MiB  scoped {scoped_bytes / 2**20:8.1f} MiB")
+
+    rng = random.Random(7)
+    probes = [(rng.randint(1, STORES), sku_code(rng.randrange(CATALOG))) for _ in range(LOOKUPS)]
+    legacy_probes = [(f"{code}-store{store_id}",) for store_id, code in probes]
+    legacy_seconds, _ = timed(lambda: [connection.execute(LEGACY_LOOKUP, probe).fetchone() for probe in legacy_probes])
+    scoped_seconds, _ = timed(
+        lambda: [connection.execute(SCOPED_LOOKUP, (code, store_id)).fetchone() for store_id, code in probes]
+    )
+    print(
+        f"{'point lookup':<14} legacy {legacy_seconds / LOOKUPS * 1e6:8.2f} us  "
+        f"scoped {scoped_seconds / LOOKUPS * 1e6:8.2f} us"
+    )
+
+    connection.execute("CREATE TEMP TABLE staged (store_id INTEGER NOT NULL, code VARCHAR(120) NOT NULL)")
+    connection.executemany(
+        "INSERT INTO staged (store_id, code) VALUES (?, ?)",
+        ((rng.randint(1, STORES), sku_code(rng.randrange(CATALOG))) for _ in range(IMPORT_ROWS)),
+    )
+    legacy_seconds, legacy_rows = timed(lambda: connection.execute(LEGACY_JOIN).fetchone()[0])
+    scoped_seconds, scoped_rows = timed(lambda: connection.execute(SCOPED_JOIN).fetchone()[0])
+    print(
+        f"{'resolve join':<14} legacy {legacy_seconds * 1000:8.1f} ms  scoped {scoped_seconds * 1000:8.1f} ms  "
+        f"({IMPORT_ROWS:,} staged rows, {legacy_rows:,}/{scoped_rows:,} resolved)"
+    )
+    connection.close()
+
+
+if __name__ == "__main__":
+    main()
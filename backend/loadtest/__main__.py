@@ -0,0 +1,190 @@
+import argparse
+import asyncio
+import json
+import os
+import subprocess
+import sys
+import tempfile
+import time
+from datetime import datetime
+from pathlib import Path
+
+import httpx
+
+from loadtest.runner import compare, run_load
+from loadtest.scenarios import DEFAULT_MIX, discover, parse_mix
+
+BACKEND_DIR = Path(__file__).resolve().parents[1]
+
+
+def parse_args() -> argparse.Namespace:
+    parser = argparse.ArgumentParser(prog="python -m loadtest", description="Replay dashboard traffic against the API")
+    parser.add_argument("--target", default="inprocess", help="inprocess, uvicorn, or the base URL of a running server")
+    parser.add_argument("--database-url", default=None, help="database for inprocess/uvicorn targets")
+    parser.add_argument("--no-seed", action="store_true", help="reuse the data already in the target database")
+    parser.add_argument("--stores", type=int, default=3)
+    parser.add_argument("--products", type=int, default=400, help="products per store")
+    parser.add_argument("--days", type=int, default=180)
+    parser.add_argument("--sales-per-day", type=int, default=150, help="sale lines per store and day")
+    parser.add_argument("--seed", type=int, default=7)
+    parser.add_argument("--mix", default=DEFAULT_MIX, help="comma separated route=weight pairs")
+    parser.add_argument("--concurrency", type=int, default=16)
+    parser.add_argument("--duration", type=float, default=None, help="seconds to run")
+    parser.add_argument("--requests", type=int, default=None, help="total requests to issue")
+    parser.add_argument("--warmup", type=int, default=20, help="unmeasured requests before the run")
+    parser.add_argument("--workers", type=int, default=1, help="uvicorn worker processes")
+    parser.add_argument("--port", type=int, default=8765)
+    parser.add_argument("--admission", action="store_true", help="keep per-user rate limits on for local targets")
+    parser.add_argument("--user-id", type=int, default=1, help="import owner when the target is not seeded here")
+    parser.add_argument("--output", default=None, help="result JSON path")
+    parser.add_argument("--baseline", default=None, help="previous result JSON to compare against")
+    args = parser.parse_args()
+    if args.duration is None and args.requests is None:
+        args.duration = 30.0
+    return args
+
+
+def _git_revision() -> str | None:
+    try:
+        return subprocess.run(
+            ["git", "rev-parse", "--short", "HEAD"], cwd=BACKEND_DIR, capture_output=True, text=True, check=True
+        ).stdout.strip()
+    except (OSError, subprocess.CalledProcessError):
+        return None
+
+
+def _start_uvicorn(args: argparse.Namespace) -> subprocess.Popen:
+    process = subprocess.Popen(
+        [
+            sys.executable,
+            "-m",
+            "uvicorn",
+            "app.main:app",
+            "--app-dir",
+            str(BACKEND_DIR),
+            "--port",
+            str(args.port),
+            "--workers",
+            str(args.workers),
+            "--log-level",
+            "warning",
+        ],
+        env=os.environ.copy(),
+    )
+    deadline = time.monotonic() + 30
+    while time.monotonic() < deadline:
+        if process.poll() is not None:
+            raise RuntimeError("uvicorn exited during startup")
+        try:
+            if httpx.get(f"http://127.0.0.1:{args.port}/health").status_code == 200:
+                return process
+        except httpx.HTTPError:
+            time.sleep(0.2)
+    process.terminate()
+    raise RuntimeError("uvicorn did not become healthy within 30 seconds")
+
+
+def _print_report(result: dict) -> None:
+    print(f"{'route':<14}{'requests':>10}{'errors':>8}{'rps':>10}{'p50 ms':>10}{'p95 ms':>10}{'p99 ms':>10}")
+    for name, route in {**result["routes"], "total": result["total"]}.items():
+        if not route["requests"]:
+            continue
+        print(
+            f"{name:<14}{route['requests']:>10}{route['errors']:>8}{route['rps']:>10.1f}"
+            f"{route['p50_ms']:>10.1f}{route['p95_ms']:>10.1f}{route['p99_ms']:>10.1f}"
+        )
+
+
+async def _run(args: argparse.Namespace, mix: dict[str, int], base_url: str, user_id: int) -> dict:
+    limits = httpx.Limits(max_connections=args.concurrency, max_keepalive_connections=args.concurrency)
+    if args.target == "inprocess":
+        from app.main import app
+
+        client = httpx.AsyncClient(transport=httpx.ASGITransport(app=app), base_url=base_url, timeout=None)
+    else:
+        client = httpx.AsyncClient(base_url=base_url, timeout=None, limits=limits)
+    async with client:
+        dataset = await discover(client, user_id)
+        return await run_load(
+            client,
+            dataset,
+            mix,
+            args.concurrency,
+            duration=args.duration,
+            requests=args.requests,
+            warmup=args.warmup,
+            seed=args.seed,
+        )
+
+
+def main() -> None:
+    args = parse_args()
+    mix = parse_mix(args.mix)
+    local = args.target in ("inprocess", "uvicorn")
+    if not local and not args.target.startswith(("http://", "https://")):
+        raise SystemExit(f"Unsupported target: {args.target}")
+
+    output = Path(args.output or f"loadtest-{datetime.utcnow():%Y%m%d-%H%M%S}.json").resolve()
+    baseline = json.loads(Path(args.baseline).read_text(encoding="utf-8")) if args.baseline else None
+
+    if local:
+        workdir = tempfile.mkdtemp(prefix="loadtest-")
+        os.environ["DATABASE_URL"] = args.database_url or f"sqlite:///{workdir}/loadtest.db"
+        os.environ.setdefault("ADMISSION_ENABLED", "true" if args.admission else "false")
+        os.chdir(workdir)
+
+    dataset_summary = None
+    user_id = args.user_id
+    if local and not args.no_seed:
+        from loadtest.generator import seed
+
+        started = time.perf_counter()
+        dataset_summary = seed(args.stores, args.products, args.days, args.sales_per_day, args.seed)
+        dataset_summary["seed_seconds"] = round(time.perf_counter() - started, 3)
+        user_id = dataset_summary["user_id"]
+        print(f"seeded {dataset_summary}")
+
+    server = None
+    base_url = args.target
+    if args.target == "uvicorn":
+        server = _start_uvicorn(args)
+        base_url = f"http://127.0.0.1:{args.port}"
+    elif args.target == "inprocess":
+        base_url = "http://loadtest"
+
+    try:
+        started_at = datetime.utcnow()
+        result = asyncio.run(_run(args, mix, base_url, user_id))
+    finally:
+        if server is not None:
+            server.terminate()
+            server.wait()
+
+    report = {
+        "started_at": started_at.isoformat(),
+        "git_revision": _git_revision(),
+        "target": args.target,
+        "config": {
+            "mix": mix,
+            "concurrency": args.concurrency,
+            "duration": args.duration,
+            "requests": args.requests,
+            "warmup": args.warmup,
+            "workers": args.workers if args.target == "uvicorn" else None,
+            "seed": args.seed,
+            "admission": os.environ.get("ADMISSION_ENABLED") if local else None,
+        },
+        "dataset": dataset_summary,
+        **result,
+    }
+    if baseline is not None:
+        report["baseline"] = args.baseline
+        report["delta_vs_baseline"] = compare(result, baseline)
+
+    _print_report(result)
+    output.write_text(json.dumps(report, indent=2), encoding="utf-8")
+    print(f"results written to {output}")
+
+
+if __name__ == "__main__":
+    main()
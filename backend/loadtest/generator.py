@@ -0,0 +1,140 @@
+import random
+from datetime import datetime, timedelta
+
+from sqlalchemy import insert
+
+from app.core.security import hash_password
+from app.db.base import Base
+from app.db.partitioning import sales_session
+from app.db.session import SessionLocal, engine
+from app.models import Category, Product, Sale, ShelfSpace, Store, TrafficZone, User
+
+CATEGORY_NAMES = (
+    "Dairy",
+    "Bakery",
+    "Produce",
+    "Meat",
+    "Frozen",
+    "Beverages",
+    "Snacks",
+    "Household",
+    "Personal care",
+    "Pantry",
+)
+WEEKDAY_FACTORS = (0.85, 0.8, 0.9, 0.95, 1.15, 1.35, 1.0)
+LOADTEST_EMAIL = "loadtest@example.com"
+LOADTEST_PASSWORD = "loadtest-password"
+
+
+def _basket_sizes(rng: random.Random, lines: int) -> list[int]:
+    sizes = []
+    while lines > 0:
+        size = min(lines, max(1, int(rng.expovariate(0.45))))
+        sizes.append(size)
+        lines -= size
+    return sizes
+
+
+def _store_sales(
+    rng: random.Random,
+    store_id: int,
+    products: list[tuple[int, float]],
+    days: int,
+    sales_per_day: int,
+    end: datetime,
+) -> list[dict]:
+    popularity = [rng.paretovariate(1.16) for _ in products]
+    rows = []
+    basket = 0
+    for offset in range(days, 0, -1):
+        day = end - timedelta(days=offset)
+        lines = max(1, int(rng.gauss(sales_per_day * WEEKDAY_FACTORS[day.weekday()], sales_per_day * 0.1)))
+        for size in _basket_sizes(rng, lines):
+            basket += 1
+            moment = day + timedelta(seconds=rng.randint(8 * 3600, 21 * 3600))
+            for product_id, price in rng.choices(products, weights=popularity, k=size):
+                units = 1 + int(rng.expovariate(1.2))
+                rows.append(
+                    {
+                        "product_id": product_id,
+                        "store_id": store_id,
+                        "date": moment,
+                        "units_sold": units,
+                        "revenue": round(units * price, 2),
+                        "basket_id": f"s{store_id}-b{basket}",
+                    }
+                )
+    return rows
+
+
+def seed(
+    stores: int = 3,
+    products_per_store: int = 400,
+    days: int = 180,
+    sales_per_day: int = 150,
+    seed_value: int = 7,
+) -> dict:
+    rng = random.Random(seed_value)
+    Base.metadata.create_all(bind=engine)
+    end = datetime.combine(datetime.utcnow().date(), datetime.min.time())
+    db = SessionLocal()
+    try:
+        user = User(
+            email=LOADTEST_EMAIL,
+            password_hash=hash_password(LOADTEST_PASSWORD),
+            role="admin",
+            is_active=True,
+        )
+        categories = [Category(name=name) for name in CATEGORY_NAMES]
+        store_rows = [Store(name=f"Load test store {index + 1}", city="Tashkent") for index in range(stores)]
+        db.add_all([user, *categories, *store_rows])
+        db.flush()
+
+        sales_rows = 0
+        for store in store_rows:
+            products = [
+                Product(
+                    sku=f"LT-{index:05d}",
+                    name=f"{categories[index % len(categories)].name} item {index}",
+                    category_id=categories[index % len(categories)].id,
+                    price=round(rng.uniform(0.5, 40), 2),
+                    store_id=store.id,
+                )
+                for index in range(products_per_store)
+            ]
+            db.add_all(products)
+            db.add_all(
+                ShelfSpace(store_id=store.id, category_id=category.id, current_meters=round(rng.uniform(2, 20), 1))
+                for category in categories
+            )
+            db.add_all(
+                TrafficZone(
+                    store_id=store.id,
+                    zone_name=f"Z{x}{y}",
+                    x=x,
+                    y=y,
+                    traffic_score=round(rng.random(), 3),
+                )
+                for x in range(6)
+                for y in range(4)
+            )
+            db.flush()
+
+            rows = _store_sales(
+                rng, store.id, [(product.id, product.price) for product in products], days, sales_per_day, end
+            )
+            with sales_session(db, store.id) as sales_db:
+                sales_db.execute(insert(Sale), rows)
+                if sales_db is not db:
+                    sales_db.commit()
+            sales_rows += len(rows)
+        db.commit()
+        return {
+            "stores": stores,
+            "products": stores * products_per_store,
+            "sales": sales_rows,
+            "days": days,
+            "user_id": user.id,
+        }
+    finally:
+        db.close()
@@ -0,0 +1,119 @@
+import asyncio
+import math
+import random
+import statistics
+import time
+from collections import Counter
+
+import httpx
+
+from loadtest.scenarios import ROUTES, Dataset
+
+
+def percentile(samples: list[float], pct: float) -> float:
+    ordered = sorted(samples)
+    return ordered[min(len(ordered) - 1, math.ceil(len(ordered) * pct) - 1)]
+
+
+class RouteStats:
+    def __init__(self) -> None:
+        self.latencies: list[float] = []
+        self.statuses: Counter[int] = Counter()
+        self.errors = 0
+
+    def record(self, latency_ms: float, status_code: int | None) -> None:
+        self.latencies.append(latency_ms)
+        if status_code is None:
+            self.errors += 1
+            return
+        self.statuses[status_code] += 1
+        if status_code >= 400:
+            self.errors += 1
+
+    def summary(self, elapsed: float) -> dict:
+        latencies = self.latencies
+        if not latencies:
+            return {"requests": 0, "errors": 0, "rps": 0.0, "statuses": {}}
+        return {
+            "requests": len(latencies),
+            "errors": self.errors,
+            "rps": round(len(latencies) / elapsed, 2),
+            "mean_ms": round(statistics.fmean(latencies), 3),
+            "p50_ms": round(percentile(latencies, 0.50), 3),
+            "p95_ms": round(percentile(latencies, 0.95), 3),
+            "p99_ms": round(percentile(latencies, 0.99), 3),
+            "max_ms": round(max(latencies), 3),
+            "statuses": {str(code): count for code, count in sorted(self.statuses.items())},
+        }
+
+
+async def run_load(
+    client: httpx.AsyncClient,
+    dataset: Dataset,
+    mix: dict[str, int],
+    concurrency: int,
+    duration: float | None = None,
+    requests: int | None = None,
+    warmup: int = 0,
+    seed: int = 7,
+) -> dict:
+    if duration is None and requests is None:
+        raise ValueError("Either duration or requests must be set")
+    names = [name for name, weight in mix.items() if weight > 0]
+    weights = [mix[name] for name in names]
+    stats = {name: RouteStats() for name in names}
+    budget = iter(range(requests)) if requests is not None else None
+
+    async def issue(rng: random.Random) -> tuple[str, float, int | None]:
+        name = rng.choices(names, weights=weights)[0]
+        call = ROUTES[name].build(rng, dataset)
+        started = time.perf_counter()
+        try:
+            response = await client.request(
+                call.method, call.path, params=call.params, data=call.data, files=call.files
+            )
+            await response.aread()
+            status_code = response.status_code
+        except httpx.HTTPError:
+            status_code = None
+        return name, (time.perf_counter() - started) * 1000, status_code
+
+    warmup_rng = random.Random(seed - 1)
+    for _ in range(warmup):
+        await issue(warmup_rng)
+
+    deadline = time.perf_counter() + duration if duration is not None else math.inf
+
+    async def worker(index: int) -> None:
+        rng = random.Random(seed * 1000 + index)
+        while time.perf_counter() < deadline and (budget is None or next(budget, None) is not None):
+            name, latency_ms, status_code = await issue(rng)
+            stats[name].record(latency_ms, status_code)
+
+    started = time.perf_counter()
+    await asyncio.gather(*(worker(index) for index in range(concurrency)))
+    elapsed = time.perf_counter() - started
+
+    all_stats = RouteStats()
+    for route_stats in stats.values():
+        all_stats.latencies.extend(route_stats.latencies)
+        all_stats.statuses.update(route_stats.statuses)
+        all_stats.errors += route_stats.errors
+    return {
+        "elapsed_seconds": round(elapsed, 3),
+        "total": all_stats.summary(elapsed),
+        "routes": {name: route_stats.summary(elapsed) for name, route_stats in stats.items()},
+    }
+
+
+def compare(current: dict, baseline: dict) -> dict:
+    deltas = {}
+    for name, route in {"total": current["total"], **current["routes"]}.items():
+        previous = baseline["total"] if name == "total" else baseline.get("routes", {}).get(name)
+        if not previous or not previous.get("requests") or not route.get("requests"):
+            continue
+        deltas[name] = {
+            key: round((route[key] - previous[key]) / previous[key], 4) if previous[key] else None
+            for key in ("rps", "p50_ms", "p95_ms", "p99_ms")
+        }
+    return deltas
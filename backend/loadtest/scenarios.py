@@ -0,0 +1,151 @@
+import csv
+import io
+import itertools
+import random
+from datetime import datetime, timedelta
+from typing import Callable, NamedTuple
+
+import httpx
+
+
+class Dataset(NamedTuple):
+    store_ids: list[int]
+    products: dict[int, list[tuple[int, str]]]
+    category_ids: list[int]
+    user_id: int
+    today: datetime
+
+
+class Call(NamedTuple):
+    method: str
+    path: str
+    params: dict | None = None
+    data: dict | None = None
+    files: dict | None = None
+
+
+class Route(NamedTuple):
+    name: str
+    build: Callable[[random.Random, Dataset], Call]
+
+
+async def discover(client: httpx.AsyncClient, user_id: int) -> Dataset:
+    stores = (await client.get("/api/stores")).raise_for_status().json()
+    categories = (await client.get("/api/categories")).raise_for_status().json()
+    products: dict[int, list[tuple[int, str]]] = {store["id"]: [] for store in stores}
+    for product in (await client.get("/api/products")).raise_for_status().json():
+        products.setdefault(product["store_id"], []).append((product["id"], product["sku"]))
+    store_ids = [store_id for store_id, store_products in products.items() if store_products]
+    if not store_ids:
+        raise ValueError("Target has no stores with products; seed it first")
+    return Dataset(
+        store_ids=store_ids,
+        products=products,
+        category_ids=[category["id"] for category in categories],
+        user_id=user_id,
+        today=datetime.combine(datetime.utcnow().date(), datetime.min.time()),
+    )
+
+
+def _since(rng: random.Random, dataset: Dataset, choices: tuple[int, ...]) -> str:
+    return (dataset.today - timedelta(days=rng.choice(choices))).isoformat()
+
+
+def _tail(rng: random.Random, dataset: Dataset) -> Call:
+    return Call("GET", "/api/analytics/tail", {"store_id": rng.choice(dataset.store_ids)})
+
+
+def _tail_window(rng: random.Random, dataset: Dataset) -> Call:
+    params = {"store_id": rng.choice(dataset.store_ids), "date_start": _since(rng, dataset, (30, 60, 90))}
+    if dataset.category_ids and rng.random() < 0.5:
+        params["category_id"] = rng.choice(dataset.category_ids)
+    return Call("GET", "/api/analytics/tail", params)
+
+
+def _tail_stream(rng: random.Random, dataset: Dataset) -> Call:
+    return Call("GET", "/api/analytics/tail/stream", {"store_id": rng.choice(dataset.store_ids), "limit": 200})
+
+
+def _space(rng: random.Random, dataset: Dataset) -> Call:
+    params = {"store_id": rng.choice(dataset.store_ids), "date_start": _since(rng, dataset, (30, 90))}
+    return Call("GET", "/api/analytics/space", params)
+
+
+def _heatmap(rng: random.Random, dataset: Dataset) -> Call:
+    return Call("GET", "/api/analytics/heatmap", {"store_id": rng.choice(dataset.store_ids)})
+
+
+def _abc_xyz(rng: random.Random, dataset: Dataset) -> Call:
+    return Call("GET", "/api/analytics/abc-xyz", {"store_id": rng.choice(dataset.store_ids)})
+
+
+def _affinity(rng: random.Random, dataset: Dataset) -> Call:
+    return Call("GET", "/api/analytics/affinity", {"store_id": rng.choice(dataset.store_ids)})
+
+
+def _sales(rng: random.Random, dataset: Dataset) -> Call:
+    params = {"store_id": rng.choice(dataset.store_ids), "date_start": _since(rng, dataset, (1, 7, 14))}
+    return Call("GET", "/api/sales", params)
+
+
+def _products(rng: random.Random, dataset: Dataset) -> Call:
+    return Call("GET", "/api/products", {"store_id": rng.choice(dataset.store_ids)})
+
+
+_import_counter = itertools.count(1)
+
+
+def _import_sales(rng: random.Random, dataset: Dataset) -> Call:
+    batch = next(_import_counter)
+    store_id = rng.choice(dataset.store_ids)
+    buffer = io.StringIO()
+    writer = csv.writer(buffer)
+    writer.writerow(["sku", "store_id", "date", "units_sold", "revenue", "basket_id"])
+    for line in range(rng.randint(20, 200)):
+        _product_id, sku = rng.choice(dataset.products[store_id])
+        units = rng.randint(1, 4)
+        moment = dataset.today + timedelta(seconds=rng.randint(0, 86399))
+        revenue = round(units * rng.uniform(0.5, 40), 2)
+        writer.writerow([sku, store_id, moment.isoformat(), units, revenue, f"lt-{batch}-{line // 3}"])
+    return Call(
+        "POST",
+        "/api/imports",
+        data={"import_type": "sales", "user_id": str(dataset.user_id)},
+        files={"file": (f"loadtest-sales-{batch}.csv", buffer.getvalue().encode(), "text/csv")},
+    )
+
+
+ROUTES = {
+    route.name: route
+    for route in (
+        Route("tail", _tail),
+        Route("tail_window", _tail_window),
+        Route("tail_stream", _tail_stream),
+        Route("space", _space),
+        Route("heatmap", _heatmap),
+        Route("abc_xyz", _abc_xyz),
+        Route("affinity", _affinity),
+        Route("sales", _sales),
+        Route("products", _products),
+        Route("import_sales", _import_sales),
+    )
+}
+
+DEFAULT_MIX = "tail=25,tail_window=10,tail_stream=5,space=10,heatmap=5,abc_xyz=5,affinity=5,sales=15,products=15,import_sales=5"
+
+
+def parse_mix(text: str) -> dict[str, int]:
+    mix = {}
+    for part in filter(None, (part.strip() for part in text.split(","))):
+        name, _, weight = part.partition("=")
+        if name not in ROUTES:
+            raise ValueError(f"Unknown route in mix: {name}")
+        try:
+            mix[name] = int(weight or 1)
+        except ValueError as exc:
+            raise ValueError(f"Invalid weight for {name}: {weight}") from exc
+        if mix[name] < 0:
+            raise ValueError(f"Invalid weight for {name}: {weight}")
+    if not any(mix.values()):
+        raise ValueError("Route mix must contain at least one positive weight")
+    return mix